@@ -0,0 +1,308 @@
+"""
+Aggregation
+
+Statistical aggregation of the score matrix into the summary table. All
+ideas are aggregated at once with NumPy on the ideas x LLMs x dimensions
+array, with NaN for scores that are missing:
+
+- Calibration: each LLM's scores are z-scored against its own mean and spread
+  and mapped back onto the pooled scale of all LLMs, so a harsh or lenient
+  grader does not pull its ideas down or up.
+- Estimators: the LLMs' scores for a dimension are combined with the mean,
+  the median or a trimmed mean.
+- Weights: the Average Rating is a weighted mean of the dimensions an idea
+  was scored on; missing dimensions are left out rather than counted as 0.
+- Bootstrap: the LLMs that scored an idea are resampled with replacement to
+  give a percentile confidence interval for its Average Rating.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from document_parser import Idea
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS
+from score_matrix import ScoreMatrix
+from tables import round_half_even
+
+ESTIMATORS = ["mean", "median", "trimmed-mean"]
+
+# Share of the scores cut from each end by the trimmed mean; with four LLMs the
+# highest and lowest score of each dimension are dropped
+DEFAULT_TRIM = 0.25
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_BOOTSTRAP_SEED = 0
+
+# Largest number of floats materialised at once while bootstrapping
+BOOTSTRAP_CHUNK_ELEMENTS = 4_000_000
+
+
+def parse_dimension_weights(values: List[str]) -> np.ndarray:
+    """
+    Parse dimension weights given as NAME=W.
+
+    Args:
+        values: List of NAME=W strings; NAME is a dimension key or label
+            (e.g. market_viability or "Market Viability"), W a non-negative number
+
+    Returns:
+        Weight per dimension in RUBRIC_DIMENSIONS order; dimensions not listed weigh 1
+
+    Raises:
+        ValueError: If a value is malformed, names an unknown dimension or gives
+            every dimension zero weight
+    """
+    codes = {dimension: code for code, dimension in enumerate(RUBRIC_DIMENSIONS)}
+    weights = np.ones(len(RUBRIC_DIMENSIONS))
+    for value in values:
+        name, sep, weight = value.rpartition("=")
+        key = name.strip().lower().replace(" ", "_").replace("-", "_")
+        try:
+            weight = float(weight)
+        except ValueError:
+            weight = -1.0
+        if not sep or key not in codes or not weight >= 0:
+            raise ValueError(f"Invalid dimension weight '{value}', expected NAME=W with NAME one of "
+                             f"{', '.join(RUBRIC_DIMENSIONS)}")
+        weights[codes[key]] = weight
+    if not weights.any():
+        raise ValueError("At least one dimension needs a positive weight")
+    return weights
+
+
+def _row_stats(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and population standard deviation of each row, ignoring NaN (0 for empty rows)."""
+    present = ~np.isnan(rows)
+    counts = present.sum(axis=1)
+    means = np.divide(np.where(present, rows, 0.0).sum(axis=1), counts, out=np.zeros(len(rows)), where=counts > 0)
+    squares = np.where(present, (rows - means[:, None]) ** 2, 0.0).sum(axis=1)
+    return means, np.sqrt(np.divide(squares, counts, out=np.zeros(len(rows)), where=counts > 0))
+
+
+def calibrate(values: np.ndarray) -> np.ndarray:
+    """
+    Put every LLM's scores on a common scale.
+
+    Args:
+        values: Scores of shape (ideas, LLMs, dimensions), NaN where missing
+
+    Returns:
+        Array of the same shape where each LLM's scores are z-scored against
+        that LLM's mean and standard deviation and mapped onto the mean and
+        standard deviation of all scores; an LLM whose scores are all equal is
+        mapped onto the pooled mean
+    """
+    by_model = values.transpose(1, 0, 2).reshape(values.shape[1], -1)
+    means, stds = _row_stats(by_model)
+    pooled_means, pooled_stds = _row_stats(by_model.reshape(1, -1))
+    means, stds = means[None, :, None], stds[None, :, None]
+    z_scores = np.divide(values - means, stds, out=np.zeros(values.shape), where=stds > 0)
+    return np.where(np.isnan(values), np.nan, pooled_means[0] + z_scores * pooled_stds[0])
+
+
+def combine_models(values: np.ndarray, estimator: str = "mean", trim: float = DEFAULT_TRIM,
+                   repeats: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Combine the LLMs' scores for each dimension.
+
+    Args:
+        values: Scores of shape (ideas, LLMs, dimensions), NaN where missing
+        estimator: One of ESTIMATORS
+        trim: Share of the scores cut from each end by the trimmed mean
+        repeats: Optional number of times each LLM's scores count, of shape
+            (ideas, samples, LLMs), as drawn by the bootstrap; by default every
+            LLM counts once
+
+    Returns:
+        Array of shape (ideas, dimensions), or (ideas, samples, dimensions) with
+        repeats; NaN where no LLM scored the dimension
+    """
+    if estimator not in ESTIMATORS:
+        raise ValueError(f"Unknown estimator '{estimator}', expected one of {', '.join(ESTIMATORS)}")
+    if not 0 <= trim < 0.5:
+        raise ValueError("trim must be at least 0 and below 0.5")
+    single = repeats is None
+    if single:
+        repeats = np.ones((values.shape[0], 1, values.shape[1]), dtype=np.int64)
+
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    if estimator == "mean":
+        repeats = repeats.astype(np.float64)
+        totals = repeats @ filled
+        counts = repeats @ present.astype(np.float64)
+        result = np.divide(totals, counts, out=np.full(totals.shape, np.nan), where=counts > 0)
+        return result[:, 0] if single else result
+
+    # Sort each dimension's scores once (missing scores last) and count how often each
+    # sorted score occurs in every sample; ranks then follow from the running counts
+    order = np.argsort(values, axis=1)
+    ordered = np.take_along_axis(filled, order, axis=1)[:, None]
+    # Counts never exceed the number of LLMs, so 16-bit integers keep these arrays small
+    multiplicity = (np.take_along_axis(repeats.astype(np.int16)[..., None], order[:, None], axis=2)
+                    * np.take_along_axis(present, order, axis=1)[:, None])
+    cumulative = np.cumsum(multiplicity, axis=2)
+    counts = cumulative[:, :, -1]
+
+    if estimator == "median":
+        def at_rank(rank):
+            position = np.minimum((cumulative <= rank[:, :, None]).sum(axis=2), values.shape[1] - 1)
+            return np.take_along_axis(ordered, position[:, :, None], axis=2)[:, :, 0]
+
+        result = np.where(counts > 0, (at_rank((counts - 1) // 2) + at_rank(counts // 2)) / 2, np.nan)
+    else:
+        cut = np.floor(counts * trim).astype(np.int64)[:, :, None]
+        kept = np.clip(np.minimum(cumulative, counts[:, :, None] - cut)
+                       - np.maximum(cumulative - multiplicity, cut), 0, None)
+        totals = (kept * ordered).sum(axis=2)
+        counts = kept.sum(axis=2)
+        result = np.divide(totals, counts, out=np.full(totals.shape, np.nan), where=counts > 0)
+    return result[:, 0] if single else result
+
+
+def weighted_rating(dimension_scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Average the dimension scores with the given weights, leaving out missing dimensions.
+
+    Args:
+        dimension_scores: Array of shape (..., dimensions), NaN where missing
+        weights: Weight per dimension
+
+    Returns:
+        Array of shape (...), NaN where no weighted dimension was scored
+    """
+    present = ~np.isnan(dimension_scores)
+    applied = np.where(present, weights, 0.0)
+    totals = np.where(present, dimension_scores, 0.0) @ weights
+    weight_sums = applied.sum(axis=-1)
+    return np.divide(totals, weight_sums, out=np.full(totals.shape, np.nan), where=weight_sums > 0)
+
+
+def bootstrap_interval(values: np.ndarray, weights: np.ndarray, estimator: str = "mean",
+                       trim: float = DEFAULT_TRIM, samples: int = 1000, confidence: float = DEFAULT_CONFIDENCE,
+                       seed: int = DEFAULT_BOOTSTRAP_SEED) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile bootstrap confidence interval for each idea's rating.
+
+    Each sample draws, with replacement, as many LLMs as scored the idea from
+    the LLMs that scored it, and recomputes the rating from their scores.
+
+    Args:
+        values: Scores of shape (ideas, LLMs, dimensions), NaN where missing
+        weights: Weight per dimension
+        estimator: One of ESTIMATORS
+        trim: Share of the scores cut from each end by the trimmed mean
+        samples: Number of bootstrap samples
+        confidence: Coverage of the interval (e.g. 0.95)
+        seed: Seed for the random number generator
+
+    Returns:
+        Tuple of (low, high) arrays of shape (ideas,); NaN for ideas without scores
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    num_ideas, num_models, num_dimensions = values.shape
+    rng = np.random.default_rng(seed)
+    low = np.full(num_ideas, np.nan)
+    high = np.full(num_ideas, np.nan)
+    chunk = max(1, BOOTSTRAP_CHUNK_ELEMENTS // max(1, samples * num_models * num_dimensions))
+    tail = (1 - confidence) / 2 * 100
+
+    for start in range(0, num_ideas, chunk):
+        block = values[start:start + chunk]
+        size = len(block)
+        # LLMs that scored each idea come first, so draws below the count pick one of them
+        scored = ~np.isnan(block).all(axis=2)
+        order = np.argsort(~scored, axis=1, kind="stable")
+        scored_counts = scored.sum(axis=1)
+        draws = (rng.random((size, samples, num_models)) * scored_counts[:, None, None]).astype(np.int64)
+        models = np.take_along_axis(np.broadcast_to(order[:, None, :], draws.shape), draws, axis=2)
+        # Number of times each LLM was drawn in each sample
+        drawn = np.broadcast_to(np.arange(num_models) < scored_counts[:, None, None], models.shape)
+        cells = (np.arange(size * samples).reshape(size, samples, 1) * num_models + models)[drawn]
+        repeats = np.bincount(cells, minlength=size * samples * num_models).reshape(size, samples, num_models)
+
+        ratings = weighted_rating(combine_models(block, estimator, trim, repeats), weights)
+        low[start:start + size] = row_percentile(ratings, tail)
+        high[start:start + size] = row_percentile(ratings, 100 - tail)
+    return low, high
+
+
+def row_percentile(rows: np.ndarray, percent: float) -> np.ndarray:
+    """
+    Percentile of each row, ignoring NaN.
+
+    Gives the same result as np.nanpercentile(rows, percent, axis=1) with linear
+    interpolation, but works on all rows at once instead of one row at a time.
+
+    Args:
+        rows: Array of shape (rows, values)
+        percent: Percentile between 0 and 100
+
+    Returns:
+        Array of shape (rows,), NaN for rows without values
+    """
+    ordered = np.sort(rows, axis=1)
+    counts = (~np.isnan(rows)).sum(axis=1)
+    position = percent / 100 * np.maximum(counts - 1, 0)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, np.maximum(counts - 1, 0))
+    low = np.take_along_axis(ordered, below[:, None], axis=1)[:, 0]
+    high = np.take_along_axis(ordered, above[:, None], axis=1)[:, 0]
+    return np.where(counts > 0, low + (high - low) * (position - below), np.nan)
+
+
+def aggregate_summary(matrix: ScoreMatrix, ideas: Optional[List[Idea]] = None, estimator: str = "mean",
+                      trim: float = DEFAULT_TRIM, calibrated: bool = False,
+                      weights: Optional[np.ndarray] = None, bootstrap_samples: int = 0,
+                      confidence: float = DEFAULT_CONFIDENCE,
+                      seed: int = DEFAULT_BOOTSTRAP_SEED) -> pd.DataFrame:
+    """
+    Build the summary table with the aggregation engine.
+
+    Args:
+        matrix: Scores of the run
+        ideas: Ideas to include (defaults to all ideas in the matrix)
+        estimator: How the LLMs' scores for a dimension are combined (see ESTIMATORS)
+        trim: Share of the scores cut from each end by the trimmed mean
+        calibrated: Z-score each LLM's scores before combining them
+        weights: Weight per dimension in RUBRIC_DIMENSIONS order (defaults to equal weights)
+        bootstrap_samples: Bootstrap samples for the confidence interval of the
+            Average Rating; 0 leaves out the CI Low and CI High columns
+        confidence: Coverage of the confidence interval
+        seed: Seed for the bootstrap
+
+    Returns:
+        Summary dataframe sorted by Average Rating, with dimension averages and
+        ratings rounded to one decimal (blank where nothing was scored) and the
+        number of LLMs that scored each idea in an Evaluations column
+    """
+    ideas = matrix.ideas if ideas is None else ideas
+    weights = np.ones(len(RUBRIC_DIMENSIONS)) if weights is None else np.asarray(weights, dtype=np.float64)
+    values = matrix.values(ideas)
+    if calibrated:
+        values = calibrate(values)
+
+    dimension_scores = combine_models(values, estimator, trim)
+    ratings = weighted_rating(dimension_scores, weights)
+    columns: Dict[str, np.ndarray] = {
+        **{label: round_half_even(dimension_scores[:, code]) for code, label in enumerate(DIMENSION_LABELS)},
+        "Average Rating": round_half_even(ratings)
+    }
+    if bootstrap_samples:
+        low, high = bootstrap_interval(values, weights, estimator, trim, bootstrap_samples, confidence, seed)
+        columns["CI Low"] = round_half_even(low)
+        columns["CI High"] = round_half_even(high)
+
+    summary_df = pd.DataFrame({
+        "Idea ID": [idea.id for idea in ideas],
+        "Idea Title": [idea.title for idea in ideas],
+        **columns,
+        "Evaluations": (~np.isnan(values)).any(axis=2).sum(axis=1)
+    })
+    return summary_df.sort_values(by="Average Rating", ascending=False)
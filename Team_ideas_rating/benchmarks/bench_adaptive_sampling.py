@@ -0,0 +1,76 @@
+"""
+Benchmark for adaptive model sampling.
+
+Evaluates synthetic ideas with mock LLMs twice, once querying every LLM and
+once in adaptive mode, and compares the number of requests, the wall time and
+the rankings. A share of the ideas (--agreement-rate) gets near-identical
+scores from every mock; the others are scored independently and are contested.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_adaptive_sampling.py [--ideas 2000] [--models 4] [--latency 0.02]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_parser import Idea
+from idea_evaluator import DEFAULT_MAX_CONCURRENCY, EvaluationEngine, create_evaluation_prompt, generate_tables
+from mock_provider import setup_mock_llms
+
+
+def run(llms, ideas, args, adaptive):
+    """Evaluate the ideas and return (summary table, requests sent, seconds)."""
+    engine = EvaluationEngine(llms, create_evaluation_prompt(), max_concurrency=args.max_concurrency,
+                              provider_concurrency={llm_name: args.max_concurrency for llm_name in llms},
+                              adaptive=adaptive)
+    start = time.perf_counter()
+    results = engine.evaluate(ideas)
+    seconds = time.perf_counter() - start
+    _, summary = generate_tables(results, ideas)
+    return summary, engine.queried_pairs, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ideas", type=int, default=2000)
+    parser.add_argument("--models", type=int, default=4)
+    parser.add_argument("--agreement-rate", type=float, default=0.7)
+    parser.add_argument("--latency", type=float, default=0.02, help="Median mock response time in seconds")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    ideas = [Idea(f"B{i:05d}", f"Benchmark idea {i}", "Description") for i in range(args.ideas)]
+    llms = setup_mock_llms(args.models, latency=args.latency, agreement_rate=args.agreement_rate)
+
+    sys.stdout = open(os.devnull, "w")
+    try:
+        full_summary, full_requests, full_seconds = run(llms, ideas, args, adaptive=False)
+        adaptive_summary, adaptive_requests, adaptive_seconds = run(llms, ideas, args, adaptive=True)
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+
+    full = full_summary.set_index("Idea ID")["Average Rating"]
+    adaptive = adaptive_summary.set_index("Idea ID")["Average Rating"].reindex(full.index)
+    correlation = full.rank().corr(adaptive.rank())
+    top = max(1, len(ideas) // 10)
+    overlap = len(set(full.nlargest(top).index) & set(adaptive.nlargest(top).index)) / top
+    mean_error = (full - adaptive).abs().mean()
+
+    print(f"{args.ideas} ideas x {args.models} mock LLMs, {args.agreement_rate:.0%} uncontested, "
+          f"{args.latency * 1000:.0f} ms latency")
+    print(f"  all LLMs:  {full_requests:7d} requests  {full_seconds:7.2f}s")
+    print(f"  adaptive:  {adaptive_requests:7d} requests  {adaptive_seconds:7.2f}s  "
+          f"({1 - adaptive_requests / full_requests:.0%} fewer requests, {full_seconds / adaptive_seconds:.1f}x faster)")
+    print(f"  ranking:   Spearman {correlation:.3f}, top-10% overlap {overlap:.0%}, "
+          f"mean |average rating change| {mean_error:.2f}")
+
+
+if __name__ == "__main__":
+    main()
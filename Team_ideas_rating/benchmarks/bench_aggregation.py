@@ -0,0 +1,88 @@
+"""
+Benchmark for the statistical aggregation engine.
+
+Fills a ScoreMatrix with synthetic scores (each LLM with its own offset, some
+ideas left unscored by an LLM, some missing dimensions) and times
+aggregate_summary() with each estimator, with calibration and with the
+bootstrap confidence interval. The dimension averages of the mean estimator
+are checked against those of generate_tables().
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_aggregation.py [--ideas 20000] [--models 4] [--samples 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregation import ESTIMATORS, aggregate_summary
+from document_parser import Idea
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS
+from score_matrix import MISSING_SCORE, ScoreMatrix
+from tables import generate_tables
+
+
+def build_matrix(num_ideas, num_models, seed=0):
+    """ScoreMatrix with random scores written straight into its array."""
+    rng = np.random.default_rng(seed)
+    ideas = [Idea(f"I{i}", f"Idea {i}", f"Description of idea {i}") for i in range(num_ideas)]
+    matrix = ScoreMatrix(ideas, [f"Model-{m}" for m in range(num_models)])
+    quality = rng.normal(5.5, 1.5, (num_ideas, 1, len(RUBRIC_DIMENSIONS)))
+    offsets = rng.normal(0, 1, (1, num_models, 1))
+    noise = rng.normal(0, 1, matrix.scores.shape)
+    scores = np.clip(np.rint(quality + offsets + noise), 1, 10).astype(np.int8)
+    missing = (rng.random(matrix.scores.shape) < 0.02) | (rng.random(matrix.scores.shape[:2]) < 0.05)[..., None]
+    matrix.scores[:] = np.where(missing, MISSING_SCORE, scores)
+    # Every score shares one remark, so generate_tables() can build the detailed table
+    matrix.remarks.append("Remark")
+    matrix.remark_ids[:] = np.where(missing, -1, 0)
+    return matrix
+
+
+def timed(function):
+    """Return (result of function(), seconds taken)."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ideas", type=int, default=20000)
+    parser.add_argument("--models", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=200, help="Bootstrap samples")
+    args = parser.parse_args()
+
+    matrix = build_matrix(args.ideas, args.models)
+
+    sys.stdout = open(os.devnull, "w")
+    try:
+        (_, summary_df), tables_time = timed(lambda: generate_tables(matrix, matrix.ideas))
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+    aggregated, _ = timed(lambda: aggregate_summary(matrix))
+    # generate_tables() reports 0.0 for dimensions no LLM scored; the engine leaves them blank
+    expected = summary_df.set_index("Idea ID")[DIMENSION_LABELS]
+    actual = aggregated.set_index("Idea ID")[DIMENSION_LABELS].loc[expected.index].fillna(0.0)
+    assert np.array_equal(actual.to_numpy(), expected.to_numpy()), "mean differs from generate_tables()"
+
+    print(f"{args.ideas} ideas x {args.models} LLMs, {args.samples} bootstrap samples "
+          f"(dimension means match generate_tables)")
+    print(f"  generate_tables (detailed and summary) {tables_time * 1000:9.1f} ms")
+    for estimator in ESTIMATORS:
+        _, plain_time = timed(lambda: aggregate_summary(matrix, estimator=estimator))
+        _, calibrated_time = timed(lambda: aggregate_summary(matrix, estimator=estimator, calibrated=True))
+        _, bootstrap_time = timed(lambda: aggregate_summary(matrix, estimator=estimator,
+                                                            bootstrap_samples=args.samples))
+        print(f"  {estimator:<13} summary {plain_time * 1000:8.1f} ms  calibrated {calibrated_time * 1000:8.1f} ms  "
+              f"bootstrap {bootstrap_time * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+End-to-end benchmark with the offline mock provider.
+
+Writes a synthetic ideas document, then times each stage of a run:
+extraction, evaluation with mock LLMs (which return malformed responses,
+rate-limit errors and timeouts at the configured rates), generate_tables()
+and export_tables(). Runs fully offline, without API keys.
+
+Each run also times a fixed reference workload, and the stages are compared
+with baseline_end_to_end.json next to this script as multiples of it, so a
+baseline recorded on one machine can be checked on another. With --check the
+script exits with an error if any stage is slower than the baseline by more
+than the tolerance.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_end_to_end.py [--sizes 10,1000,10000] [--check]
+    python Team_ideas_rating/benchmarks/bench_end_to_end.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import docx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import idea_evaluator
+import tables
+from document_parser import extract_ideas_from_doc
+from idea_evaluator import EvaluationEngine, create_evaluation_prompt
+from mock_provider import setup_mock_llms
+from rate_limiter import ProviderRateLimiter, RetryBudget
+from tables import export_tables, generate_tables
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_end_to_end.json")
+
+STAGES = ["extract", "evaluate", "tables", "export"]
+
+# Stages faster than this are too noisy to compare against the baseline
+MIN_CHECKED_SECONDS = 0.05
+
+# Runs of the reference workload; the fastest one is kept
+REFERENCE_REPEAT = 5
+
+
+def reference_seconds():
+    """Best time of a fixed pure-Python workload, the unit that stage timings are compared in."""
+    records = [{"id": f"B{i:05d}", "title": f"Benchmark idea {i}", "scores": [i % 10 + 1] * 7} for i in range(20000)]
+    best = float("inf")
+    for _ in range(REFERENCE_REPEAT):
+        start = time.perf_counter()
+        decoded = json.loads(json.dumps(records))
+        sorted(decoded, key=lambda record: (sum(record["scores"]), record["title"]))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_document(path, num_ideas):
+    """Write a Word document with num_ideas ideas in the format the evaluator reads."""
+    document = docx.Document()
+    for i in range(num_ideas):
+        document.add_paragraph(f"Idea ID: B{i:05d}")
+        document.add_paragraph(f"Project Title: Benchmark idea {i}")
+        document.add_paragraph(f"An assistant that helps team {i % 37} automate the tedious parts of "
+                               f"their weekly reporting, with integrations for {i % 11 + 1} tools.")
+    document.save(path)
+
+
+def run_once(num_ideas, args, workdir):
+    """Run every stage for num_ideas ideas and return the stage timings and counts."""
+    doc_path = os.path.join(workdir, f"ideas_{num_ideas}.docx")
+    write_document(doc_path, num_ideas)
+    tables.OUTPUT_DETAILED_PATH = os.path.join(workdir, "detailed_ratings.xlsx")
+    tables.OUTPUT_SUMMARY_PATH = os.path.join(workdir, "summary_ratings.xlsx")
+
+    llms = setup_mock_llms(args.models, latency=args.latency, malformed_rate=args.malformed_rate,
+                           rate_limit_rate=args.rate_limit_rate, timeout_rate=args.timeout_rate)
+    retry_budget = RetryBudget(num_ideas * args.models)
+    rate_limiters = {llm_name: ProviderRateLimiter(llm_name, retry_budget=retry_budget, base_delay=0.001)
+                     for llm_name in llms}
+    timings = {}
+
+    start = time.perf_counter()
+    ideas = extract_ideas_from_doc(doc_path)
+    timings["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = EvaluationEngine(llms, create_evaluation_prompt(), max_concurrency=args.max_concurrency,
+                              rate_limiters=rate_limiters, repair_attempts=1)
+    all_evaluations = engine.evaluate(ideas)
+    timings["evaluate"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detailed_df, summary_df = generate_tables(all_evaluations, ideas)
+    timings["tables"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    export_tables(detailed_df, summary_df, args.formats)
+    timings["export"] = time.perf_counter() - start
+
+    failed = sum("error" in evaluation for results in all_evaluations.values() for evaluation in results.values())
+    return {
+        "seconds": timings,
+        "total_seconds": sum(timings.values()),
+        "ideas": len(ideas),
+        "evaluations": len(ideas) * len(llms),
+        "failed_evaluations": failed,
+        "retries": retry_budget.spent,
+        "detailed_rows": len(detailed_df),
+        "evaluations_per_second": len(ideas) * len(llms) / timings["evaluate"]
+    }
+
+
+def compare(results, baseline, reference, tolerance):
+    """
+    Print each stage against the baseline and return the regressions.
+
+    Timings are compared as multiples of the reference workload of their own run;
+    the baseline figures are printed scaled to this machine.
+    """
+    regressions = []
+    for size, result in results.items():
+        previous_result = baseline.get("sizes", {}).get(size)
+        if previous_result is None or "relative" not in previous_result:
+            print(f"  {size} ideas: no baseline")
+            continue
+        for stage in STAGES + ["total"]:
+            current = result["total_seconds"] if stage == "total" else result["seconds"][stage]
+            previous = previous_result["relative"][stage] * reference
+            ratio = current / previous if previous > 0 else 1.0
+            flag = ""
+            if max(current, previous) >= MIN_CHECKED_SECONDS and ratio > 1 + tolerance:
+                regressions.append(f"{size} ideas / {stage}: {current:.3f}s vs baseline {previous:.3f}s")
+                flag = "  REGRESSION"
+            print(f"  {size:>6} ideas {stage:<9} {current:8.3f}s  baseline {previous:8.3f}s  ({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma-separated numbers of ideas")
+    parser.add_argument("--models", type=int, default=4, help="Number of mock LLMs")
+    parser.add_argument("--max-concurrency", type=int, default=idea_evaluator.DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=0.0, help="Median mock response time in seconds")
+    parser.add_argument("--malformed-rate", type=float, default=0.05)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.01)
+    parser.add_argument("--timeout-rate", type=float, default=0.005)
+    parser.add_argument("--format", dest="formats", action="append", choices=idea_evaluator.EXPORT_FORMATS,
+                        help="Export format; may be repeated (default: csv)")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if a stage regressed")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown against the baseline before --check fails (default: 0.5, i.e. 1.5x)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write the results to {BASELINE_PATH}")
+    args = parser.parse_args()
+    args.formats = args.formats or ["csv"]
+    sizes = [int(size) for size in args.sizes.split(",")]
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+    reference = reference_seconds()
+    print(f"Reference workload: {reference * 1000:.1f} ms")
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            sys.stdout = open(os.devnull, "w")
+            try:
+                results[str(size)] = run_once(size, args, workdir)
+            finally:
+                sys.stdout.close()
+                sys.stdout = sys.__stdout__
+            result = results[str(size)]
+            result["relative"] = {stage: result["seconds"][stage] / reference for stage in STAGES}
+            result["relative"]["total"] = result["total_seconds"] / reference
+            print(f"{size} ideas x {args.models} mock LLMs: {result['total_seconds']:.2f}s total, "
+                  f"{result['evaluations_per_second']:.0f} evaluations/s, "
+                  f"{result['failed_evaluations']} failed, {result['retries']} retries")
+
+    settings = {key: getattr(args, key) for key in ("models", "max_concurrency", "latency", "malformed_rate",
+                                                     "rate_limit_rate", "timeout_rate", "formats")}
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "reference_seconds": reference, "sizes": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        print("No baseline found; run with --update-baseline to create one")
+        return
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        print("Warning: settings differ from the baseline, so timings are not directly comparable")
+
+    print("\nComparison with baseline (scaled by the reference workload):")
+    regressions = compare(results, baseline, reference, args.tolerance)
+    if regressions and args.check:
+        raise SystemExit("Performance regressions:\n  " + "\n  ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark for generate_tables().
+
+Builds synthetic evaluation results (10k ideas x 10 LLMs by default), checks
+that generate_tables() matches the original loop-based implementation exactly,
+and reports the speedup.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_generate_tables.py [--ideas N] [--models M]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from idea_evaluator import RUBRIC_DIMENSIONS, Idea, generate_tables
+
+
+def generate_tables_reference(all_evaluations, ideas):
+    """The original nested-loop implementation of generate_tables(), kept for comparison."""
+    detailed_rows = []
+
+    for idea in ideas:
+        idea_evaluations = all_evaluations.get(idea.id, {})
+
+        for llm_name, evaluation in idea_evaluations.items():
+            if "error" in evaluation:
+                continue
+
+            for dimension in RUBRIC_DIMENSIONS:
+                if dimension in evaluation:
+                    detailed_rows.append({
+                        "Idea ID": idea.id,
+                        "Idea Title": idea.title,
+                        "LLM": llm_name,
+                        "Dimension": dimension.replace("_", " ").title(),
+                        "Score": evaluation[dimension]["score"],
+                        "Remark": evaluation[dimension]["remark"]
+                    })
+
+    detailed_df = pd.DataFrame(detailed_rows)
+
+    summary_rows = []
+
+    for idea in ideas:
+        idea_evaluations = all_evaluations.get(idea.id, {})
+        dimension_scores = {dimension: [] for dimension in RUBRIC_DIMENSIONS}
+
+        for llm_name, evaluation in idea_evaluations.items():
+            if "error" in evaluation:
+                continue
+
+            for dimension in dimension_scores.keys():
+                if dimension in evaluation:
+                    dimension_scores[dimension].append(evaluation[dimension]["score"])
+
+        avg_scores = {dim: round(sum(scores)/len(scores), 1) if scores else 0.0
+                      for dim, scores in dimension_scores.items()}
+        overall_avg = round(sum(avg_scores.values()) / len(avg_scores), 1) if avg_scores else 0.0
+
+        summary_rows.append({
+            "Idea ID": idea.id,
+            "Idea Title": idea.title,
+            **{dim.replace("_", " ").title(): avg_scores[dim] for dim in RUBRIC_DIMENSIONS},
+            "Average Rating": overall_avg
+        })
+
+    summary_df = pd.DataFrame(summary_rows)
+    summary_df = summary_df.sort_values(by="Average Rating", ascending=False)
+    return detailed_df, summary_df
+
+
+def make_evaluations(num_ideas, num_models, seed=0):
+    """Create synthetic ideas and evaluations, including failures and missing dimensions."""
+    rng = random.Random(seed)
+    ideas = [Idea(f"I{i}", f"Idea {i}", f"Description {i}") for i in range(num_ideas)]
+    all_evaluations = {}
+    for idea in ideas:
+        results = {}
+        for m in range(num_models):
+            if rng.random() < 0.05:
+                results[f"Model-{m}"] = {"error": "Failed to parse JSON response"}
+                continue
+            results[f"Model-{m}"] = {
+                dim: {"score": rng.randint(1, 10), "remark": f"Remark on {dim}"}
+                for dim in RUBRIC_DIMENSIONS if rng.random() > 0.02
+            }
+        all_evaluations[idea.id] = results
+    return all_evaluations, ideas
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ideas", type=int, default=10000)
+    parser.add_argument("--models", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    all_evaluations, ideas = make_evaluations(args.ideas, args.models)
+
+    sys.stdout = open(os.devnull, "w")
+    try:
+        reference_time, (ref_detailed, ref_summary) = best_of(
+            lambda: generate_tables_reference(all_evaluations, ideas), args.repeat)
+        new_time, (detailed, summary) = best_of(lambda: generate_tables(all_evaluations, ideas), args.repeat)
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+
+    pd.testing.assert_frame_equal(detailed, ref_detailed)
+    pd.testing.assert_frame_equal(summary, ref_summary)
+
+    print(f"generate_tables() on {args.ideas} ideas x {args.models} models "
+          f"({len(detailed)} detailed rows, output identical)")
+    print(f"  reference loops: {reference_time * 1000:8.1f} ms")
+    print(f"  vectorized:      {new_time * 1000:8.1f} ms")
+    print(f"  speedup:         {reference_time / new_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
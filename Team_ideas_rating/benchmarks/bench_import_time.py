@@ -0,0 +1,103 @@
+"""
+Import-time benchmark for the entry-point modules.
+
+Imports each module in a fresh interpreter, several times, and keeps the best
+time. Also reports whether the import loaded any provider SDK, which should
+only happen once an evaluation sets up the provider.
+
+Results are compared against baseline_import_time.json next to this script;
+with --check the script exits with an error if an import is slower than the
+baseline by more than the tolerance, or if it loaded a provider SDK.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_import_time.py [--repeat 5] [--check]
+    python Team_ideas_rating/benchmarks/bench_import_time.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_import_time.json")
+
+MODULES = ["document_parser", "cli", "tables", "idea_evaluator"]
+
+# Modules that should only be imported when the matching provider is set up
+PROVIDER_MODULES = ["openai", "langchain_openai", "langchain_groq", "langchain_google_genai", "docx"]
+
+# Imports faster than this are too noisy to compare against the baseline
+MIN_CHECKED_SECONDS = 0.05
+
+TIMING_CODE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(name for name in {providers!r} if name in sys.modules))
+"""
+
+
+def time_import(module):
+    """Import module in a fresh interpreter and return the seconds taken and the provider SDKs it loaded."""
+    code = TIMING_CODE.format(module=module, providers=PROVIDER_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_DIR, capture_output=True, text=True,
+                            check=True)
+    seconds, providers = output.stdout.split("\n")[:2]
+    return float(seconds), [name for name in providers.split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Imports per module; the best time is kept")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if an import regressed")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed slowdown against the baseline before --check fails (default: 0.5, i.e. 1.5x)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"Write the results to {BASELINE_PATH}")
+    args = parser.parse_args()
+
+    results = {}
+    problems = []
+    for module in MODULES:
+        runs = [time_import(module) for _ in range(args.repeat)]
+        providers = runs[0][1]
+        results[module] = min(seconds for seconds, _ in runs)
+        note = f"  loads {', '.join(providers)}" if providers else ""
+        if providers:
+            problems.append(f"import {module} loads {', '.join(providers)}")
+        print(f"import {module:<16} {results[module] * 1000:8.1f} ms{note}")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"repeat": args.repeat, "seconds": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)["seconds"]
+        print("\nComparison with baseline:")
+        for module, seconds in results.items():
+            previous = baseline.get(module)
+            if previous is None:
+                print(f"  import {module:<16} no baseline")
+                continue
+            ratio = seconds / previous if previous > 0 else 1.0
+            flag = ""
+            if max(seconds, previous) >= MIN_CHECKED_SECONDS and ratio > 1 + args.tolerance:
+                problems.append(f"import {module}: {seconds * 1000:.1f} ms vs baseline {previous * 1000:.1f} ms")
+                flag = "  REGRESSION"
+            print(f"  import {module:<16} {seconds * 1000:8.1f} ms  baseline {previous * 1000:8.1f} ms  "
+                  f"({ratio:5.2f}x){flag}")
+    else:
+        print("No baseline found; run with --update-baseline to create one")
+
+    if problems and args.check:
+        raise SystemExit("Import-time regressions:\n  " + "\n  ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
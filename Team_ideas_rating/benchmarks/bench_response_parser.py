@@ -0,0 +1,157 @@
+"""
+Benchmark for the response parser.
+
+Replays the recorded responses in fixtures/llm_responses.jsonl many times
+through parse_evaluation_response() and through the original fallback-chain
+parser, reports the time per response for each, and counts how many responses
+each one parses correctly.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_response_parser.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import parse_evaluation_response
+from rubric import RUBRIC_DIMENSIONS
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "fixtures", "llm_responses.jsonl")
+
+
+def parse_evaluation_response_reference(response: str, llm_name: str) -> Dict[str, Any]:
+    """
+    The original fallback-chain parser, kept for comparison.
+    
+    Args:
+        response: Raw response text
+        llm_name: Name of the LLM (used in log messages)
+        
+    Returns:
+        Evaluation dictionary, or a dictionary with an "error" key if nothing could be parsed
+    """
+    # Parse the JSON response
+    try:
+        print(f"  Parsing JSON response from {llm_name}...")
+        
+        # Clean up the response to extract just the JSON part
+        cleaned_response = response
+        
+        # Try to find JSON object between curly braces
+        json_match = re.search(r'(\{.*\})', response, re.DOTALL)
+        if json_match:
+            cleaned_response = json_match.group(1)
+            print(f"  Extracted JSON object from response")
+        
+        # Try to parse the JSON
+        evaluation = json.loads(cleaned_response)
+        
+        # Verify that the evaluation contains the expected dimensions
+        missing_dimensions = [dim for dim in RUBRIC_DIMENSIONS if dim not in evaluation]
+        if missing_dimensions:
+            print(f"  Warning: Missing dimensions in {llm_name} evaluation: {missing_dimensions}")
+            # Try to extract missing dimensions from the response if possible
+            for dim in missing_dimensions:
+                dim_pattern = rf'"{dim}".*?"score".*?(\d+)'
+                score_match = re.search(dim_pattern, response, re.IGNORECASE | re.DOTALL)
+                if score_match:
+                    score = int(score_match.group(1))
+                    remark_pattern = rf'"{dim}".*?"remark".*?"([^"]+)"'
+                    remark_match = re.search(remark_pattern, response, re.IGNORECASE | re.DOTALL)
+                    remark = remark_match.group(1) if remark_match else "No remark provided"
+                    evaluation[dim] = {"score": score, "remark": remark}
+                    print(f"  Extracted {dim} from response text: score={score}")
+        
+        print(f"  {llm_name} evaluation complete - SUCCESS")
+        print(f"  Dimensions found: {list(evaluation.keys())}")
+        return evaluation
+    except json.JSONDecodeError:
+        print(f"  Error: {llm_name} did not return valid JSON.")
+        print(f"  Response preview: {response[:100]}...")
+        
+        # Attempt to extract structured data from non-JSON response
+        try:
+            print(f"  Attempting to extract structured data from non-JSON response...")
+            extracted_data = {}
+            
+            # Extract dimensions using regex patterns
+            for dim in RUBRIC_DIMENSIONS:
+                # Look for patterns like "Novelty: 8" or "Novelty - 8"
+                score_pattern = rf'{dim}[:\s-]+(\d+)(?:/10)?'
+                score_match = re.search(score_pattern, response, re.IGNORECASE)
+                
+                if score_match:
+                    score = int(score_match.group(1))
+                    
+                    # Try to find a remark for this dimension
+                    remark_pattern = rf'{dim}[:\s-]+\d+(?:/10)?[:\s-]*(.*?)(?=\n\n|\n[A-Z]|$)'
+                    remark_match = re.search(remark_pattern, response, re.IGNORECASE | re.DOTALL)
+                    remark = remark_match.group(1).strip() if remark_match else "No remark provided"
+                    
+                    extracted_data[dim] = {"score": score, "remark": remark}
+                    print(f"  Extracted {dim} from text: score={score}")
+            
+            if extracted_data:
+                print(f"  Successfully extracted data for {len(extracted_data)} dimensions")
+                return extracted_data
+            else:
+                raise ValueError("Could not extract structured data")
+                
+        except Exception as e:
+            print(f"  Failed to extract structured data: {str(e)}")
+            return {
+                "error": "Failed to parse JSON response",
+                "raw_response": response
+            }
+
+
+def scores(evaluation):
+    if "error" in evaluation:
+        return None
+    # The reference parser passes through whatever JSON it finds, so entries may not be objects
+    return {dim: entry.get("score") if isinstance(entry, dict) else entry
+            for dim, entry in evaluation.items() if dim in RUBRIC_DIMENSIONS}
+
+
+def run(parse, corpus, repeat):
+    """Parse every response repeat times, returning seconds per response and the number parsed correctly."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [parse(case["response"], "Bench") for case in corpus]
+    elapsed = time.perf_counter() - start
+    correct = sum(scores(result) == case["expected"] for result, case in zip(results, corpus))
+    return elapsed / (repeat * len(corpus)), correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    sys.stdout = open(os.devnull, "w")
+    try:
+        reference_time, reference_correct = run(parse_evaluation_response_reference, corpus, args.repeat)
+        new_time, new_correct = run(parse_evaluation_response, corpus, args.repeat)
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+
+    print(f"Parsing {len(corpus)} recorded responses x {args.repeat}")
+    print(f"  reference parser: {reference_time * 1e6:8.1f} us/response, {reference_correct}/{len(corpus)} correct")
+    print(f"  response_parser:  {new_time * 1e6:8.1f} us/response, {new_correct}/{len(corpus)} correct")
+    print(f"  speedup:          {reference_time / new_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark for the compact score matrix.
+
+Feeds the same synthetic evaluations (one unique remark per score, some
+failures with raw responses, some missing dimensions) into the nested results
+dictionary and into a ScoreMatrix, and reports the memory each one retains,
+measured with tracemalloc, and the time generate_tables() takes on each. The
+tables are checked to be identical. A third pass also records every
+evaluation in a run checkpoint, as idea_evaluator.py does, to show the memory
+of a whole run.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_score_matrix.py [--ideas 20000] [--models 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_parser import Idea
+from rubric import DEFAULT_REMARK, RUBRIC_DIMENSIONS
+from run_checkpoint import RunCheckpoint
+from score_matrix import ScoreMatrix
+from tables import generate_tables
+
+RAW_RESPONSE = "Sorry, I cannot produce JSON for this request. " * 20
+
+
+def iter_evaluations(ideas, llm_names, seed=0):
+    """Yield (idea, LLM name, evaluation) like an evaluation run, building each evaluation fresh."""
+    rng = random.Random(seed)
+    for idea in ideas:
+        for llm_name in llm_names:
+            if rng.random() < 0.05:
+                yield idea, llm_name, {"error": "Failed to parse JSON response", "raw_response": RAW_RESPONSE}
+                continue
+            yield idea, llm_name, {
+                dimension: {"score": rng.randint(1, 10),
+                            "remark": DEFAULT_REMARK if rng.random() < 0.05 else
+                            f"{llm_name} on {dimension} of {idea.id}: the idea {rng.random():.6f} fits well"}
+                for dimension in RUBRIC_DIMENSIONS if rng.random() > 0.02
+            }
+
+
+def retained_bytes(build):
+    """Return (result of build(), bytes still allocated once it returns)."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ideas", type=int, default=20000)
+    parser.add_argument("--models", type=int, default=4)
+    args = parser.parse_args()
+
+    llm_names = [f"Model-{m}" for m in range(args.models)]
+    ideas, idea_bytes = retained_bytes(
+        lambda: [Idea(f"I{i}", f"Idea {i}", f"Description of idea {i}") for i in range(args.ideas)])
+
+    def build_dictionaries():
+        all_evaluations = {idea.id: {} for idea in ideas}
+        for idea, llm_name, evaluation in iter_evaluations(ideas, llm_names):
+            all_evaluations[idea.id][llm_name] = evaluation
+        return all_evaluations
+
+    def build_matrix():
+        matrix = ScoreMatrix(ideas, llm_names)
+        for idea, llm_name, evaluation in iter_evaluations(ideas, llm_names):
+            matrix.add(idea, llm_name, evaluation)
+        return matrix
+
+    def build_matrix_and_checkpoint(directory):
+        matrix = ScoreMatrix(ideas, llm_names)
+        checkpoint = RunCheckpoint(directory)
+        for idea, llm_name, evaluation in iter_evaluations(ideas, llm_names):
+            matrix.add(idea, llm_name, evaluation)
+            checkpoint.record(idea, llm_name, evaluation)
+        return matrix, checkpoint
+
+    all_evaluations, dictionary_bytes = retained_bytes(build_dictionaries)
+    matrix, matrix_bytes = retained_bytes(build_matrix)
+    with tempfile.TemporaryDirectory() as tmp:
+        (_, checkpoint), run_bytes = retained_bytes(lambda: build_matrix_and_checkpoint(tmp))
+        checkpoint.close()
+
+    sys.stdout = open(os.devnull, "w")
+    try:
+        start = time.perf_counter()
+        dictionary_tables = generate_tables(all_evaluations, ideas)
+        dictionary_time = time.perf_counter() - start
+        start = time.perf_counter()
+        matrix_tables = generate_tables(matrix, ideas)
+        matrix_time = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+
+    for dictionary_table, matrix_table in zip(dictionary_tables, matrix_tables):
+        pd.testing.assert_frame_equal(dictionary_table, matrix_table)
+
+    pairs = args.ideas * args.models
+    print(f"{args.ideas} ideas x {args.models} LLMs ({len(matrix.remarks)} distinct remarks, tables identical)")
+    print(f"  ideas:              {idea_bytes / 2**20:8.1f} MiB  {idea_bytes / args.ideas:7.0f} B/idea")
+    print(f"  nested dictionaries:{dictionary_bytes / 2**20:8.1f} MiB  {dictionary_bytes / pairs:7.0f} B/pair  "
+          f"generate_tables {dictionary_time * 1000:7.1f} ms")
+    print(f"  score matrix:       {matrix_bytes / 2**20:8.1f} MiB  {matrix_bytes / pairs:7.0f} B/pair  "
+          f"generate_tables {matrix_time * 1000:7.1f} ms")
+    print(f"  matrix + checkpoint:{run_bytes / 2**20:8.1f} MiB  {run_bytes / pairs:7.0f} B/pair")
+    print(f"  {dictionary_bytes / matrix_bytes:.1f}x less memory, {dictionary_time / matrix_time:.1f}x faster tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for near-duplicate detection.
+
+Builds synthetic ideas, a share of which are copies of earlier ideas with a
+few words changed, and times the similarity index at several sizes. For sizes up
+to --brute-force-max, also compares every idea with every earlier
+representative, checks that both find the same groups, and reports the
+speedup.
+
+Usage:
+    python Team_ideas_rating/benchmarks/bench_similarity_index.py [--sizes 1000,10000,30000] [--duplicate-rate 0.2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_parser import Idea
+from similarity_index import DEFAULT_SIMILARITY_THRESHOLD, SimilarityIndex, jaccard, shingles
+
+WORDS = ("app platform team data report customer model automate workflow dashboard alert search chat schedule "
+         "invoice budget travel health learning hiring review feedback sensor map mobile web api cloud "
+         "privacy secure offline sync share export import forecast inventory order delivery").split()
+
+
+def make_ideas(count, duplicate_rate, seed=0):
+    """Random 80-word ideas, a share of which are earlier ideas with one to three words changed."""
+    rng = random.Random(seed)
+    ideas = []
+    for i in range(count):
+        if ideas and rng.random() < duplicate_rate:
+            source = rng.choice(ideas)
+            words = source.description.split()
+            for _ in range(rng.randint(1, 3)):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            ideas.append(Idea(f"B{i}", source.title, " ".join(words)))
+        else:
+            ideas.append(Idea(f"B{i}", f"Idea {i}", " ".join(rng.choice(WORDS) for _ in range(80))))
+    return ideas
+
+
+def index_groups(ideas, threshold):
+    """Group ideas with the MinHash/LSH index and return (groups, comparisons)."""
+    index = SimilarityIndex(threshold)
+    groups = {}
+    for idea in ideas:
+        representative = index.add(idea)
+        if representative is not None:
+            groups.setdefault(representative, []).append(idea.id)
+    return groups, index.comparisons
+
+
+def brute_force_groups(ideas, threshold):
+    """Group ideas by comparing each one with every earlier representative and return (groups, comparisons)."""
+    representatives, groups, comparisons = [], {}, 0
+    for idea in ideas:
+        idea_shingles = shingles(f"{idea.title}\n{idea.description}")
+        best, best_similarity = None, 0.0
+        for rep_id, rep_shingles in representatives:
+            comparisons += 1
+            similarity = jaccard(idea_shingles, rep_shingles)
+            if similarity >= threshold and similarity > best_similarity:
+                best, best_similarity = rep_id, similarity
+        if best is not None:
+            groups.setdefault(best, []).append(idea.id)
+        else:
+            representatives.append((idea.id, idea_shingles))
+    return groups, comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,30000", help="Comma-separated numbers of ideas")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_SIMILARITY_THRESHOLD)
+    parser.add_argument("--brute-force-max", type=int, default=2000,
+                        help="Largest size also run with the pairwise comparison")
+    args = parser.parse_args()
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        ideas = make_ideas(size, args.duplicate_rate)
+        start = time.perf_counter()
+        groups, comparisons = index_groups(ideas, args.threshold)
+        index_time = time.perf_counter() - start
+        members = sum(len(group) for group in groups.values())
+        print(f"{size} ideas: {members} near-duplicates in {len(groups)} groups")
+        print(f"  MinHash/LSH index: {index_time * 1000:9.1f} ms  {comparisons:>12,} comparisons")
+
+        if size <= args.brute_force_max:
+            start = time.perf_counter()
+            reference, reference_comparisons = brute_force_groups(ideas, args.threshold)
+            reference_time = time.perf_counter() - start
+            print(f"  pairwise:          {reference_time * 1000:9.1f} ms  {reference_comparisons:>12,} comparisons  "
+                  f"({reference_time / index_time:.1f}x slower, same groups: {groups == reference})")
+
+
+if __name__ == "__main__":
+    main()
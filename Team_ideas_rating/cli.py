@@ -0,0 +1,204 @@
+"""
+Command-line entry point for the idea evaluator.
+
+Subcommands:
+    parse     List the ideas found in the input files
+    evaluate  Evaluate the ideas with every configured LLM (same options as idea_evaluator.py)
+    report    Rebuild the rating tables from the last run's checkpoint without calling any LLM
+    serve     Run a local HTTP service that evaluates submitted ideas as queued jobs (same options as server.py)
+
+Each subcommand imports only the modules it needs, so `parse` starts without
+loading LangChain, pandas or any provider SDK.
+
+Usage:
+    python Team_ideas_rating/cli.py parse [--input PATH ...]
+    python Team_ideas_rating/cli.py evaluate [--batch-size N] [--format csv] ...
+    python Team_ideas_rating/cli.py report [--checkpoint-dir DIR] [--format csv] ...
+    python Team_ideas_rating/cli.py report --estimator median --calibrate --weight feasibility=2 --bootstrap 1000
+    python Team_ideas_rating/cli.py serve [--port 8765] [--max-queued-jobs 16] ...
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from document_parser import DEFAULT_DOCUMENT_PATH
+from run_checkpoint import DEFAULT_CHECKPOINT_DIR
+
+# Export formats offered by `report`; kept in sync with exporters.EXPORTERS
+REPORT_FORMATS = ["xlsx", "parquet", "csv", "jsonl"]
+
+# Estimators offered by `report --estimator`; kept in sync with aggregation.ESTIMATORS
+AGGREGATION_ESTIMATORS = ["mean", "median", "trimmed-mean"]
+
+
+def run_parse(args: argparse.Namespace) -> None:
+    """Print the ideas found in the input files."""
+    from ingestion import ingest_ideas
+
+    ideas = ingest_ideas(args.inputs or [DEFAULT_DOCUMENT_PATH], workers=args.ingest_workers)
+    print()
+    for idea in ideas:
+        description = idea.description.replace("\n", " ")
+        print(f"{idea.id}: {idea.title}")
+        print(f"    {description[:100]}{'...' if len(description) > 100 else ''}")
+
+
+def run_evaluate(args: argparse.Namespace) -> None:
+    """Run the full evaluation, passing the remaining options to idea_evaluator.main()."""
+    from idea_evaluator import main as evaluate_main
+
+    evaluate_main(args.options)
+
+
+def run_report(args: argparse.Namespace) -> None:
+    """Rebuild and export the rating tables from the checkpoint of a previous run."""
+    from ingestion import ingest_ideas
+    from run_checkpoint import CHECKPOINT_FILENAME, RunCheckpoint
+    from score_matrix import ScoreMatrix
+    from tables import export_tables, generate_tables
+
+    if not os.path.exists(os.path.join(args.checkpoint_dir, CHECKPOINT_FILENAME)):
+        raise SystemExit(f"Error: no checkpoint found in {args.checkpoint_dir}; run `evaluate` first")
+    aggregated = args.estimator is not None or args.calibrate or args.weights or args.bootstrap
+    if aggregated:
+        from aggregation import aggregate_summary, parse_dimension_weights
+
+        try:
+            weights = parse_dimension_weights(args.weights or [])
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+
+    checkpoint = RunCheckpoint(args.checkpoint_dir, read_only=True)
+    try:
+        # Report on the files the run evaluated unless others are given
+        inputs = args.inputs or checkpoint.manifest.get("inputs") or [DEFAULT_DOCUMENT_PATH]
+        ideas = ingest_ideas(inputs, workers=args.ingest_workers)
+        ideas_by_id = {idea.id: idea for idea in ideas}
+        llm_names = checkpoint.manifest.get("llms", [])
+        matrix = ScoreMatrix(ideas, llm_names)
+        found = 0
+        for idea in ideas:
+            for llm_name in llm_names:
+                evaluation = checkpoint.completed(idea, llm_name)
+                if evaluation is not None:
+                    matrix.add(idea, llm_name, evaluation)
+                    found += 1
+
+        # Near-duplicates that were not evaluated reuse their representative's results
+        for idea_id, member_ids in checkpoint.manifest.get("duplicates", {}).items():
+            if idea_id not in ideas_by_id:
+                continue
+            for member_id in member_ids:
+                member = ideas_by_id.get(member_id)
+                if member is None or matrix.models([member])[0]:
+                    continue
+                for llm_name in llm_names:
+                    evaluation = checkpoint.completed(ideas_by_id[idea_id], llm_name)
+                    if evaluation is not None:
+                        matrix.add(member, llm_name, {**evaluation, "duplicate_of": idea_id})
+                        found += 1
+    finally:
+        checkpoint.close()
+
+    print(f"Loaded {found} of {len(ideas) * len(llm_names)} evaluations from {args.checkpoint_dir}")
+    detailed_df, summary_df = generate_tables(matrix, ideas)
+    if aggregated:
+        try:
+            summary_df = aggregate_summary(matrix, ideas, estimator=args.estimator or "mean", trim=args.trim,
+                                           calibrated=args.calibrate, weights=weights,
+                                           bootstrap_samples=args.bootstrap, confidence=args.confidence,
+                                           seed=args.seed)
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+    export_tables(detailed_df, summary_df, args.formats, args.excel_max_rows)
+
+
+def run_serve(args: argparse.Namespace) -> None:
+    """Start the evaluation server, passing the remaining options to server.main()."""
+    from server import main as serve_main
+
+    serve_main(args.options)
+
+
+def add_input_arguments(parser: argparse.ArgumentParser, help_text: str,
+                        default_text: str = DEFAULT_DOCUMENT_PATH) -> None:
+    """Add the --input and --ingest-workers options to a subcommand parser."""
+    parser.add_argument("--input", "--document", dest="inputs", action="append", metavar="PATH",
+                        help=f"{help_text}; may be repeated (default: {default_text})")
+    parser.add_argument("--ingest-workers", type=int, default=None,
+                        help="Processes used to parse the input files (default: CPU count)")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments, with the subcommand's handler in `handler`
+    """
+    parser = argparse.ArgumentParser(description="Evaluate product ideas using multiple LLMs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parse_parser = subparsers.add_parser("parse", help="List the ideas found in the input files")
+    add_input_arguments(parse_parser, "Ideas file (.docx, .md, .txt or .csv), directory or glob pattern")
+    parse_parser.set_defaults(handler=run_parse)
+
+    # Options after `evaluate` are parsed by idea_evaluator.parse_args()
+    evaluate_parser = subparsers.add_parser("evaluate", add_help=False,
+                                            help="Evaluate the ideas (run `evaluate --help` for options)")
+    evaluate_parser.set_defaults(handler=run_evaluate)
+
+    report_parser = subparsers.add_parser("report", help="Rebuild the rating tables from the last run's checkpoint")
+    add_input_arguments(report_parser, "Ideas file, directory or glob pattern the run evaluated",
+                        "the inputs recorded in the checkpoint")
+    report_parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR,
+                               help=f"Checkpoint of the run (default: {DEFAULT_CHECKPOINT_DIR})")
+    report_parser.add_argument("--format", dest="formats", action="append", choices=REPORT_FORMATS,
+                               help="Output format for the rating tables; may be repeated (default: xlsx)")
+    report_parser.add_argument("--excel-max-rows", type=int, default=None,
+                               help="Only write the first N rows of each table to Excel")
+    # Any of these options builds the summary with aggregation.aggregate_summary()
+    aggregation_group = report_parser.add_argument_group(
+        "aggregation", "Build the summary table with the statistical aggregation engine")
+    aggregation_group.add_argument("--estimator", choices=AGGREGATION_ESTIMATORS, default=None,
+                                   help="How the LLMs' scores for a dimension are combined (default: mean)")
+    aggregation_group.add_argument("--trim", type=float, default=0.25,
+                                   help="Share of the scores cut from each end by trimmed-mean (default: 0.25)")
+    aggregation_group.add_argument("--calibrate", action="store_true",
+                                   help="Z-score each LLM's scores so harsh and lenient LLMs count equally")
+    aggregation_group.add_argument("--weight", dest="weights", action="append", metavar="NAME=W",
+                                   help="Weight of a rubric dimension in the Average Rating; may be repeated "
+                                        "(default: 1 for every dimension)")
+    aggregation_group.add_argument("--bootstrap", type=int, default=0, metavar="N",
+                                   help="Add a bootstrap confidence interval for the Average Rating from N samples")
+    aggregation_group.add_argument("--confidence", type=float, default=0.95,
+                                   help="Coverage of the confidence interval (default: 0.95)")
+    aggregation_group.add_argument("--seed", type=int, default=0, help="Seed for the bootstrap (default: 0)")
+    report_parser.set_defaults(handler=run_report)
+
+    # Options after `serve` are parsed by server.parse_args()
+    serve_parser = subparsers.add_parser("serve", add_help=False,
+                                         help="Run the local evaluation server (run `serve --help` for options)")
+    serve_parser.set_defaults(handler=run_serve)
+
+    args, options = parser.parse_known_args(argv)
+    if args.command in ("evaluate", "serve"):
+        args.options = options
+    elif options:
+        parser.error(f"unrecognized arguments: {' '.join(options)}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the selected subcommand."""
+    args = parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,88 @@
+"""
+Consensus
+
+Helpers for adaptive model sampling. Instead of sending every idea to every
+LLM, the cheapest models are queried first and more models are only added
+while they disagree: an idea stops once the variance of the scores on every
+rubric dimension is at or below a threshold.
+"""
+
+from statistics import pvariance
+from typing import Any, Dict, List, Optional
+
+from instrumentation import MODEL_PRICES
+from rubric import RUBRIC_DIMENSIONS
+
+# Maximum population variance of the scores on each dimension for models to agree;
+# two models agree when they are within one point of each other on every dimension
+DEFAULT_CONSENSUS_VARIANCE = 0.25
+
+# Number of successful evaluations needed before consensus can be reached
+DEFAULT_MIN_CONSENSUS_MODELS = 2
+
+
+def order_models_by_cost(llm_names: List[str], prices: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Order LLMs from cheapest to most expensive.
+
+    Args:
+        llm_names: LLM names in their configured order
+        prices: (input, output) USD per million tokens keyed by LLM name (defaults to MODEL_PRICES)
+
+    Returns:
+        LLM names ordered by combined input and output price; LLMs without a
+        price come last, and ties keep their configured order
+    """
+    prices = MODEL_PRICES if prices is None else prices
+
+    def cost(position_name):
+        position, llm_name = position_name
+        price = prices.get(llm_name)
+        return (price is None, sum(price) if price else 0.0, position)
+
+    return [llm_name for _, llm_name in sorted(enumerate(llm_names), key=cost)]
+
+
+def has_consensus(evaluations: Dict[str, Dict[str, Any]], max_variance: float = DEFAULT_CONSENSUS_VARIANCE,
+                  min_models: int = DEFAULT_MIN_CONSENSUS_MODELS) -> bool:
+    """
+    Check whether the LLMs agree on an idea.
+
+    Args:
+        evaluations: Evaluation dictionaries for one idea keyed by LLM name
+        max_variance: Maximum score variance allowed on each dimension
+        min_models: Number of LLMs that must have scored every dimension
+
+    Returns:
+        True if at least min_models LLMs scored each dimension and every variance is within max_variance
+    """
+    for dimension in RUBRIC_DIMENSIONS:
+        scores = [evaluation[dimension]["score"] for evaluation in evaluations.values()
+                  if "error" not in evaluation and dimension in evaluation]
+        if len(scores) < max(min_models, 1) or (len(scores) > 1 and pvariance(scores) > max_variance):
+            return False
+    return True
+
+
+def next_models(model_order: List[str], evaluations: Dict[str, Dict[str, Any]],
+                max_variance: float = DEFAULT_CONSENSUS_VARIANCE,
+                min_models: int = DEFAULT_MIN_CONSENSUS_MODELS) -> List[str]:
+    """
+    Choose which LLMs to query next for an idea.
+
+    Args:
+        model_order: All LLM names, cheapest first
+        evaluations: Evaluation dictionaries received so far for the idea, keyed by LLM name
+        max_variance: Maximum score variance allowed on each dimension
+        min_models: Number of successful evaluations needed before consensus can be reached
+
+    Returns:
+        The next LLMs to query: enough to reach min_models successful evaluations,
+        then one at a time while the LLMs disagree; empty once they agree or every
+        LLM has been queried
+    """
+    if has_consensus(evaluations, max_variance, min_models):
+        return []
+    remaining = [llm_name for llm_name in model_order if llm_name not in evaluations]
+    successes = sum("error" not in evaluation for evaluation in evaluations.values())
+    return remaining[:max(min_models - successes, 1)]
@@ -0,0 +1,128 @@
+"""
+Document Parser
+
+Reads product ideas from the Word document. Each idea starts at an
+"Idea ID: <ID>" marker, followed by a "Project Title:" line and a free-text
+description. python-docx is only imported when a document is actually read.
+"""
+
+import hashlib
+import os
+import re
+from typing import Iterable, Iterator, List
+
+DEFAULT_DOCUMENT_PATH = os.path.join("Team_ideas_rating", "team_ideas.docx")
+
+
+class Idea:
+    """Class to represent a product idea."""
+
+    # No per-instance __dict__, keeping each idea small on runs with many ideas
+    __slots__ = ("id", "title", "description")
+
+    def __init__(self, id: str, title: str, description: str):
+        self.id = id
+        self.title = title
+        self.description = description
+
+    def __str__(self):
+        return f"{self.id}: {self.title}\n{self.description}"
+
+    def content_hash(self) -> str:
+        """Return a stable hash of the idea's ID, title and description."""
+        content = "\0".join([self.id, self.title, self.description])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# Marks the start of an idea; the ID runs up to the first whitespace or punctuation
+IDEA_MARKER_PATTERN = re.compile(r"Idea ID:\s*([A-Za-z0-9][\w.-]*)")
+PROJECT_TITLE_PATTERN = re.compile(r"Project Title:(.*?)(?:\n|$)")
+
+
+def build_idea(idea_id: str, idea_text: str) -> Idea:
+    """
+    Build an Idea from the text of one idea section.
+
+    Args:
+        idea_id: ID taken from the "Idea ID:" marker
+        idea_text: Section text, starting at the marker
+
+    Returns:
+        Idea object
+    """
+    idea_text = idea_text.strip()
+    # Extract title (assuming it's the line after "Project Title:")
+    title_match = PROJECT_TITLE_PATTERN.search(idea_text)
+    title = title_match.group(1).strip() if title_match else "Untitled"
+
+    # Extract description (everything after the title)
+    description = idea_text[title_match.end():].strip() if title_match else idea_text
+
+    return Idea(idea_id, title, description)
+
+
+def iter_ideas_from_lines(lines: Iterable[str]) -> Iterator[Idea]:
+    """
+    Parse ideas from a stream of paragraphs or lines in a single pass.
+
+    Every "Idea ID: <ID>" marker starts a new idea, which runs until the next
+    marker or the end of the stream. Only the text of the current idea is held
+    in memory, and each idea is yielded as soon as the next marker is seen.
+
+    Args:
+        lines: Paragraph or line texts, in document order
+
+    Yields:
+        Idea objects in document order
+    """
+    idea_id = None
+    pieces: List[str] = []
+
+    for line in lines:
+        position = 0
+        for marker in IDEA_MARKER_PATTERN.finditer(line):
+            if idea_id is not None:
+                pieces.append(line[position:marker.start()])
+                yield build_idea(idea_id, "\n".join(pieces))
+            idea_id = marker.group(1)
+            pieces = []
+            position = marker.start()
+
+        if idea_id is not None:
+            pieces.append(line[position:])
+
+    if idea_id is not None:
+        yield build_idea(idea_id, "\n".join(pieces))
+
+
+def iter_ideas_from_doc(doc_path: str) -> Iterator[Idea]:
+    """
+    Lazily extract ideas from the Word document.
+
+    Args:
+        doc_path: Path to the Word document
+
+    Yields:
+        Idea objects in document order
+    """
+    import docx
+
+    doc = docx.Document(doc_path)
+    yield from iter_ideas_from_lines(para.text for para in doc.paragraphs)
+
+
+def extract_ideas_from_doc(doc_path: str) -> List[Idea]:
+    """
+    Extract ideas from the Word document.
+
+    Args:
+        doc_path: Path to the Word document
+
+    Returns:
+        List of Idea objects
+    """
+    print(f"Reading document: {doc_path}")
+    ideas = list(iter_ideas_from_doc(doc_path))
+
+    print(f"Extracted {len(ideas)} ideas from the document")
+    return ideas
@@ -0,0 +1,81 @@
+"""
+Exporters
+
+Pluggable writers for the detailed and summary rating tables. Each exporter
+writes one dataframe to one file; EXPORTERS maps a format name (which is also
+the file extension) to its exporter.
+"""
+
+import importlib.util
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+# Columns with few distinct values, stored dictionary-encoded in Parquet files
+DICTIONARY_COLUMNS = ["Idea ID", "Idea Title", "LLM", "Dimension"]
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def export_excel(df: pd.DataFrame, path: str, max_rows: Optional[int] = None) -> None:
+    """
+    Write a dataframe to an Excel workbook.
+
+    Args:
+        df: Dataframe to write
+        path: Output .xlsx path
+        max_rows: Only write the first max_rows rows (None writes everything)
+    """
+    if max_rows is not None and len(df) > max_rows:
+        print(f"  Writing the first {max_rows} of {len(df)} rows to {path}; "
+              "use a columnar format for the full table")
+        df = df.head(max_rows)
+    df.to_excel(path, index=False)
+
+
+def export_parquet(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a dataframe to a compressed Parquet file.
+
+    Repeated text columns (IDs, titles, LLM and dimension names) are stored as
+    categoricals so they are dictionary-encoded in the file.
+
+    Args:
+        df: Dataframe to write
+        path: Output .parquet path
+    """
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("Parquet export requires pyarrow. Install it with: pip install pyarrow")
+
+    df = df.astype({column: "category" for column in DICTIONARY_COLUMNS if column in df.columns})
+    df.to_parquet(path, engine="pyarrow", compression=PARQUET_COMPRESSION, index=False)
+
+
+def export_csv(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a dataframe to a UTF-8 CSV file.
+
+    Args:
+        df: Dataframe to write
+        path: Output .csv path
+    """
+    df.to_csv(path, index=False, encoding="utf-8")
+
+
+def export_jsonl(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a dataframe to a JSON Lines file with one record per row.
+
+    Args:
+        df: Dataframe to write
+        path: Output .jsonl path
+    """
+    df.to_json(path, orient="records", lines=True, force_ascii=False)
+
+
+EXPORTERS: Dict[str, Callable[..., None]] = {
+    "xlsx": export_excel,
+    "parquet": export_parquet,
+    "csv": export_csv,
+    "jsonl": export_jsonl
+}
@@ -6,144 +6,106 @@ and generates detailed and summary rating tables.
 """
 
 import os
-import docx
-import pandas as pd
-from typing import List, Dict, Any, Tuple
-from langchain_community.llms import OpenAI
-from langchain_community.chat_models import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.llms.base import LLM
-import requests
-from typing import Optional, List, Mapping, Any
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Set, Tuple
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
-from langchain.schema import HumanMessage, SystemMessage
 import json
-import re
-from dotenv import load_dotenv
-from openai import OpenAI as OpenAIClient
-import textwrap
-from colorama import init
-
-# Initialize colorama
-init()
-
-class PerplexityLLM(LLM):
-    """LLM wrapper for Perplexity.ai API using OpenAI client."""
-    
-    api_key: str
-    model_name: str = "sonar"
-    temperature: float = 0.7
-    max_tokens: int = 500
-    
-    @property
-    def _llm_type(self) -> str:
-        return "perplexity"
-    
-    def _call(self, prompt: str, stop: Optional[List[str]] = None) -> str:
-        """Call the Perplexity API using OpenAI client and return the response."""
-        client = OpenAIClient(api_key=self.api_key, base_url="https://api.perplexity.ai")
-        
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ]
-        
-        response = client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature
-        )
-        
-        return response.choices[0].message.content.strip()
-    
-    @property
-    def _identifying_params(self) -> Mapping[str, Any]:
-        return {
-            "model_name": self.model_name,
-            "temperature": self.temperature,
-            "max_tokens": self.max_tokens
-        }
+from response_cache import ResponseCache, DEFAULT_CACHE_PATH, DEFAULT_TTL_SECONDS, llm_cache_params, make_cache_key
+from run_checkpoint import RunCheckpoint, DEFAULT_CHECKPOINT_DIR
+from rate_limiter import ProviderRateLimiter, RetryBudget, DEFAULT_RETRY_BUDGET
+from rubric import RUBRIC_DIMENSIONS, DIMENSION_LABELS, RUBRIC_SCHEMA, BATCH_RUBRIC_SCHEMA
+from response_parser import parse_evaluation_response, parse_batch_response
+from streaming import StreamMetrics, stream_completion
+from instrumentation import RunMetrics, UsageCallback, track_call
+from mock_provider import setup_mock_llms
+from document_parser import Idea, DEFAULT_DOCUMENT_PATH
+from ingestion import ingest_ideas
+from consensus import (order_models_by_cost, next_models, DEFAULT_CONSENSUS_VARIANCE,
+                       DEFAULT_MIN_CONSENSUS_MODELS)
+
+# Modules that load pandas or numpy are imported when a run starts, not on import
+if TYPE_CHECKING:
+    from result_sink import StreamingResultSink
+
+# API keys read from the environment (or a .env file), one per provider
+API_KEY_NAMES = ["OPENAI_API_KEY", "GROQ_API_KEY", "GOOGLE_API_KEY", "PERPLEXITY_API_KEY"]
+
+# Define paths
+DOCUMENT_PATH = DEFAULT_DOCUMENT_PATH
+RUN_REPORT_PATH = os.path.join("Team_ideas_rating", "run_report.json")
 
-# Load environment variables from .env file
-load_dotenv()
+# Concurrency defaults for the evaluation engine
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PROVIDER_CONCURRENCY = 4
 
-# Print a message about API keys
-print("Checking for API keys...")
-api_keys = {
-    "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY"),
-    "GROQ_API_KEY": os.environ.get("GROQ_API_KEY"),
-    "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY"),
-    "PERPLEXITY_API_KEY": os.environ.get("PERPLEXITY_API_KEY")
+# Default quotas per LLM as (requests per minute, tokens per minute); None means unlimited
+PROVIDER_RATE_LIMITS = {
+    "GPT-4": (500, 30000),
+    "LLaMA-3-70B": (30, 6000),
+    "Gemini-1.5-Flash": (15, 1000000),
+    "Perplexity-Sonar": (50, None)
 }
 
-available_keys = [key for key, value in api_keys.items() if value]
-if available_keys:
-    print(f"Found API keys for: {', '.join(available_keys)}")
-else:
-    print("Warning: No API keys found. Using mock LLMs for testing.")
-    print("To use real LLMs, copy .env.template to .env and add your API keys.")
+# Rough completion size used to estimate the tokens a request will consume
+EXPECTED_COMPLETION_TOKENS = 600
 
-# Define paths
-DOCUMENT_PATH = os.path.join("Team_ideas_rating", "team_ideas.docx")
-OUTPUT_DETAILED_PATH = os.path.join("Team_ideas_rating", "detailed_ratings.xlsx")
-OUTPUT_SUMMARY_PATH = os.path.join("Team_ideas_rating", "summary_ratings.xlsx")
+# Output formats offered by --format; kept in sync with exporters.EXPORTERS
+EXPORT_FORMATS = ["xlsx", "parquet", "csv", "jsonl"]
 
-class Idea:
-    """Class to represent a product idea."""
-    
-    def __init__(self, id: str, title: str, description: str):
-        self.id = id
-        self.title = title
-        self.description = description
-    
-    def __str__(self):
-        return f"{self.id}: {self.title}\n{self.description}"
+# Functions of tables.py that can still be imported from this module, loaded on first access
+TABLE_FUNCTIONS = ["generate_tables", "build_summary_table", "export_tables"]
+
+# Batch-prompt defaults (a batch size of 1 sends one request per idea)
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_BATCH_TOKEN_BUDGET = 8000
+
+# Number of repair re-prompts sent for a response that is malformed or missing dimensions
+DEFAULT_REPAIR_ATTEMPTS = 1
 
-def extract_ideas_from_doc(doc_path: str) -> List[Idea]:
+# Longest malformed response quoted back to the LLM in a repair prompt
+MAX_REPAIR_RESPONSE_CHARS = 4000
+
+# Settings for the mock LLMs used when no API keys are set: a little latency, and
+# an occasional malformed response so the parsing and repair paths are exercised
+MOCK_LLM_OPTIONS = {"latency": 0.2, "malformed_rate": 0.1}
+
+def load_environment() -> List[str]:
     """
-    Extract ideas from the Word document.
+    Load API keys from the .env file and report which providers are available.
+    
+    Called at the start of a run rather than on import, so importing this module
+    has no side effects.
     
-    Args:
-        doc_path: Path to the Word document
-        
     Returns:
-        List of Idea objects
+        Names of the API keys that are set
     """
-    print(f"Reading document: {doc_path}")
-    doc = docx.Document(doc_path)
-    
-    # Extract text from the document
-    full_text = "\n".join([para.text for para in doc.paragraphs])
+    from dotenv import load_dotenv
+    from colorama import init
     
-    # Define patterns to identify ideas
-    idea_patterns = {
-        "E1": r"Idea ID: E1.*?(?=Idea ID: G1|Idea ID: S1|$)",
-        "G1": r"Idea ID: G1.*?(?=Idea ID: E1|Idea ID: S1|$)",
-        "S1": r"Idea ID: S1.*?(?=Idea ID: E1|Idea ID: G1|Idea ID: S2|$)",
-        "S2": r"Idea ID: S2.*?(?=Idea ID: E1|Idea ID: G1|Idea ID: S1|Idea ID: S3|$)",
-        "S3": r"Idea ID: S3.*?(?=Idea ID: E1|Idea ID: G1|Idea ID: S1|Idea ID: S2|$)"
-    }
+    init()
+    load_dotenv()
     
-    ideas = []
-    
-    for idea_id, pattern in idea_patterns.items():
-        match = re.search(pattern, full_text, re.DOTALL)
-        if match:
-            idea_text = match.group(0).strip()
-            # Extract title (assuming it's the line after "Project Title:")
-            title_match = re.search(r"Project Title:(.*?)(?:\n|$)", idea_text)
-            title = title_match.group(1).strip() if title_match else "Untitled"
-            
-            # Extract description (everything after the title)
-            description = idea_text[title_match.end():].strip() if title_match else idea_text
-            
-            ideas.append(Idea(idea_id, title, description))
+    print("Checking for API keys...")
+    available_keys = [key for key in API_KEY_NAMES if os.environ.get(key)]
+    if available_keys:
+        print(f"Found API keys for: {', '.join(available_keys)}")
+    else:
+        print("Warning: No API keys found. Using mock LLMs for testing.")
+        print("To use real LLMs, copy .env.template to .env and add your API keys.")
+    return available_keys
+
+def llm_class_names(llm: Any) -> Set[str]:
+    """
+    Return the class names in an LLM's class hierarchy.
     
-    print(f"Extracted {len(ideas)} ideas from the document")
-    return ideas
+    Provider checks compare class names instead of using isinstance(), so the
+    provider SDKs do not have to be imported just to check an LLM's type.
+    """
+    return {cls.__name__ for cls in type(llm).__mro__}
 
 def setup_llms() -> Dict[str, Any]:
     """
@@ -154,20 +116,26 @@ def setup_llms() -> Dict[str, Any]:
     """
     llms = {}
     
+    # Provider SDKs are imported only for the providers that have an API key
     # Set up OpenAI models
     if os.environ.get("OPENAI_API_KEY"):
-        llms["GPT-4"] = ChatOpenAI(model_name="gpt-4o", temperature=0.2)
+        from langchain_openai import ChatOpenAI
+        llms["GPT-4"] = ChatOpenAI(model_name="gpt-4o", temperature=0.2, max_retries=0)
     
     # Set up Groq models
     if os.environ.get("GROQ_API_KEY"):
-        llms["LLaMA-3-70B"] = ChatGroq(model="llama3-70b-8192", temperature=0.2)
+        from langchain_groq import ChatGroq
+        llms["LLaMA-3-70B"] = ChatGroq(model="llama3-70b-8192", temperature=0.2, max_retries=0)
     
     # Set up Google models
     if os.environ.get("GOOGLE_API_KEY"):
-        llms["Gemini-1.5-Flash"] = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.2)
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        llms["Gemini-1.5-Flash"] = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.2, max_retries=0)
     
     # Set up Perplexity models
     if os.environ.get("PERPLEXITY_API_KEY"):
+        from perplexity_llm import PerplexityLLM, DEFAULT_PERPLEXITY_MAX_TOKENS
+        
         # Print Perplexity API key (masked for security)
         perplexity_api_key = os.environ.get("PERPLEXITY_API_KEY")
         print(f"Perplexity API Key: {perplexity_api_key[:7]}.....{perplexity_api_key[-7:]}")
@@ -176,22 +144,89 @@ def setup_llms() -> Dict[str, Any]:
             api_key=perplexity_api_key,
             model_name="sonar",
             temperature=0.7,
-            max_tokens=500
+            max_tokens=DEFAULT_PERPLEXITY_MAX_TOKENS
         )
     
-    # If no API keys are set, use a mock LLM for testing
+    # If no API keys are set, use mock LLMs that answer with rubric JSON for testing
     if not llms:
         print("Warning: No API keys found. Using mock LLMs for testing.")
-        from langchain.llms.fake import FakeListLLM
-        
-        llms["Mock-LLM-1"] = FakeListLLM(responses=["This is a mock response from LLM 1"])
-        llms["Mock-LLM-2"] = FakeListLLM(responses=["This is a mock response from LLM 2"])
-        llms["Mock-LLM-3"] = FakeListLLM(responses=["This is a mock response from LLM 3"])
-        llms["Mock-LLM-4"] = FakeListLLM(responses=["This is a mock response from LLM 4"])
+        llms.update(setup_mock_llms(**MOCK_LLM_OPTIONS))
     
     print(f"Set up {len(llms)} LLM connections")
     return llms
 
+def structured_output_kwargs(llm: Any, batch: bool = False) -> Dict[str, Any]:
+    """
+    Build request arguments that switch an LLM to its native structured-output or JSON mode.
+    
+    OpenAI and Perplexity are held to the rubric JSON schema, Groq and Gemini to
+    plain JSON output. Groq's JSON mode only allows objects, so it is left off for
+    batched requests, which ask for an array.
+    
+    Args:
+        llm: LLM instance
+        batch: Whether the request is a batched (multi-idea) request
+        
+    Returns:
+        Keyword arguments for the LLM call (empty if the LLM has no such mode)
+    """
+    schema = BATCH_RUBRIC_SCHEMA if batch else RUBRIC_SCHEMA
+    name = "idea_evaluations" if batch else "idea_evaluation"
+    
+    class_names = llm_class_names(llm)
+    if "ChatOpenAI" in class_names:
+        return {"response_format": {"type": "json_schema",
+                                    "json_schema": {"name": name, "schema": schema, "strict": True}}}
+    if "PerplexityLLM" in class_names:
+        return {"response_format": {"type": "json_schema", "json_schema": {"schema": schema}}}
+    if "ChatGroq" in class_names:
+        return {} if batch else {"response_format": {"type": "json_object"}}
+    if "ChatGoogleGenerativeAI" in class_names:
+        return {"generation_config": {"response_mime_type": "application/json"}}
+    return {}
+
+def stream_usage_kwargs(llm: Any) -> Dict[str, Any]:
+    """
+    Build request arguments that make an LLM report token usage for a streamed completion.
+    
+    OpenAI-compatible APIs only send usage at the end of a stream when asked to;
+    Groq and Gemini send it on their own.
+    
+    Args:
+        llm: LLM instance
+        
+    Returns:
+        Keyword arguments for the streaming call (empty if the LLM needs none)
+    """
+    if llm_class_names(llm) & {"ChatOpenAI", "PerplexityLLM"}:
+        return {"stream_options": {"include_usage": True}}
+    return {}
+
+def setup_rate_limiters(llm_names: List[str], retry_budget: Optional[RetryBudget] = None,
+                        overrides: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None
+                        ) -> Dict[str, ProviderRateLimiter]:
+    """
+    Set up a rate limiter for each LLM.
+    
+    Retries for the LLM clients themselves are disabled in setup_llms(), so these
+    limiters are the only place failed requests are retried.
+    
+    Args:
+        llm_names: Names of the LLMs returned by setup_llms()
+        retry_budget: Retry budget shared by all LLMs
+        overrides: Quotas as (requests per minute, tokens per minute) keyed by
+            LLM name, replacing the defaults in PROVIDER_RATE_LIMITS
+        
+    Returns:
+        Dictionary of rate limiters keyed by LLM name
+    """
+    retry_budget = retry_budget or RetryBudget()
+    quotas = {**PROVIDER_RATE_LIMITS, **(overrides or {})}
+    return {
+        llm_name: ProviderRateLimiter(llm_name, *quotas.get(llm_name, (None, None)), retry_budget=retry_budget)
+        for llm_name in llm_names
+    }
+
 def create_evaluation_prompt() -> PromptTemplate:
     """
     Create a prompt template for idea evaluation.
@@ -240,271 +275,982 @@ def create_evaluation_prompt() -> PromptTemplate:
         template=template
     )
 
-def evaluate_idea(idea: Idea, llms: Dict[str, Any], prompt_template: PromptTemplate) -> Dict[str, Any]:
+def create_repair_prompt() -> PromptTemplate:
     """
-    Evaluate an idea using multiple LLMs.
+    Create a prompt template asking an LLM to fix its own malformed evaluation.
+    
+    The prompt quotes the malformed response and the rubric schema but not the
+    full evaluation instructions, so it is much cheaper than re-running the idea.
+    
+    Returns:
+        PromptTemplate instance
+    """
+    template = """
+    Your previous evaluation of the product idea below could not be read because it was not valid JSON
+    or did not include every rating.
+    
+    IDEA ID: {idea_id}
+    TITLE: {idea_title}
+    DESCRIPTION: {idea_description}
+    
+    YOUR PREVIOUS RESPONSE:
+    {response}
+    
+    Rewrite it as a single JSON object that follows this JSON schema, with scores from 1 to 10:
+    {schema}
+    
+    Keep your original scores and remarks wherever they are present, and only add the missing ones.
+    Ensure your response is valid JSON with no additional text before or after.
+    """
+    
+    return PromptTemplate(
+        input_variables=["idea_id", "idea_title", "idea_description", "response", "schema"],
+        template=template
+    )
+
+def needs_repair(evaluation: Dict[str, Any]) -> bool:
+    """Return True if an evaluation failed to parse or is missing any rubric dimension."""
+    return "error" in evaluation or any(dim not in evaluation for dim in RUBRIC_DIMENSIONS)
+
+def repair_evaluation(idea: Idea, llm_name: str, llm: Any, response: str, evaluation: Dict[str, Any],
+                      llm_kwargs: Optional[Dict[str, Any]] = None,
+                      rate_limiter: Optional[ProviderRateLimiter] = None,
+                      run_metrics: Optional[RunMetrics] = None) -> Dict[str, Any]:
+    """
+    Ask an LLM to repair a malformed or incomplete response.
     
     Args:
         idea: Idea object
-        llms: Dictionary of LLM instances
+        llm_name: Name of the LLM (as used in the results)
+        llm: LLM instance
+        response: The malformed response text
+        evaluation: What could be parsed from the response
+        llm_kwargs: Extra arguments for the LLM call (e.g. structured-output settings)
+        rate_limiter: Optional rate limiter that paces and retries the request
+        run_metrics: Optional collector for the request's timings, tokens and cost
+        
+    Returns:
+        The evaluation with any dimensions recovered by the repair added; dimensions
+        parsed from the original response are kept as they were
+    """
+    print(f"  Asking {llm_name} to repair its response for idea {idea.id}...")
+    repair_inputs = {
+        "idea_id": idea.id,
+        "idea_title": idea.title,
+        "idea_description": idea.description,
+        "response": response[:MAX_REPAIR_RESPONSE_CHARS],
+        "schema": json.dumps(RUBRIC_SCHEMA, separators=(",", ":"))
+    }
+    chain = LLMChain(llm=llm, prompt=create_repair_prompt(), llm_kwargs=llm_kwargs or {})
+    
+    try:
+        with track_call(run_metrics, llm_name, "repair", create_repair_prompt().format(**repair_inputs)) as call:
+            callbacks = [UsageCallback(call)]
+            if rate_limiter is not None:
+                estimated_tokens = (len(response[:MAX_REPAIR_RESPONSE_CHARS]) + len(idea.description)) // 4 + \
+                    EXPECTED_COMPLETION_TOKENS
+                repaired_response = rate_limiter.call(lambda: chain.run(**repair_inputs, callbacks=callbacks),
+                                                      estimated_tokens)
+            else:
+                repaired_response = chain.run(**repair_inputs, callbacks=callbacks)
+            call.output_chars = len(repaired_response)
+    except Exception as e:
+        print(f"  Repair request to {llm_name} failed: {str(e)}")
+        return evaluation
+    
+    repaired = parse_evaluation_response(repaired_response, llm_name)
+    if "error" in repaired:
+        return evaluation
+    if "error" in evaluation:
+        return repaired
+    return {**repaired, **evaluation}
+
+def evaluate_idea_with_llm(idea: Idea, llm_name: str, llm: Any, prompt_template: PromptTemplate,
+                           cache: Optional[ResponseCache] = None,
+                           rate_limiter: Optional[ProviderRateLimiter] = None,
+                           structured_output: bool = False,
+                           repair_attempts: int = 0,
+                           stream_metrics: Optional[StreamMetrics] = None,
+                           run_metrics: Optional[RunMetrics] = None) -> Dict[str, Any]:
+    """
+    Evaluate an idea using a single LLM.
+    
+    Args:
+        idea: Idea object
+        llm_name: Name of the LLM (as used in the results)
+        llm: LLM instance
         prompt_template: PromptTemplate instance
+        cache: Optional response cache; responses that parse successfully are stored in it
+        rate_limiter: Optional rate limiter that paces and retries the request
+        structured_output: Request the provider's native structured-output / JSON mode
+        repair_attempts: Number of repair re-prompts for a malformed or incomplete response
+        stream_metrics: If given, stream the completion, stop as soon as a complete
+            rubric object has arrived, and record the stream's timings here
+        run_metrics: Optional collector for each request's timings, tokens and cost
         
     Returns:
-        Dictionary of evaluation results
+        Evaluation dictionary, or a dictionary with an "error" key on failure
     """
-    print(f"Evaluating idea {idea.id}: {idea.title}")
-    print(f"Number of LLMs available: {len(llms)}")
-    print(f"LLM names: {', '.join(llms.keys())}")
+    print(f"\n  Using {llm_name}...")
     
-    results = {}
+    try:
+        prompt_inputs = {
+            "idea_id": idea.id,
+            "idea_title": idea.title,
+            "idea_description": idea.description
+        }
+        
+        rendered_prompt = prompt_template.format(**prompt_inputs)
+        
+        llm_kwargs = structured_output_kwargs(llm) if structured_output else {}
+        
+        # Look up the response in the cache
+        response = None
+        cache_key = None
+        if cache is not None:
+            cache_key = make_cache_key(llm_name, llm_cache_params(llm), rendered_prompt, idea.content_hash(),
+                                       llm_kwargs)
+            response = cache.get(cache_key)
+            if response is not None:
+                print(f"  Using cached response from {llm_name}")
+                cache_key = None
+                if run_metrics is not None:
+                    run_metrics.record_cache_hit(llm_name)
+        
+        if response is None:
+            with track_call(run_metrics, llm_name, "evaluate", rendered_prompt) as call:
+                if stream_metrics is not None:
+                    # Stream the completion and cancel it once the rubric object is complete
+                    def request() -> str:
+                        text, stats = stream_completion(llm, rendered_prompt, **llm_kwargs,
+                                                        **stream_usage_kwargs(llm))
+                        stream_metrics.record(llm_name, stats)
+                        return text
+                else:
+                    # Create a chain for this LLM
+                    chain = LLMChain(llm=llm, prompt=prompt_template, llm_kwargs=llm_kwargs)
+                    
+                    def request() -> str:
+                        return chain.run(**prompt_inputs, callbacks=[UsageCallback(call)])
+                
+                # Run the request
+                print(f"  Sending request to {llm_name}...")
+                if rate_limiter is not None:
+                    estimated_tokens = len(rendered_prompt) // 4 + EXPECTED_COMPLETION_TOKENS
+                    response = rate_limiter.call(request, estimated_tokens)
+                else:
+                    response = request()
+                call.output_chars = len(response)
+            print(f"  Received response from {llm_name} in {call.wall_time:.2f}s")
+        
+        evaluation = parse_evaluation_response(response, llm_name)
+        repaired = False
+        for _ in range(repair_attempts):
+            if not needs_repair(evaluation):
+                break
+            evaluation = repair_evaluation(idea, llm_name, llm, response, evaluation, llm_kwargs, rate_limiter,
+                                           run_metrics)
+            repaired = True
+        
+        if cache_key is not None and "error" not in evaluation:
+            # Cache the repaired evaluation so the repair is not repeated next run
+            cache.put(cache_key, llm_name, json.dumps(evaluation) if repaired else response)
+        return evaluation
+    except Exception as e:
+        print(f"  Error with {llm_name}: {str(e)}")
+        return {
+            "error": str(e)
+        }
+
+def format_batch_ideas(ideas: List[Idea]) -> str:
+    """
+    Render ideas as the IDEAS section of the batch evaluation prompt.
     
-    for llm_name, llm in llms.items():
-        print(f"\n  Using {llm_name}...")
+    Args:
+        ideas: List of Idea objects
+        
+    Returns:
+        Text block listing each idea's ID, title and description
+    """
+    return "\n\n".join(
+        f"IDEA ID: {idea.id}\nTITLE: {idea.title}\nDESCRIPTION: {idea.description}"
+        for idea in ideas
+    )
+
+def estimate_batch_tokens(ideas: List[Idea], batch_prompt: PromptTemplate) -> int:
+    """
+    Estimate the prompt plus completion tokens of one batched request.
+    
+    Uses the common rule of thumb of roughly four characters per token.
+    
+    Args:
+        ideas: Ideas in the batch
+        batch_prompt: Batch PromptTemplate instance
+        
+    Returns:
+        Estimated number of tokens
+    """
+    prompt_chars = len(batch_prompt.template) + len(format_batch_ideas(ideas))
+    return prompt_chars // 4 + EXPECTED_COMPLETION_TOKENS * len(ideas)
+
+def split_into_batches(ideas: List[Idea], batch_prompt: PromptTemplate, max_batch_size: int,
+                       token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET) -> List[List[Idea]]:
+    """
+    Pack ideas into batches of at most max_batch_size ideas within a token budget.
+    
+    An idea that does not fit the budget on its own gets a batch to itself.
+    
+    Args:
+        ideas: List of Idea objects
+        batch_prompt: Batch PromptTemplate instance
+        max_batch_size: Maximum number of ideas per batch
+        token_budget: Maximum estimated tokens per batched request
+        
+    Returns:
+        List of batches, preserving idea order
+    """
+    fixed_tokens = len(batch_prompt.template) // 4
+    batches = []
+    current = []
+    current_tokens = fixed_tokens
+    
+    for idea in ideas:
+        idea_tokens = len(format_batch_ideas([idea])) // 4 + EXPECTED_COMPLETION_TOKENS
+        if current and (len(current) >= max_batch_size or current_tokens + idea_tokens > token_budget):
+            batches.append(current)
+            current = []
+            current_tokens = fixed_tokens
+        current.append(idea)
+        current_tokens += idea_tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+def evaluate_batch_with_llm(ideas: List[Idea], llm_name: str, llm: Any, batch_prompt: PromptTemplate,
+                            prompt_template: PromptTemplate, cache: Optional[ResponseCache] = None,
+                            rate_limiter: Optional[ProviderRateLimiter] = None,
+                            structured_output: bool = False,
+                            repair_attempts: int = 0,
+                            stream_metrics: Optional[StreamMetrics] = None,
+                            run_metrics: Optional[RunMetrics] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluate several ideas with one LLM request.
+    
+    Ideas missing from the batched response are evaluated individually with
+    evaluate_idea_with_llm().
+    
+    Args:
+        ideas: Ideas in the batch
+        llm_name: Name of the LLM (as used in the results)
+        llm: LLM instance
+        batch_prompt: Batch PromptTemplate instance
+        prompt_template: Single-idea PromptTemplate instance used for fallbacks
+        cache: Optional response cache; each idea's evaluation is cached separately
+        rate_limiter: Optional rate limiter that paces and retries the request
+        structured_output: Request the provider's native structured-output / JSON mode
+        repair_attempts: Number of repair re-prompts for single-idea fallbacks
+        stream_metrics: If given, single-idea fallbacks are streamed and timed here
+            (batched requests always wait for the full completion)
+        run_metrics: Optional collector for each request's timings, tokens and cost
         
+    Returns:
+        Dictionary of evaluation results keyed by idea ID
+    """
+    print(f"\n  Using {llm_name} for a batch of {len(ideas)} ideas...")
+    
+    results = {}
+    cache_keys = {}
+    pending = []
+    
+    # Each idea is cached under the batch prompt rendered for that idea alone,
+    # so hits do not depend on which other ideas shared its batch
+    key_kwargs = structured_output_kwargs(llm, batch=True) if structured_output else {}
+    for idea in ideas:
+        if cache is not None:
+            cache_key = make_cache_key(llm_name, llm_cache_params(llm),
+                                       batch_prompt.format(ideas=format_batch_ideas([idea])),
+                                       idea.content_hash(), key_kwargs)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print(f"  Using cached response from {llm_name} for idea {idea.id}")
+                results[idea.id] = json.loads(cached)
+                if run_metrics is not None:
+                    run_metrics.record_cache_hit(llm_name)
+                continue
+            cache_keys[idea.id] = cache_key
+        pending.append(idea)
+    
+    if pending:
         try:
-            # Create a chain for this LLM
-            chain = LLMChain(llm=llm, prompt=prompt_template)
+            llm_kwargs = structured_output_kwargs(llm, batch=True) if structured_output else {}
+            if "PerplexityLLM" in llm_class_names(llm):
+                # Leave room for one rubric per idea in the completion
+                llm_kwargs["max_tokens"] = max(llm.max_tokens, EXPECTED_COMPLETION_TOKENS * len(pending))
+            chain = LLMChain(llm=llm, prompt=batch_prompt, llm_kwargs=llm_kwargs)
+            ideas_block = format_batch_ideas(pending)
             
-            # Run the chain
-            print(f"  Sending request to {llm_name}...")
-            response = chain.run(
-                idea_id=idea.id,
-                idea_title=idea.title,
-                idea_description=idea.description
-            )
-            print(f"  Received response from {llm_name}")
+            print(f"  Sending batch request to {llm_name}...")
+            with track_call(run_metrics, llm_name, "batch", batch_prompt.format(ideas=ideas_block)) as call:
+                callbacks = [UsageCallback(call)]
+                if rate_limiter is not None:
+                    estimated_tokens = estimate_batch_tokens(pending, batch_prompt)
+                    response = rate_limiter.call(lambda: chain.run(ideas=ideas_block, callbacks=callbacks),
+                                                 estimated_tokens)
+                else:
+                    response = chain.run(ideas=ideas_block, callbacks=callbacks)
+                call.output_chars = len(response)
+            print(f"  Received batch response from {llm_name} in {call.wall_time:.2f}s")
             
-            # Parse the JSON response
-            try:
-                print(f"  Parsing JSON response from {llm_name}...")
-                
-                # Clean up the response to extract just the JSON part
-                cleaned_response = response
-                
-                # Try to find JSON object between curly braces
-                json_match = re.search(r'(\{.*\})', response, re.DOTALL)
-                if json_match:
-                    cleaned_response = json_match.group(1)
-                    print(f"  Extracted JSON object from response")
-                
-                # Try to parse the JSON
-                evaluation = json.loads(cleaned_response)
-                
-                # Verify that the evaluation contains the expected dimensions
-                expected_dimensions = ["novelty", "technical_complexity", "impact_potential", 
-                                      "market_viability", "feasibility", "user_desirability", 
-                                      "trend_alignment"]
-                
-                missing_dimensions = [dim for dim in expected_dimensions if dim not in evaluation]
-                if missing_dimensions:
-                    print(f"  Warning: Missing dimensions in {llm_name} evaluation: {missing_dimensions}")
-                    # Try to extract missing dimensions from the response if possible
-                    for dim in missing_dimensions:
-                        dim_pattern = rf'"{dim}".*?"score".*?(\d+)'
-                        score_match = re.search(dim_pattern, response, re.IGNORECASE | re.DOTALL)
-                        if score_match:
-                            score = int(score_match.group(1))
-                            remark_pattern = rf'"{dim}".*?"remark".*?"([^"]+)"'
-                            remark_match = re.search(remark_pattern, response, re.IGNORECASE | re.DOTALL)
-                            remark = remark_match.group(1) if remark_match else "No remark provided"
-                            evaluation[dim] = {"score": score, "remark": remark}
-                            print(f"  Extracted {dim} from response text: score={score}")
-                
-                results[llm_name] = evaluation
-                print(f"  {llm_name} evaluation complete - SUCCESS")
-                print(f"  Dimensions found: {list(evaluation.keys())}")
-            except json.JSONDecodeError:
-                print(f"  Error: {llm_name} did not return valid JSON.")
-                print(f"  Response preview: {response[:100]}...")
-                
-                # Attempt to extract structured data from non-JSON response
-                try:
-                    print(f"  Attempting to extract structured data from non-JSON response...")
-                    extracted_data = {}
-                    
-                    # Extract dimensions using regex patterns
-                    for dim in ["novelty", "technical_complexity", "impact_potential", 
-                               "market_viability", "feasibility", "user_desirability", 
-                               "trend_alignment"]:
-                        # Look for patterns like "Novelty: 8" or "Novelty - 8"
-                        score_pattern = rf'{dim}[:\s-]+(\d+)(?:/10)?'
-                        score_match = re.search(score_pattern, response, re.IGNORECASE)
-                        
-                        if score_match:
-                            score = int(score_match.group(1))
-                            
-                            # Try to find a remark for this dimension
-                            remark_pattern = rf'{dim}[:\s-]+\d+(?:/10)?[:\s-]*(.*?)(?=\n\n|\n[A-Z]|$)'
-                            remark_match = re.search(remark_pattern, response, re.IGNORECASE | re.DOTALL)
-                            remark = remark_match.group(1).strip() if remark_match else "No remark provided"
-                            
-                            extracted_data[dim] = {"score": score, "remark": remark}
-                            print(f"  Extracted {dim} from text: score={score}")
-                    
-                    if extracted_data:
-                        print(f"  Successfully extracted data for {len(extracted_data)} dimensions")
-                        results[llm_name] = extracted_data
-                    else:
-                        raise ValueError("Could not extract structured data")
-                        
-                except Exception as e:
-                    print(f"  Failed to extract structured data: {str(e)}")
-                    results[llm_name] = {
-                        "error": "Failed to parse JSON response",
-                        "raw_response": response
-                    }
+            evaluations = parse_batch_response(response, llm_name)
         except Exception as e:
-            print(f"  Error with {llm_name}: {str(e)}")
-            results[llm_name] = {
-                "error": str(e)
-            }
+            print(f"  Error with {llm_name} batch request: {str(e)}")
+            evaluations = {}
+        
+        for idea in pending:
+            evaluation = evaluations.get(idea.id)
+            if evaluation is None:
+                continue
+            results[idea.id] = evaluation
+            if idea.id in cache_keys:
+                cache.put(cache_keys[idea.id], llm_name, json.dumps(evaluation))
     
-    # Print summary of results
+    # Fall back to single-idea requests for anything the batch did not cover
+    missing = [idea for idea in ideas if idea.id not in results]
+    if missing:
+        print(f"  {llm_name} batch response missing {len(missing)} ideas; evaluating them individually")
+    for idea in missing:
+        results[idea.id] = evaluate_idea_with_llm(idea, llm_name, llm, prompt_template, cache, rate_limiter,
+                                                  structured_output, repair_attempts, stream_metrics,
+                                                  run_metrics)
+    
+    print(f"  {llm_name} batch evaluation complete")
+    return results
+
+def print_evaluation_summary(idea: Idea, results: Dict[str, Any]) -> None:
+    """
+    Print a summary of the evaluation results for one idea.
+    
+    Args:
+        idea: Idea object
+        results: Dictionary of evaluation results keyed by LLM name
+    """
     successful_llms = [name for name, eval in results.items() if "error" not in eval]
     failed_llms = [name for name, eval in results.items() if "error" in eval]
     
     print(f"\nEvaluation summary for idea {idea.id}:")
     print(f"  Successful evaluations: {len(successful_llms)} ({', '.join(successful_llms)})")
     print(f"  Failed evaluations: {len(failed_llms)} ({', '.join(failed_llms)})")
+
+def create_batch_evaluation_prompt() -> PromptTemplate:
+    """
+    Create a prompt template that evaluates several ideas in one request.
     
-    return results
+    Returns:
+        PromptTemplate instance with a single "ideas" input
+    """
+    template = """
+    You are an expert product evaluator. Please evaluate each of the following product ideas independently:
+    
+    {ideas}
+    
+    Rate each idea on a scale of 1 to 10 (where 10 is the highest) across the following dimensions:
+    
+    1. Novelty - How original or unique is the idea?
+    2. Technical Complexity - How challenging is it to implement?
+    3. Impact Potential - What's the potential benefit or social relevance?
+    4. Market Viability - How likely is it to succeed commercially?
+    5. Feasibility - Is it practical to build in the near term?
+    6. User Desirability - Will users genuinely want or need it?
+    7. Trend Alignment - Does it align with emerging trends?
+    
+    For each dimension, provide:
+    1. A numerical rating (1-10)
+    2. A brief remark (1-3 lines) explaining your rating
+    
+    Format your response as a JSON array with one object per idea, using the exact IDEA ID given above:
+    [
+        {{
+            "idea_id": "<IDEA ID>",
+            "novelty": {{"score": <1-10>, "remark": "<your remark>"}},
+            "technical_complexity": {{"score": <1-10>, "remark": "<your remark>"}},
+            "impact_potential": {{"score": <1-10>, "remark": "<your remark>"}},
+            "market_viability": {{"score": <1-10>, "remark": "<your remark>"}},
+            "feasibility": {{"score": <1-10>, "remark": "<your remark>"}},
+            "user_desirability": {{"score": <1-10>, "remark": "<your remark>"}},
+            "trend_alignment": {{"score": <1-10>, "remark": "<your remark>"}},
+            "overall_impression": "<1-2 sentence summary of your overall impression>"
+        }}
+    ]
+    
+    Ensure your response is a valid JSON array covering every idea, with no additional text before or after.
+    """
+    
+    return PromptTemplate(
+        input_variables=["ideas"],
+        template=template
+    )
 
-def generate_tables(all_evaluations: Dict[str, Dict[str, Any]], ideas: List[Idea]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def evaluate_idea(idea: Idea, llms: Dict[str, Any], prompt_template: PromptTemplate,
+                  cache: Optional[ResponseCache] = None,
+                  run_metrics: Optional[RunMetrics] = None) -> Dict[str, Any]:
     """
-    Generate detailed and summary tables from evaluation results.
+    Evaluate an idea using multiple LLMs.
     
     Args:
-        all_evaluations: Dictionary of evaluation results for all ideas
-        ideas: List of Idea objects
+        idea: Idea object
+        llms: Dictionary of LLM instances
+        prompt_template: PromptTemplate instance
+        cache: Optional response cache
+        run_metrics: Optional collector for each request's timings, tokens and cost
         
     Returns:
-        Tuple of (detailed_df, summary_df)
+        Dictionary of evaluation results
+    """
+    print(f"Evaluating idea {idea.id}: {idea.title}")
+    print(f"Number of LLMs available: {len(llms)}")
+    print(f"LLM names: {', '.join(llms.keys())}")
+    
+    results = {}
+    
+    for llm_name, llm in llms.items():
+        results[llm_name] = evaluate_idea_with_llm(idea, llm_name, llm, prompt_template, cache,
+                                                   run_metrics=run_metrics)
+    
+    # Print summary of results
+    print_evaluation_summary(idea, results)
+    
+    return results
+
+class EvaluationEngine:
     """
-    print("Generating tables...")
+    Concurrent evaluator for the full idea x LLM matrix.
     
-    # Create detailed ratings dataframe
-    detailed_rows = []
+    Every (idea, LLM) pair is scheduled at once. Each provider gets its own
+    thread pool sized to its concurrency limit, and a global semaphore caps the
+    number of requests in flight across all providers. In adaptive mode only the
+    cheapest LLMs are scheduled up front, and more are added per idea while
+    their scores disagree.
+    """
     
-    for idea in ideas:
-        idea_evaluations = all_evaluations.get(idea.id, {})
+    def __init__(self, llms: Dict[str, Any], prompt_template: PromptTemplate,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 provider_concurrency: Optional[Dict[str, int]] = None,
+                 cache: Optional[ResponseCache] = None,
+                 checkpoint: Optional[RunCheckpoint] = None,
+                 rate_limiters: Optional[Dict[str, ProviderRateLimiter]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_token_budget: int = DEFAULT_BATCH_TOKEN_BUDGET,
+                 sink: Optional["StreamingResultSink"] = None,
+                 keep_results: bool = True,
+                 structured_output: bool = False,
+                 repair_attempts: int = 0,
+                 stream_metrics: Optional[StreamMetrics] = None,
+                 run_metrics: Optional[RunMetrics] = None,
+                 duplicates: Optional[Dict[str, List[Idea]]] = None,
+                 adaptive: bool = False,
+                 consensus_variance: float = DEFAULT_CONSENSUS_VARIANCE,
+                 min_models: int = DEFAULT_MIN_CONSENSUS_MODELS,
+                 model_order: Optional[List[str]] = None):
+        """
+        Args:
+            llms: Dictionary of LLM instances
+            prompt_template: PromptTemplate instance
+            max_concurrency: Maximum number of requests in flight across all LLMs
+            provider_concurrency: Per-LLM limits keyed by LLM name; LLMs not listed
+                use DEFAULT_PROVIDER_CONCURRENCY
+            cache: Optional response cache shared by all workers
+            checkpoint: Optional run checkpoint; pairs it already holds successful
+                results for are skipped, and every new result is appended to it
+            rate_limiters: Optional rate limiters keyed by LLM name
+            batch_size: Maximum number of ideas packed into one request; 1 sends
+                one request per idea
+            batch_token_budget: Maximum estimated tokens per batched request
+            sink: Optional streaming sink that receives every result as it arrives
+            keep_results: Keep every result in memory and return it from evaluate();
+                with False, an idea's results are dropped once all its LLMs are done
+            structured_output: Request each provider's native structured-output / JSON mode
+            repair_attempts: Number of repair re-prompts for a malformed or incomplete response
+            stream_metrics: If given, completions are streamed, cut short once the rubric
+                object is complete, and timed here
+            run_metrics: Optional collector for each request's timings, tokens and cost,
+                and for the time requests spend waiting for a free worker
+            duplicates: Near-duplicate ideas keyed by the ID of their representative
+                (see similarity_index.find_duplicates); they are not sent to the LLMs and
+                get a copy of the representative's result with "duplicate_of" set
+            adaptive: Query LLMs progressively, cheapest first, and stop an idea once the
+                score variance on every dimension is within consensus_variance
+            consensus_variance: Maximum per-dimension score variance at which LLMs agree
+            min_models: Successful evaluations needed per idea before it can stop
+            model_order: Order in which LLMs are queried in adaptive mode (defaults to
+                cheapest first, see consensus.order_models_by_cost)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if adaptive and batch_size > 1:
+            raise ValueError("Adaptive sampling evaluates one idea per request; use batch_size 1")
+        if adaptive and min_models < 1:
+            raise ValueError("min_models must be at least 1")
         
-        for llm_name, evaluation in idea_evaluations.items():
-            if "error" in evaluation:
-                continue
-                
-            for dimension in ["novelty", "technical_complexity", "impact_potential", "market_viability", 
-                             "feasibility", "user_desirability", "trend_alignment"]:
-                if dimension in evaluation:
-                    detailed_rows.append({
-                        "Idea ID": idea.id,
-                        "Idea Title": idea.title,
-                        "LLM": llm_name,
-                        "Dimension": dimension.replace("_", " ").title(),
-                        "Score": evaluation[dimension]["score"],
-                        "Remark": evaluation[dimension]["remark"]
-                    })
-    
-    detailed_df = pd.DataFrame(detailed_rows)
-    
-    # Create summary ratings dataframe
-    summary_rows = []
-    
-    for idea in ideas:
-        idea_evaluations = all_evaluations.get(idea.id, {})
-        dimension_scores = {
-            "novelty": [],
-            "technical_complexity": [],
-            "impact_potential": [],
-            "market_viability": [],
-            "feasibility": [],
-            "user_desirability": [],
-            "trend_alignment": []
+        self.llms = llms
+        self.prompt_template = prompt_template
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.checkpoint = checkpoint
+        self.rate_limiters = rate_limiters or {}
+        self.batch_size = batch_size
+        self.batch_token_budget = batch_token_budget
+        self.batch_prompt = create_batch_evaluation_prompt() if batch_size > 1 else None
+        self.sink = sink
+        self.keep_results = keep_results
+        self.structured_output = structured_output
+        self.repair_attempts = repair_attempts
+        self.stream_metrics = stream_metrics
+        self.run_metrics = run_metrics
+        self.duplicates = duplicates or {}
+        self.adaptive = adaptive
+        self.consensus_variance = consensus_variance
+        self.min_models = min_models
+        self.model_order = model_order or order_models_by_cost(list(llms))
+        unknown = [llm_name for llm_name in self.model_order if llm_name not in llms]
+        if unknown or len(set(self.model_order)) != len(llms):
+            raise ValueError("model_order must list each LLM exactly once")
+        self.queried_pairs = 0
+        self.escalated_ideas: Set[str] = set()
+        self.provider_concurrency = {
+            llm_name: (provider_concurrency or {}).get(llm_name, DEFAULT_PROVIDER_CONCURRENCY)
+            for llm_name in llms
         }
         
-        for llm_name, evaluation in idea_evaluations.items():
-            if "error" in evaluation:
-                continue
-                
-            for dimension in dimension_scores.keys():
-                if dimension in evaluation:
-                    dimension_scores[dimension].append(evaluation[dimension]["score"])
-        
-        # Calculate average scores and round to 1 decimal place
-        avg_scores = {dim: round(sum(scores)/len(scores), 1) if scores else 0.0 
-                     for dim, scores in dimension_scores.items()}
-        
-        # Calculate overall average and round to 1 decimal place
-        overall_avg = round(sum(avg_scores.values()) / len(avg_scores), 1) if avg_scores else 0.0
-        
-        summary_rows.append({
-            "Idea ID": idea.id,
-            "Idea Title": idea.title,
-            "Novelty": avg_scores["novelty"],
-            "Technical Complexity": avg_scores["technical_complexity"],
-            "Impact Potential": avg_scores["impact_potential"],
-            "Market Viability": avg_scores["market_viability"],
-            "Feasibility": avg_scores["feasibility"],
-            "User Desirability": avg_scores["user_desirability"],
-            "Trend Alignment": avg_scores["trend_alignment"],
-            "Average Rating": overall_avg
-        })
+        for llm_name, limit in self.provider_concurrency.items():
+            if limit < 1:
+                raise ValueError(f"Concurrency limit for {llm_name} must be at least 1")
     
-    summary_df = pd.DataFrame(summary_rows)
-    summary_df = summary_df.sort_values(by="Average Rating", ascending=False)
+    def evaluate(self, ideas: List[Idea]) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate all ideas with all LLMs concurrently.
+        
+        In adaptive mode each idea starts with the cheapest LLMs, and further
+        LLMs are only queried while the scores received so far disagree.
+        
+        Args:
+            ideas: List of Idea objects
+            
+        Returns:
+            Dictionary of evaluation results for all ideas, in the same shape and
+            order as calling evaluate_idea() for each idea in turn (only ideas that
+            did not finish when keep_results is False)
+        """
+        print(f"Evaluating {len(ideas)} ideas with {len(self.llms)} LLMs "
+              f"(max concurrency: {self.max_concurrency}{', adaptive' if self.adaptive else ''})")
+        
+        global_slots = threading.BoundedSemaphore(self.max_concurrency)
+        results_lock = threading.Lock()
+        results: Dict[str, Dict[str, Any]] = {idea.id: {} for idea in ideas}
+        ideas_by_id = {idea.id: idea for idea in ideas}
+        duplicate_ids = {member.id for members in self.duplicates.values() for member in members}
+        evaluated_ideas = [idea for idea in ideas_by_id.values() if idea.id not in duplicate_ids]
+        
+        self.queried_pairs = 0
+        self.escalated_ideas = set()
+        
+        # Results each idea is still waiting for; in adaptive mode this grows when an idea is escalated
+        first_models = next_models(self.model_order, {}, self.consensus_variance, self.min_models) \
+            if self.adaptive else list(self.llms)
+        pending = {idea_id: len(first_models) for idea_id in ideas_by_id}
+        futures = []
+        executors = {}
+        
+        def store(idea: Idea, llm_name: str, evaluation: Dict[str, Any]) -> None:
+            if self.sink is not None:
+                self.sink.add(idea, llm_name, evaluation)
+            escalate: List[str] = []
+            with results_lock:
+                results[idea.id][llm_name] = evaluation
+                pending[idea.id] -= 1
+                if self.adaptive and pending[idea.id] == 0 and idea.id not in duplicate_ids:
+                    escalate = next_models(self.model_order, results[idea.id], self.consensus_variance,
+                                           self.min_models)
+                    if escalate:
+                        self.escalated_ideas.add(idea.id)
+                        for escalated in [idea] + self.duplicates.get(idea.id, []):
+                            pending[escalated.id] += len(escalate)
+                if pending[idea.id] == 0:
+                    print_evaluation_summary(idea, self._ordered(results[idea.id]))
+                    if not self.keep_results:
+                        del results[idea.id]
+            
+            # Near-duplicates reuse the representative's result
+            for member in self.duplicates.get(idea.id, []):
+                if member.id in ideas_by_id:
+                    store(member, llm_name, {**evaluation, "duplicate_of": idea.id})
+            
+            for next_llm in escalate:
+                schedule(idea, next_llm)
+        
+        def wait_for_slot(llm_name: str, submitted_at: float) -> None:
+            global_slots.acquire()
+            if self.run_metrics is not None:
+                self.run_metrics.record_slot_wait(llm_name, time.perf_counter() - submitted_at)
+        
+        def run_pair(idea: Idea, llm_name: str, submitted_at: float) -> None:
+            wait_for_slot(llm_name, submitted_at)
+            try:
+                evaluation = evaluate_idea_with_llm(idea, llm_name, self.llms[llm_name], self.prompt_template,
+                                                    self.cache, self.rate_limiters.get(llm_name),
+                                                    self.structured_output, self.repair_attempts,
+                                                    self.stream_metrics, self.run_metrics)
+            finally:
+                global_slots.release()
+            
+            if self.checkpoint is not None:
+                self.checkpoint.record(idea, llm_name, evaluation)
+            store(idea, llm_name, evaluation)
+        
+        def run_batch(batch: List[Idea], llm_name: str, submitted_at: float) -> None:
+            wait_for_slot(llm_name, submitted_at)
+            try:
+                evaluations = evaluate_batch_with_llm(batch, llm_name, self.llms[llm_name], self.batch_prompt,
+                                                      self.prompt_template, self.cache,
+                                                      self.rate_limiters.get(llm_name),
+                                                      self.structured_output, self.repair_attempts,
+                                                      self.stream_metrics, self.run_metrics)
+            finally:
+                global_slots.release()
+            
+            for idea in batch:
+                if self.checkpoint is not None:
+                    self.checkpoint.record(idea, llm_name, evaluations[idea.id])
+                store(idea, llm_name, evaluations[idea.id])
+        
+        def schedule(idea: Idea, llm_name: str) -> None:
+            # Used in adaptive mode, where the LLMs for an idea are chosen as results arrive
+            evaluation = self.checkpoint.completed(idea, llm_name) if self.checkpoint is not None else None
+            if evaluation is not None:
+                store(idea, llm_name, evaluation)
+            else:
+                with results_lock:
+                    self.queried_pairs += 1
+                futures.append(executors[llm_name].submit(run_pair, idea, llm_name, time.perf_counter()))
+        
+        executors.update({
+            llm_name: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"eval-{llm_name}")
+            for llm_name, limit in self.provider_concurrency.items()
+        })
+        
+        try:
+            if self.adaptive:
+                for idea in evaluated_ideas:
+                    for llm_name in first_models:
+                        schedule(idea, llm_name)
+            else:
+                # Reuse results from the checkpoint and schedule everything else
+                pairs = []
+                for llm_name in self.llms:
+                    for idea in evaluated_ideas:
+                        evaluation = self.checkpoint.completed(idea, llm_name) if self.checkpoint is not None else None
+                        if evaluation is not None:
+                            store(idea, llm_name, evaluation)
+                        else:
+                            pairs.append((idea, llm_name))
+                
+                if self.checkpoint is not None:
+                    skipped = len(self.llms) * len(evaluated_ideas) - len(pairs)
+                    print(f"Resuming from checkpoint: {skipped} evaluations already complete, {len(pairs)} to run")
+                
+                self.queried_pairs += len(pairs)
+                if self.batch_prompt is not None:
+                    for llm_name in self.llms:
+                        llm_ideas = [idea for idea, pair_llm in pairs if pair_llm == llm_name]
+                        for batch in split_into_batches(llm_ideas, self.batch_prompt, self.batch_size,
+                                                        self.batch_token_budget):
+                            futures.append(executors[llm_name].submit(run_batch, batch, llm_name,
+                                                                      time.perf_counter()))
+                else:
+                    futures.extend(executors[llm_name].submit(run_pair, idea, llm_name, time.perf_counter())
+                                   for idea, llm_name in pairs)
+            
+            # Escalations append new futures before the future that triggered them completes,
+            # so everything has finished once the end of the list is reached
+            index = 0
+            while index < len(futures):
+                futures[index].result()
+                index += 1
+        finally:
+            # Drop queued work if a request failed (ThreadPoolExecutor's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            for executor in executors.values():
+                executor.shutdown(wait=True)
+        
+        if self.adaptive:
+            print(f"Adaptive sampling: queried {self.queried_pairs} of {len(self.llms) * len(evaluated_ideas)} "
+                  f"(idea, LLM) pairs; {len(self.escalated_ideas)} of {len(evaluated_ideas)} ideas needed more "
+                  f"than {self.min_models} LLMs")
+        return {idea_id: self._ordered(idea_results) for idea_id, idea_results in results.items()}
     
-    print("Tables generated")
-    return detailed_df, summary_df
+    def _ordered(self, idea_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the results for one idea in LLM order, matching evaluate_idea()."""
+        return {llm_name: idea_results[llm_name] for llm_name in self.llms if llm_name in idea_results}
 
-def export_tables(detailed_df: pd.DataFrame, summary_df: pd.DataFrame) -> None:
+def parse_provider_limits(values: List[str]) -> Dict[str, int]:
     """
-    Export tables to Excel files.
+    Parse per-provider concurrency limits given as NAME=N.
     
     Args:
-        detailed_df: Detailed ratings dataframe
-        summary_df: Summary ratings dataframe
+        values: List of NAME=N strings
+        
+    Returns:
+        Dictionary of limits keyed by LLM name
     """
-    print(f"Exporting detailed ratings to {OUTPUT_DETAILED_PATH}")
-    detailed_df.to_excel(OUTPUT_DETAILED_PATH, index=False)
-    
-    # Round all numeric columns in summary_df to 1 decimal place for display
-    numeric_columns = ['Novelty', 'Technical Complexity', 'Impact Potential', 
-                      'Market Viability', 'Feasibility', 'User Desirability', 
-                      'Trend Alignment', 'Average Rating']
+    limits = {}
+    for value in values:
+        name, sep, limit = value.rpartition("=")
+        if not sep or not name or not limit.isdigit():
+            raise argparse.ArgumentTypeError(f"Invalid provider limit '{value}', expected NAME=N")
+        limits[name] = int(limit)
+    return limits
+
+def parse_rate_limits(values: List[str]) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+    """
+    Parse per-provider quotas given as NAME=RPM or NAME=RPM:TPM.
     
-    for col in numeric_columns:
-        if col in summary_df.columns:
-            summary_df[col] = summary_df[col].round(1)
+    Args:
+        values: List of quota strings
+        
+    Returns:
+        Dictionary of (requests per minute, tokens per minute) keyed by LLM name
+    """
+    limits = {}
+    for value in values:
+        name, sep, quota = value.rpartition("=")
+        rpm, _, tpm = quota.partition(":")
+        if not sep or not name or not rpm.isdigit() or (tpm and not tpm.isdigit()):
+            raise argparse.ArgumentTypeError(f"Invalid rate limit '{value}', expected NAME=RPM or NAME=RPM:TPM")
+        limits[name] = (int(rpm) or None, int(tpm) if tpm else None)
+    return limits
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
     
-    print(f"Exporting summary ratings to {OUTPUT_SUMMARY_PATH}")
-    summary_df.to_excel(OUTPUT_SUMMARY_PATH, index=False)
+    Args:
+        argv: Argument list (defaults to sys.argv)
+        
+    Returns:
+        Parsed arguments
+    """
+    from similarity_index import DEFAULT_SIMILARITY_THRESHOLD
     
-    print("Export complete")
+    parser = argparse.ArgumentParser(description="Evaluate product ideas using multiple LLMs.")
+    parser.add_argument("--input", "--document", dest="inputs", action="append", metavar="PATH",
+                        help="Ideas file (.docx, .md, .txt or .csv), directory or glob pattern; may be repeated "
+                             f"(default: {DOCUMENT_PATH})")
+    parser.add_argument("--ingest-workers", type=int, default=None,
+                        help="Processes used to parse the input files (default: CPU count; 1 parses serially)")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Evaluate only one idea of each group of near-duplicates and reuse its scores for the others")
+    parser.add_argument("--dedupe-threshold", type=float, default=DEFAULT_SIMILARITY_THRESHOLD,
+                        help="Word 3-gram Jaccard similarity at which ideas count as near-duplicates "
+                             f"(default: {DEFAULT_SIMILARITY_THRESHOLD})")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Query LLMs cheapest first and only ask more LLMs about ideas they disagree on")
+    parser.add_argument("--consensus-variance", type=float, default=DEFAULT_CONSENSUS_VARIANCE,
+                        help="With --adaptive, the per-dimension score variance at or below which LLMs agree "
+                             f"(default: {DEFAULT_CONSENSUS_VARIANCE}, i.e. two LLMs within one point)")
+    parser.add_argument("--min-models", type=int, default=DEFAULT_MIN_CONSENSUS_MODELS,
+                        help=f"With --adaptive, LLMs that must score each idea (default: {DEFAULT_MIN_CONSENSUS_MODELS})")
+    parser.add_argument("--model-order", type=lambda value: [name.strip() for name in value.split(",")],
+                        default=None, metavar="NAME,NAME,...",
+                        help="With --adaptive, the order in which LLMs are queried (default: cheapest first)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"Maximum number of LLM requests in flight (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--provider-concurrency", action="append", default=[], metavar="NAME=N",
+                        help="Concurrency limit for one LLM, e.g. Perplexity-Sonar=2 "
+                             f"(default: {DEFAULT_PROVIDER_CONCURRENCY}; may be repeated)")
+    parser.add_argument("--rate-limit", action="append", default=[], metavar="NAME=RPM[:TPM]",
+                        help="Requests (and optionally tokens) per minute for one LLM, e.g. LLaMA-3-70B=30:6000; "
+                             "0 requests means unlimited; may be repeated")
+    parser.add_argument("--retry-budget", type=int, default=DEFAULT_RETRY_BUDGET,
+                        help=f"Total number of retries allowed across all LLMs (default: {DEFAULT_RETRY_BUDGET})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Evaluate up to N ideas per LLM request (default: 1, one request per idea)")
+    parser.add_argument("--batch-token-budget", type=int, default=DEFAULT_BATCH_TOKEN_BUDGET,
+                        help=f"Maximum estimated tokens per batched request (default: {DEFAULT_BATCH_TOKEN_BUDGET})")
+    parser.add_argument("--structured-output", action="store_true",
+                        help="Use each provider's native structured-output / JSON mode with the rubric schema")
+    parser.add_argument("--repair-attempts", type=int, default=DEFAULT_REPAIR_ATTEMPTS,
+                        help="Repair re-prompts for a malformed or incomplete response "
+                             f"(default: {DEFAULT_REPAIR_ATTEMPTS}; 0 disables)")
+    parser.add_argument("--stream-tokens", action="store_true",
+                        help="Stream completions, stop each one as soon as a complete rubric arrives, "
+                             "and report time to first token and tokens/sec per LLM")
+    parser.add_argument("--format", dest="formats", action="append", choices=EXPORT_FORMATS,
+                        help="Output format for the rating tables; may be repeated (default: xlsx)")
+    parser.add_argument("--excel-max-rows", type=int, default=None,
+                        help="Only write the first N rows of each table to Excel")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write detailed rows to disk as evaluations complete instead of keeping them in memory")
+    parser.add_argument("--report-path", default=RUN_REPORT_PATH,
+                        help="Where the JSON run report with per-LLM latency, token and cost figures is written; "
+                             f"a .txt summary table is written next to it (default: {RUN_REPORT_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the response cache and query every LLM")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="Remove all cached responses before evaluating")
+    parser.add_argument("--cache-path", default=DEFAULT_CACHE_PATH,
+                        help=f"Location of the response cache (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--cache-ttl-days", type=float, default=DEFAULT_TTL_SECONDS / 86400,
+                        help="Age after which cached responses expire (default: %(default)g)")
+    parser.add_argument("--checkpoint-dir", default=DEFAULT_CHECKPOINT_DIR,
+                        help=f"Where completed evaluations and the run manifest are saved (default: {DEFAULT_CHECKPOINT_DIR})")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Discard the checkpoint from a previous run instead of resuming it")
+    return parser.parse_args(argv)
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function to run the idea evaluation process."""
+    from result_sink import StreamingResultSink, STREAMING_FORMATS
+    from score_matrix import ScoreMatrix
+    from similarity_index import find_duplicates
+    from tables import (OUTPUT_DETAILED_PATH, DEFAULT_EXPORT_FORMATS, generate_tables, build_summary_table,
+                        output_path, export_tables)
+    
+    args = parse_args(argv)
+    load_environment()
+    try:
+        provider_limits = parse_provider_limits(args.provider_concurrency)
+        rate_limits = parse_rate_limits(args.rate_limit)
+    except argparse.ArgumentTypeError as e:
+        raise SystemExit(f"Error: {e}")
+    if args.adaptive and args.batch_size > 1:
+        raise SystemExit("Error: --adaptive evaluates one idea per request and cannot be combined with --batch-size")
+    
     print("Starting idea evaluation process...")
     
-    # Extract ideas from the document
-    ideas = extract_ideas_from_doc(DOCUMENT_PATH)
+    # Extract ideas from every input file into a single run
+    inputs = args.inputs or [DOCUMENT_PATH]
+    try:
+        ideas = ingest_ideas(inputs, workers=args.ingest_workers)
+    except (FileNotFoundError, ValueError) as e:
+        raise SystemExit(f"Error: {e}")
+    
+    # Group near-duplicate ideas so only one of each group is sent to the LLMs
+    duplicates = find_duplicates(ideas, args.dedupe_threshold) if args.dedupe else {}
     
     # Set up LLMs
     llms = setup_llms()
+    if args.model_order is not None and sorted(args.model_order) != sorted(llms):
+        raise SystemExit(f"Error: --model-order must list each of these LLMs once: {', '.join(llms)}")
+    rate_limiters = setup_rate_limiters(list(llms), RetryBudget(args.retry_budget), rate_limits)
     
     # Create evaluation prompt
     prompt_template = create_evaluation_prompt()
     
-    # Evaluate ideas
-    all_evaluations = {}
-    for idea in ideas:
-        all_evaluations[idea.id] = evaluate_idea(idea, llms, prompt_template)
+    # Open the response cache
+    cache = None
+    if args.clear_cache or not args.no_cache:
+        cache = ResponseCache(args.cache_path, ttl_seconds=args.cache_ttl_days * 86400)
+        if args.clear_cache:
+            print(f"Cleared {cache.clear()} cached responses from {args.cache_path}")
+        if args.no_cache:
+            cache.close()
+            cache = None
+    
+    # Open the run checkpoint so finished evaluations survive crashes and restarts
+    checkpoint = RunCheckpoint(args.checkpoint_dir, fresh=args.fresh)
+    checkpoint.start_run(ideas, llms.keys(), inputs=inputs,
+                         duplicates={idea_id: [member.id for member in members]
+                                     for idea_id, members in duplicates.items()})
+    
+    # Stream detailed rows to disk as they arrive, keeping only running totals in memory
+    formats = args.formats or DEFAULT_EXPORT_FORMATS
+    sink = None
+    if args.stream:
+        stream_formats = [fmt for fmt in formats if fmt in STREAMING_FORMATS] or ["jsonl"]
+        if "xlsx" in formats:
+            print("Excel cannot be written incrementally; detailed ratings are streamed to "
+                  f"{', '.join(stream_formats)} instead")
+        sink = StreamingResultSink(ideas, RUBRIC_DIMENSIONS, DIMENSION_LABELS,
+                                   {fmt: output_path(OUTPUT_DETAILED_PATH, fmt) for fmt in stream_formats})
+        for fmt in stream_formats:
+            print(f"Streaming detailed ratings to {output_path(OUTPUT_DETAILED_PATH, fmt)}")
+    
+    # Otherwise keep the results in a compact score matrix rather than nested dictionaries
+    matrix = ScoreMatrix(ideas, list(llms)) if sink is None else None
+    
+    # Evaluate all ideas with all LLMs concurrently
+    stream_metrics = StreamMetrics() if args.stream_tokens else None
+    run_metrics = RunMetrics()
+    engine = EvaluationEngine(llms, prompt_template,
+                              max_concurrency=args.max_concurrency,
+                              provider_concurrency=provider_limits,
+                              cache=cache,
+                              checkpoint=checkpoint,
+                              rate_limiters=rate_limiters,
+                              batch_size=args.batch_size,
+                              batch_token_budget=args.batch_token_budget,
+                              sink=sink if sink is not None else matrix,
+                              keep_results=False,
+                              structured_output=args.structured_output,
+                              repair_attempts=args.repair_attempts,
+                              stream_metrics=stream_metrics,
+                              run_metrics=run_metrics,
+                              duplicates=duplicates,
+                              adaptive=args.adaptive,
+                              consensus_variance=args.consensus_variance,
+                              min_models=args.min_models,
+                              model_order=args.model_order)
+    try:
+        engine.evaluate(ideas)
+    except KeyboardInterrupt:
+        checkpoint.finish_run("interrupted")
+        raise SystemExit(f"\nInterrupted. Completed evaluations are saved in {args.checkpoint_dir}; "
+                         "run again to resume.")
+    except Exception:
+        checkpoint.finish_run("failed")
+        raise
+    finally:
+        checkpoint.close()
+        if sink is not None:
+            sink.close()
+        if cache is not None:
+            print(f"Response cache: {cache.hits} hits, {cache.misses} misses")
+            cache.close()
+    
+    checkpoint.finish_run()
+    run_metrics.print_summary()
+    if stream_metrics is not None:
+        stream_metrics.print_summary()
     
     # Generate tables
-    detailed_df, summary_df = generate_tables(all_evaluations, ideas)
+    if sink is not None:
+        print(f"Streamed {sink.rows_written} detailed ratings")
+        detailed_df, summary_df = None, build_summary_table(ideas, sink.sums, sink.counts,
+                                                            sink.models if args.adaptive else None)
+    else:
+        detailed_df, summary_df = generate_tables(matrix, ideas, include_models=args.adaptive)
     
     # Export tables
-    export_tables(detailed_df, summary_df)
+    export_tables(detailed_df, summary_df, formats, args.excel_max_rows)
+    
+    print(f"Writing run report to {args.report_path}")
+    run_metrics.write_report(args.report_path)
     
     print("Idea evaluation process complete!")
 
+def __getattr__(name: str) -> Any:
+    """Import PerplexityLLM and the table functions on first access, keeping the OpenAI SDK and pandas
+    out of module import."""
+    if name == "PerplexityLLM":
+        from perplexity_llm import PerplexityLLM
+        return PerplexityLLM
+    if name in TABLE_FUNCTIONS:
+        import tables
+        return getattr(tables, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,258 @@
+"""
+Ingestion
+
+Reads ideas from any number of files, directories and glob patterns and
+merges them into a single list for one evaluation run. Word (.docx),
+Markdown (.md), plain-text (.txt) and CSV (.csv) files are supported; READERS
+maps each file extension to the function that parses it.
+
+When several files are read they are parsed in a process pool. Ideas that
+appear more than once with the same ID and content are kept once; ideas that
+share an ID but differ in content are all kept, with a numeric suffix added to
+the later IDs so every idea in the run has a unique ID.
+"""
+
+import csv
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from document_parser import Idea, iter_ideas_from_doc, iter_ideas_from_lines
+
+# Column names accepted in CSV files, compared case-insensitively
+CSV_ID_COLUMNS = ["idea id", "idea_id", "id"]
+CSV_TITLE_COLUMNS = ["project title", "title"]
+CSV_DESCRIPTION_COLUMNS = ["description", "project description"]
+
+MARKDOWN_HEADING_PATTERN = re.compile(r"^\s{0,3}#{1,6}\s*")
+MARKDOWN_EMPHASIS_PATTERN = re.compile(r"\*\*|__")
+
+
+def read_docx(path: str) -> List[Idea]:
+    """
+    Read ideas from a Word document.
+
+    Args:
+        path: Path to the .docx file
+
+    Returns:
+        List of Idea objects in document order
+    """
+    return list(iter_ideas_from_doc(path))
+
+
+def read_text(path: str) -> List[Idea]:
+    """
+    Read ideas from a plain-text file laid out like the Word document.
+
+    Args:
+        path: Path to the .txt file
+
+    Returns:
+        List of Idea objects in file order
+    """
+    with open(path, encoding="utf-8") as f:
+        return list(iter_ideas_from_lines(line.rstrip("\n") for line in f))
+
+
+def read_markdown(path: str) -> List[Idea]:
+    """
+    Read ideas from a Markdown file.
+
+    Heading markers and bold markers are removed first, so "## Idea ID: A1"
+    and "**Project Title:** Foo" are read like their plain-text forms.
+
+    Args:
+        path: Path to the .md file
+
+    Returns:
+        List of Idea objects in file order
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = (MARKDOWN_EMPHASIS_PATTERN.sub("", MARKDOWN_HEADING_PATTERN.sub("", line.rstrip("\n")))
+                 for line in f)
+        return list(iter_ideas_from_lines(lines))
+
+
+def find_column(fieldnames: List[str], candidates: List[str]) -> Optional[str]:
+    """Return the first field name matching one of the candidates, ignoring case and surrounding spaces."""
+    normalized = {name.strip().lower(): name for name in fieldnames}
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized[candidate]
+    return None
+
+
+def read_csv(path: str) -> List[Idea]:
+    """
+    Read ideas from a CSV file with one idea per row.
+
+    The file needs a header row with an ID column ("Idea ID", "idea_id" or
+    "id"); "Project Title"/"Title" and "Description" columns are optional.
+    Rows without an ID are skipped.
+
+    Args:
+        path: Path to the .csv file
+
+    Returns:
+        List of Idea objects in row order
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames or []
+        id_column = find_column(fieldnames, CSV_ID_COLUMNS)
+        if id_column is None:
+            raise ValueError(f"{path}: no idea ID column (expected one of {', '.join(CSV_ID_COLUMNS)})")
+        title_column = find_column(fieldnames, CSV_TITLE_COLUMNS)
+        description_column = find_column(fieldnames, CSV_DESCRIPTION_COLUMNS)
+
+        ideas = []
+        for row in reader:
+            idea_id = (row.get(id_column) or "").strip()
+            if not idea_id:
+                continue
+            title = (row.get(title_column) or "").strip() if title_column else ""
+            description = (row.get(description_column) or "").strip() if description_column else ""
+            ideas.append(Idea(idea_id, title or "Untitled", description))
+        return ideas
+
+
+READERS: Dict[str, Callable[[str], List[Idea]]] = {
+    ".docx": read_docx,
+    ".md": read_markdown,
+    ".txt": read_text,
+    ".csv": read_csv
+}
+
+
+def read_ideas_file(path: str) -> List[Idea]:
+    """
+    Read ideas from one file with the reader for its extension.
+
+    Args:
+        path: Path to a file with a supported extension
+
+    Returns:
+        List of Idea objects
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported input file '{path}' (supported: {', '.join(READERS)})")
+    return READERS[extension](path)
+
+
+def is_supported_file(path: str) -> bool:
+    """Return True for files with a supported extension, skipping Office lock files (~$name.docx)."""
+    name = os.path.basename(path)
+    return os.path.splitext(name)[1].lower() in READERS and not name.startswith("~$")
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """
+    Expand files, directories and glob patterns into a list of input files.
+
+    Directories are searched recursively for supported files. Each group of
+    matches is sorted, and a file matched more than once is listed once.
+
+    Args:
+        inputs: File paths, directory paths or glob patterns (e.g. "ideas/**/*.md")
+
+    Returns:
+        List of file paths in a stable order
+    """
+    paths: List[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(os.path.join(root, name) for root, _, names in os.walk(item) for name in names
+                             if is_supported_file(name))
+        elif glob.has_magic(item):
+            matches = sorted(path for path in glob.glob(item, recursive=True)
+                             if os.path.isfile(path) and is_supported_file(path))
+            if not matches:
+                print(f"Warning: no supported files match {item}")
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            raise FileNotFoundError(f"Input not found: {item}")
+        paths.extend(matches)
+
+    seen: Set[str] = set()
+    unique_paths = []
+    for path in paths:
+        key = os.path.realpath(path)
+        if key not in seen:
+            seen.add(key)
+            unique_paths.append(path)
+    return unique_paths
+
+
+def merge_ideas(ideas_by_file: List[Tuple[str, List[Idea]]]) -> List[Idea]:
+    """
+    Merge ideas from several files into one list with unique IDs.
+
+    Args:
+        ideas_by_file: (path, ideas) pairs in input order
+
+    Returns:
+        List of Idea objects without exact duplicates
+    """
+    merged: List[Idea] = []
+    content_by_id: Dict[str, str] = {}
+    seen: Set[Tuple[str, str]] = set()
+    duplicates = 0
+
+    for path, ideas in ideas_by_file:
+        for idea in ideas:
+            key = (idea.id, idea.content_hash())
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+
+            if idea.id in content_by_id:
+                suffix = 2
+                while f"{idea.id}-{suffix}" in content_by_id:
+                    suffix += 1
+                new_id = f"{idea.id}-{suffix}"
+                print(f"Warning: idea ID {idea.id} in {path} is already used by a different idea; "
+                      f"renamed to {new_id}")
+                idea = Idea(new_id, idea.title, idea.description)
+            content_by_id[idea.id] = key[1]
+            merged.append(idea)
+
+    if duplicates:
+        print(f"Skipped {duplicates} duplicate ideas")
+    return merged
+
+
+def ingest_ideas(inputs: Iterable[str], workers: Optional[int] = None) -> List[Idea]:
+    """
+    Read and merge the ideas from all inputs.
+
+    Args:
+        inputs: File paths, directory paths or glob patterns
+        workers: Number of parser processes (defaults to the CPU count; 1 parses in this process)
+
+    Returns:
+        List of Idea objects with unique IDs, in input order
+    """
+    paths = expand_inputs(inputs)
+    if not paths:
+        raise FileNotFoundError("No input files found")
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers > 1:
+        print(f"Reading {len(paths)} files with {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read_ideas_file, paths))
+    else:
+        results = []
+        for path in paths:
+            print(f"Reading document: {path}")
+            results.append(read_ideas_file(path))
+
+    ideas = merge_ideas(list(zip(paths, results)))
+    print(f"Extracted {len(ideas)} ideas from {len(paths)} file{'s' if len(paths) != 1 else ''}")
+    return ideas
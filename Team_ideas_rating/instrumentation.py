@@ -0,0 +1,308 @@
+"""
+Instrumentation
+
+Per-call measurements for LLM requests: wall time, time spent queued behind
+concurrency and rate limits, input/output tokens, retries, errors and an
+estimated cost. RunMetrics collects the calls of a run, summarises them per
+provider with p50/p95/p99 latencies, and writes a JSON run report plus a
+plain-text summary table.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain.callbacks.base import BaseCallbackHandler
+
+# Estimated price per million tokens as (input, output) in USD, keyed by LLM name
+MODEL_PRICES = {
+    "GPT-4": (2.50, 10.00),
+    "LLaMA-3-70B": (0.59, 0.79),
+    "Gemini-1.5-Flash": (0.075, 0.30),
+    "Perplexity-Sonar": (1.00, 1.00)
+}
+
+# Rough number of characters per token, used when a provider reports no usage
+CHARS_PER_TOKEN = 4
+
+PERCENTILES = (50, 95, 99)
+
+_current_call: contextvars.ContextVar[Optional["CallRecord"]] = contextvars.ContextVar("current_call", default=None)
+
+
+class CallRecord:
+    """Measurements for one LLM request, including any retries."""
+
+    def __init__(self, llm_name: str, kind: str, prompt: str = ""):
+        """
+        Args:
+            llm_name: Name of the LLM (as used in the results)
+            kind: Type of request ("evaluate", "batch" or "repair")
+            prompt: Rendered prompt, used to estimate input tokens if none are reported
+        """
+        self.llm_name = llm_name
+        self.kind = kind
+        self.prompt_chars = len(prompt)
+        self.wall_time = 0.0
+        self.rate_limit_wait = 0.0
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self.output_chars = 0
+        self.retries = 0
+        self.error: Optional[str] = None
+
+    @property
+    def tokens_estimated(self) -> bool:
+        """True if the provider did not report token usage for this call."""
+        return self.input_tokens is None or self.output_tokens is None
+
+    @property
+    def total_input_tokens(self) -> int:
+        """Reported input tokens, or an estimate from the prompt length."""
+        return self.input_tokens if self.input_tokens is not None else self.prompt_chars // CHARS_PER_TOKEN
+
+    @property
+    def total_output_tokens(self) -> int:
+        """Reported output tokens, or an estimate from the response length."""
+        return self.output_tokens if self.output_tokens is not None else self.output_chars // CHARS_PER_TOKEN
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Estimated cost in USD, or None if the LLM has no entry in MODEL_PRICES."""
+        prices = MODEL_PRICES.get(self.llm_name)
+        if prices is None:
+            return None
+        return (self.total_input_tokens * prices[0] + self.total_output_tokens * prices[1]) / 1_000_000
+
+    def add_usage(self, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        """Add token counts reported by the provider."""
+        if input_tokens is not None:
+            self.input_tokens = (self.input_tokens or 0) + int(input_tokens)
+        if output_tokens is not None:
+            self.output_tokens = (self.output_tokens or 0) + int(output_tokens)
+
+
+def current_call() -> Optional[CallRecord]:
+    """Return the call being tracked in this thread, if any."""
+    return _current_call.get()
+
+
+def record_usage(input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+    """
+    Report provider token usage for the call being tracked, if any.
+
+    Args:
+        input_tokens: Prompt tokens reported by the provider
+        output_tokens: Completion tokens reported by the provider
+    """
+    call = _current_call.get()
+    if call is not None:
+        call.add_usage(input_tokens, output_tokens)
+
+
+def record_wait(seconds: float) -> None:
+    """Add time spent waiting on a rate limit to the call being tracked, if any."""
+    call = _current_call.get()
+    if call is not None:
+        call.rate_limit_wait += seconds
+
+
+def record_retry() -> None:
+    """Count a retry against the call being tracked, if any."""
+    call = _current_call.get()
+    if call is not None:
+        call.retries += 1
+
+
+class UsageCallback(BaseCallbackHandler):
+    """LangChain callback that copies token usage from chat model results onto a call."""
+
+    def __init__(self, call: CallRecord):
+        self.call = call
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        usage = (response.llm_output or {}).get("token_usage") or (response.llm_output or {}).get("usage")
+        if usage:
+            self.call.add_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+            return
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if metadata:
+                    self.call.add_usage(metadata.get("input_tokens"), metadata.get("output_tokens"))
+
+
+@contextmanager
+def track_call(metrics: Optional["RunMetrics"], llm_name: str, kind: str,
+               prompt: str = "") -> Iterator[CallRecord]:
+    """
+    Time an LLM request and record it in a RunMetrics.
+
+    While the block runs, the call is the current call for this thread, so
+    record_usage(), record_wait() and record_retry() attach to it. Exceptions
+    are recorded by class name and re-raised.
+
+    Args:
+        metrics: RunMetrics to record the call in (None to only time it)
+        llm_name: Name of the LLM (as used in the results)
+        kind: Type of request ("evaluate", "batch" or "repair")
+        prompt: Rendered prompt
+
+    Yields:
+        The CallRecord; set output_chars on it once the response arrives
+    """
+    call = CallRecord(llm_name, kind, prompt)
+    token = _current_call.set(call)
+    started_at = time.perf_counter()
+    try:
+        yield call
+    except Exception as e:
+        call.error = e.__class__.__name__
+        raise
+    finally:
+        call.wall_time = time.perf_counter() - started_at
+        _current_call.reset(token)
+        if metrics is not None:
+            metrics.record(call)
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """Return the PERCENTILES of values keyed as p50, p95, p99 (None when empty)."""
+    # numpy is imported here so that the rate limiter and the evaluator do not load it on import
+    import numpy as np
+
+    if not values:
+        return {f"p{q}": None for q in PERCENTILES}
+    return {f"p{q}": float(value) for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+class RunMetrics:
+    """Thread-safe collection of the LLM calls made during a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List[CallRecord] = []
+        self.slot_waits: Dict[str, List[float]] = {}
+        self.cache_hits: Dict[str, int] = {}
+        self.started_at = time.time()
+
+    def record(self, call: CallRecord) -> None:
+        """Add a finished call."""
+        with self._lock:
+            self.calls.append(call)
+
+    def record_slot_wait(self, llm_name: str, seconds: float) -> None:
+        """Add time a request spent waiting for a free worker before it started."""
+        with self._lock:
+            self.slot_waits.setdefault(llm_name, []).append(seconds)
+
+    def record_cache_hit(self, llm_name: str) -> None:
+        """Count a response served from the cache instead of the LLM."""
+        with self._lock:
+            self.cache_hits[llm_name] = self.cache_hits.get(llm_name, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarise the recorded calls per LLM.
+
+        Returns:
+            Dictionary keyed by LLM name with call and error counts, latency and
+            queue-wait percentiles (seconds), token totals, retries and estimated cost
+        """
+        with self._lock:
+            calls = list(self.calls)
+            slot_waits = {llm_name: list(waits) for llm_name, waits in self.slot_waits.items()}
+            cache_hits = dict(self.cache_hits)
+
+        by_llm: Dict[str, List[CallRecord]] = {}
+        for call in calls:
+            by_llm.setdefault(call.llm_name, []).append(call)
+
+        summary = {}
+        for llm_name in dict.fromkeys(list(by_llm) + list(slot_waits) + list(cache_hits)):
+            llm_calls = by_llm.get(llm_name, [])
+            waits = slot_waits.get(llm_name, [])
+            errors: Dict[str, int] = {}
+            for call in llm_calls:
+                if call.error is not None:
+                    errors[call.error] = errors.get(call.error, 0) + 1
+            costs = [call.cost for call in llm_calls]
+            summary[llm_name] = {
+                "calls": len(llm_calls),
+                "cache_hits": cache_hits.get(llm_name, 0),
+                "errors": errors,
+                "retries": sum(call.retries for call in llm_calls),
+                "latency_s": percentiles([call.wall_time for call in llm_calls]),
+                "queue_wait_s": percentiles(waits),
+                "rate_limit_wait_s": sum(call.rate_limit_wait for call in llm_calls),
+                "busy_time_s": sum(call.wall_time for call in llm_calls),
+                "input_tokens": sum(call.total_input_tokens for call in llm_calls),
+                "output_tokens": sum(call.total_output_tokens for call in llm_calls),
+                "tokens_estimated": any(call.tokens_estimated for call in llm_calls),
+                "cost_usd": sum(costs) if costs and None not in costs else None
+            }
+        return summary
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the run report.
+
+        Returns:
+            Dictionary with run timings, run-wide totals and the per-LLM summary
+        """
+        summary = self.summary()
+        costs = [row["cost_usd"] for row in summary.values() if row["cost_usd"] is not None]
+        finished_at = time.time()
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "finished_at": datetime.fromtimestamp(finished_at, timezone.utc).isoformat(),
+            "duration_s": finished_at - self.started_at,
+            "totals": {
+                "calls": sum(row["calls"] for row in summary.values()),
+                "cache_hits": sum(row["cache_hits"] for row in summary.values()),
+                "errors": sum(sum(row["errors"].values()) for row in summary.values()),
+                "retries": sum(row["retries"] for row in summary.values()),
+                "input_tokens": sum(row["input_tokens"] for row in summary.values()),
+                "output_tokens": sum(row["output_tokens"] for row in summary.values()),
+                "cost_usd": sum(costs)
+            },
+            "providers": summary
+        }
+
+    def format_table(self) -> str:
+        """Return the per-LLM summary as a plain-text table."""
+        def seconds(value: Optional[float]) -> str:
+            return f"{value:.2f}" if value is not None else "-"
+
+        lines = [f"{'Model':<20} {'Calls':>6} {'Errors':>6} {'Retries':>7} {'p50 (s)':>8} {'p95 (s)':>8} "
+                 f"{'p99 (s)':>8} {'Queue p95':>9} {'Tokens in':>10} {'Tokens out':>10} {'Cost ($)':>9}"]
+        for llm_name, row in self.summary().items():
+            cost = f"{row['cost_usd']:.4f}" if row["cost_usd"] is not None else "-"
+            lines.append(f"{llm_name:<20} {row['calls']:>6} {sum(row['errors'].values()):>6} {row['retries']:>7} "
+                         f"{seconds(row['latency_s']['p50']):>8} {seconds(row['latency_s']['p95']):>8} "
+                         f"{seconds(row['latency_s']['p99']):>8} {seconds(row['queue_wait_s']['p95']):>9} "
+                         f"{row['input_tokens']:>10} {row['output_tokens']:>10} {cost:>9}")
+        return "\n".join(lines)
+
+    def write_report(self, path: str) -> None:
+        """
+        Write the run report as JSON, with the summary table next to it as .txt.
+
+        Args:
+            path: Path of the JSON report
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.format_table() + "\n")
+
+    def print_summary(self) -> None:
+        """Print the per-LLM summary table."""
+        if self.calls or self.cache_hits:
+            print("\nLLM calls by model:")
+            print(self.format_table())
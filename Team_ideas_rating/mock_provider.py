@@ -0,0 +1,203 @@
+"""
+Mock Provider
+
+A local stand-in for a real LLM provider, used when no API keys are set and by
+the offline benchmarks. MockRubricLLM answers evaluation, batch and repair
+prompts with rubric JSON, and can be configured to add latency, return
+malformed or incomplete responses, and fail with rate-limit (429) errors or
+timeouts at given rates.
+
+Scores depend only on the seed and the idea ID, so repeated runs produce the
+same tables. By default each mock scores independently; with agreement_rate,
+that share of ideas gets near-identical scores from every mock (within one
+point), which is useful for exercising adaptive sampling. Whether a given call
+is slow, malformed or fails depends on the seed, the prompt and how many times
+that prompt has been sent, so retries can succeed and results do not depend on
+thread scheduling.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.llms.base import LLM
+from langchain.schema.output import GenerationChunk
+from langchain_core.pydantic_v1 import PrivateAttr
+
+from rubric import DIMENSION_LABELS, MAX_SCORE, MIN_SCORE, RUBRIC_DIMENSIONS
+
+# Ways a malformed response can be broken
+MALFORMED_KINDS = ["truncated", "prose", "missing", "fenced", "refusal"]
+
+# Characters per streamed chunk
+STREAM_CHUNK_CHARS = 16
+
+IDEA_ID_PATTERN = re.compile(r"IDEA ID:\s*(\S+)")
+
+_counter_lock = threading.Lock()
+
+
+class MockRateLimitResponse:
+    """Minimal HTTP response carried by MockRateLimitError."""
+
+    def __init__(self, retry_after: float):
+        self.status_code = 429
+        self.headers = {"retry-after": f"{retry_after:g}"}
+
+
+class MockRateLimitError(Exception):
+    """Rate-limit error shaped like the provider SDK errors (status code and Retry-After header)."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Error code: 429 - rate limit exceeded (mock)")
+        self.status_code = 429
+        self.response = MockRateLimitResponse(retry_after)
+
+
+class MockTimeoutError(TimeoutError):
+    """Request timeout raised by the mock provider."""
+
+
+class MockRubricLLM(LLM):
+    """Offline LLM that answers rubric prompts with configurable latency and faults."""
+
+    seed: int = 0
+    latency: float = 0.0
+    latency_jitter: float = 0.5
+    token_delay: float = 0.0
+    malformed_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    timeout_rate: float = 0.0
+    retry_after: float = 0.0
+    agreement_rate: Optional[float] = None
+    _call_counts: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock-rubric"
+
+    @property
+    def _identifying_params(self) -> Mapping[str, Any]:
+        return {"seed": self.seed, "malformed_rate": self.malformed_rate}
+
+    def rubric(self, idea_id: str) -> Dict[str, Any]:
+        """
+        Build the evaluation this LLM gives an idea.
+
+        Args:
+            idea_id: ID of the idea
+
+        Returns:
+            Evaluation dictionary with every rubric dimension and an overall impression
+        """
+        rng = random.Random(f"{self.seed}:{idea_id}")
+        shared = random.Random(f"shared:{idea_id}") if self.agreement_rate is not None else None
+        agreed = shared is not None and shared.random() < self.agreement_rate
+        quality = (shared if agreed else rng).randint(MIN_SCORE + 2, MAX_SCORE - 2)
+        evaluation: Dict[str, Any] = {}
+        for dimension, label in zip(RUBRIC_DIMENSIONS, DIMENSION_LABELS):
+            if agreed:
+                # Every mock starts from the same scores and adds at most one point
+                score = min(MAX_SCORE, quality + shared.randint(-2, 2) + rng.randint(0, 1))
+            else:
+                score = min(MAX_SCORE, max(MIN_SCORE, quality + rng.randint(-2, 2)))
+            evaluation[dimension] = {"score": score, "remark": f"{label} rated {score} for idea {idea_id}."}
+        evaluation["overall_impression"] = f"Mock evaluation of idea {idea_id}."
+        return evaluation
+
+    def _call_rng(self, prompt: str) -> random.Random:
+        """Return the random source for this call of the prompt."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with _counter_lock:
+            count = self._call_counts.get(digest, 0)
+            self._call_counts[digest] = count + 1
+        return random.Random(f"{self.seed}:{digest}:{count}")
+
+    def _malform(self, text: str, evaluation: Dict[str, Any], rng: random.Random) -> str:
+        kind = rng.choice(MALFORMED_KINDS)
+        if kind == "truncated":
+            return text[:rng.randint(len(text) // 2, len(text) - 2)]
+        if kind == "prose":
+            return "\n".join(f"{label}: {evaluation[dimension]['score']}/10 - {evaluation[dimension]['remark']}"
+                             for dimension, label in zip(RUBRIC_DIMENSIONS, DIMENSION_LABELS))
+        if kind == "missing":
+            kept = dict(evaluation)
+            for dimension in rng.sample(RUBRIC_DIMENSIONS, 2):
+                del kept[dimension]
+            return json.dumps(kept)
+        if kind == "fenced":
+            return f"Here is my evaluation:\n```json\n{json.dumps(evaluation, indent=2)}\n```\nLet me know if you need more."
+        return "I'm sorry, but I can't evaluate this idea right now."
+
+    def respond(self, prompt: str, rng: random.Random) -> str:
+        """
+        Build the response text for a prompt.
+
+        Args:
+            prompt: Rendered evaluation, batch or repair prompt
+            rng: Random source for this call
+
+        Returns:
+            Rubric JSON (an array for batch prompts), possibly malformed
+        """
+        idea_ids = IDEA_ID_PATTERN.findall(prompt)
+        if "YOUR PREVIOUS RESPONSE" in prompt:
+            # Repair prompts always get a valid answer
+            return json.dumps(self.rubric(idea_ids[0] if idea_ids else "unknown"))
+
+        malformed = rng.random() < self.malformed_rate
+        if "JSON array" in prompt:
+            text = json.dumps([{"idea_id": idea_id, **self.rubric(idea_id)} for idea_id in idea_ids])
+            return text[:rng.randint(len(text) // 2, len(text) - 2)] if malformed else text
+
+        evaluation = self.rubric(idea_ids[0] if idea_ids else "unknown")
+        text = json.dumps(evaluation)
+        return self._malform(text, evaluation, rng) if malformed else text
+
+    def _simulate_request(self, prompt: str) -> str:
+        """Wait for the simulated latency, raise any injected fault, and return the response."""
+        rng = self._call_rng(prompt)
+        if self.latency > 0:
+            time.sleep(self.latency * rng.lognormvariate(0, self.latency_jitter))
+        fault = rng.random()
+        if fault < self.rate_limit_rate:
+            raise MockRateLimitError(self.retry_after)
+        if fault < self.rate_limit_rate + self.timeout_rate:
+            raise MockTimeoutError("Request timed out (mock)")
+        return self.respond(prompt, rng)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        """Return a simulated response for the prompt."""
+        return self._simulate_request(prompt)
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[GenerationChunk]:
+        """Stream a simulated response in small chunks."""
+        text = self._simulate_request(prompt)
+        for start in range(0, len(text), STREAM_CHUNK_CHARS):
+            if self.token_delay > 0:
+                time.sleep(self.token_delay)
+            chunk = GenerationChunk(text=text[start:start + STREAM_CHUNK_CHARS])
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def setup_mock_llms(count: int = 4, **options: Any) -> Dict[str, MockRubricLLM]:
+    """
+    Set up several mock LLMs with different seeds.
+
+    Args:
+        count: Number of mock LLMs
+        **options: MockRubricLLM settings shared by all of them (e.g. latency, malformed_rate)
+
+    Returns:
+        Dictionary of mock LLMs keyed as Mock-LLM-1, Mock-LLM-2, ...
+    """
+    return {f"Mock-LLM-{i}": MockRubricLLM(seed=i, **options) for i in range(1, count + 1)}
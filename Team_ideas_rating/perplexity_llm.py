@@ -0,0 +1,166 @@
+"""
+Perplexity LLM
+
+LangChain wrapper for the Perplexity.ai chat completions API, which is
+OpenAI-compatible. Sync and async clients are pooled and shared between calls,
+and token usage is reported to the instrumentation module.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import httpx
+from langchain.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain.llms.base import LLM
+from langchain.schema.output import GenerationChunk
+from openai import AsyncOpenAI as AsyncOpenAIClient, OpenAI as OpenAIClient
+
+from instrumentation import record_usage
+
+# Perplexity API endpoint and connection pool defaults
+PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+DEFAULT_POOL_CONNECTIONS = 20
+DEFAULT_POOL_KEEPALIVE = 10
+DEFAULT_REQUEST_TIMEOUT = 60.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+# Completion cap for Perplexity; a full seven-dimension rubric does not fit in 500 tokens
+DEFAULT_PERPLEXITY_MAX_TOKENS = 1000
+
+
+# Long-lived OpenAI clients shared by every PerplexityLLM with the same settings.
+# Async clients are tied to the event loop they were created on, so they are kept per loop.
+_perplexity_clients: Dict[Tuple, OpenAIClient] = {}
+_perplexity_async_clients = weakref.WeakKeyDictionary()
+_perplexity_clients_lock = threading.Lock()
+
+
+class PerplexityLLM(LLM):
+    """LLM wrapper for Perplexity.ai API using OpenAI client."""
+
+    api_key: str
+    model_name: str = "sonar"
+    temperature: float = 0.7
+    max_tokens: int = DEFAULT_PERPLEXITY_MAX_TOKENS
+    base_url: str = PERPLEXITY_BASE_URL
+    timeout: float = DEFAULT_REQUEST_TIMEOUT
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    max_connections: int = DEFAULT_POOL_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_POOL_KEEPALIVE
+
+    @property
+    def _llm_type(self) -> str:
+        return "perplexity"
+
+    def _client_settings(self) -> Tuple:
+        return (self.api_key, self.base_url, self.timeout, self.connect_timeout,
+                self.max_connections, self.max_keepalive_connections)
+
+    def _http_options(self) -> Dict[str, Any]:
+        return {
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "limits": httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_keepalive_connections)
+        }
+
+    @property
+    def client(self) -> OpenAIClient:
+        """Pooled synchronous client, created on first use and shared between calls."""
+        settings = self._client_settings()
+        with _perplexity_clients_lock:
+            client = _perplexity_clients.get(settings)
+            if client is None:
+                client = OpenAIClient(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                      http_client=httpx.Client(**self._http_options()))
+                _perplexity_clients[settings] = client
+        return client
+
+    @property
+    def async_client(self) -> AsyncOpenAIClient:
+        """Pooled asynchronous client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        settings = self._client_settings()
+        with _perplexity_clients_lock:
+            clients = _perplexity_async_clients.setdefault(loop, {})
+            client = clients.get(settings)
+            if client is None:
+                client = AsyncOpenAIClient(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                           http_client=httpx.AsyncClient(**self._http_options()))
+                clients[settings] = client
+        return client
+
+    def _request_params(self, prompt: str, stop: Optional[List[str]], **kwargs: Any) -> Dict[str, Any]:
+        params = {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            **kwargs
+        }
+        if stop:
+            params["stop"] = stop
+        return params
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        """Call the Perplexity API using OpenAI client and return the response."""
+        response = self.client.chat.completions.create(**self._request_params(prompt, stop, **kwargs))
+        if response.usage is not None:
+            record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+        return response.choices[0].message.content.strip()
+
+    async def _acall(self, prompt: str, stop: Optional[List[str]] = None,
+                     run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        """Asynchronously call the Perplexity API and return the response."""
+        response = await self.async_client.chat.completions.create(**self._request_params(prompt, stop, **kwargs))
+        if response.usage is not None:
+            record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+        return response.choices[0].message.content.strip()
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[GenerationChunk]:
+        """Stream the response from the Perplexity API chunk by chunk."""
+        stream = self.client.chat.completions.create(stream=True, **self._request_params(prompt, stop, **kwargs))
+        with stream:
+            for event in stream:
+                # Usage arrives in a final event without choices when stream_options asks for it
+                if getattr(event, "usage", None) is not None:
+                    record_usage(event.usage.prompt_tokens, event.usage.completion_tokens)
+                text = event.choices[0].delta.content if event.choices else None
+                if not text:
+                    continue
+                chunk = GenerationChunk(text=text)
+                if run_manager:
+                    run_manager.on_llm_new_token(text, chunk=chunk)
+                yield chunk
+
+    async def _astream(self, prompt: str, stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[GenerationChunk]:
+        """Asynchronously stream the response from the Perplexity API chunk by chunk."""
+        stream = await self.async_client.chat.completions.create(stream=True,
+                                                                 **self._request_params(prompt, stop, **kwargs))
+        async with stream:
+            async for event in stream:
+                if getattr(event, "usage", None) is not None:
+                    record_usage(event.usage.prompt_tokens, event.usage.completion_tokens)
+                text = event.choices[0].delta.content if event.choices else None
+                if not text:
+                    continue
+                chunk = GenerationChunk(text=text)
+                if run_manager:
+                    await run_manager.on_llm_new_token(text, chunk=chunk)
+                yield chunk
+
+    @property
+    def _identifying_params(self) -> Mapping[str, Any]:
+        return {
+            "model_name": self.model_name,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens
+        }
@@ -0,0 +1,262 @@
+"""
+Rate Limiter
+
+Provider-aware rate limiting for LLM calls. Each provider gets token buckets
+for requests per minute and tokens per minute. Rate-limit (429) and server
+(5xx) errors are retried with exponential backoff and jitter, honouring any
+Retry-After header up to the maximum delay (a longer hint fails the call), and
+every retry is drawn from a retry budget shared by the whole run. Waits and retries are counted against the call being tracked
+by the instrumentation module.
+"""
+
+import email.utils
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from instrumentation import record_retry, record_wait
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_RETRY_BUDGET = 100
+
+# Exception class names that indicate a transient network failure
+TRANSIENT_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "ConnectError", "ConnectTimeout",
+                         "ReadTimeout", "Timeout", "TimeoutError", "ServiceUnavailable",
+                         "DeadlineExceeded", "InternalServerError"}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: Refill rate in tokens per minute
+            capacity: Maximum burst size (defaults to one minute's worth of tokens)
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.max_rate = per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, blocking until enough are available.
+
+        Args:
+            amount: Number of tokens to take (clamped to the bucket capacity)
+
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttle(self, factor: float = 0.5, floor: float = 0.1) -> None:
+        """Multiplicatively reduce the refill rate after a rate-limit response."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.max_rate * floor, self.rate * factor)
+
+    def recover(self, step: float = 0.1) -> None:
+        """Additively restore the refill rate after a successful call."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * step)
+
+
+class RetryBudget:
+    """Bounded number of retries shared by every provider in a run."""
+
+    def __init__(self, max_retries: int = DEFAULT_RETRY_BUDGET):
+        self.remaining = max_retries
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, returning False once it is exhausted."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            self.spent += 1
+            return True
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """
+    Find the HTTP status code carried by an SDK exception, if any.
+
+    Args:
+        error: Exception raised by an LLM client
+
+    Returns:
+        Status code, or None if the exception has none
+    """
+    for candidate in (getattr(error, "status_code", None),
+                      getattr(getattr(error, "response", None), "status_code", None),
+                      getattr(error, "code", None)):
+        try:
+            if candidate is not None:
+                return int(candidate)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the Retry-After delay from an SDK exception's response headers.
+
+    Args:
+        error: Exception raised by an LLM client
+
+    Returns:
+        Delay in seconds, or None if the response gave no hint
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, parsed.timestamp() - time.time())
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for rate-limit, server and transient network errors."""
+    status = get_status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in TRANSIENT_ERROR_NAMES
+
+
+class ProviderRateLimiter:
+    """Rate limiter and retry policy for a single provider."""
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, retry_budget: Optional[RetryBudget] = None,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        """
+        Args:
+            name: Provider name used in log messages
+            requests_per_minute: Request quota (None for unlimited)
+            tokens_per_minute: Token quota (None for unlimited)
+            retry_budget: Shared retry budget (None for a private one of DEFAULT_RETRY_BUDGET)
+            max_attempts: Maximum attempts per call, including the first
+            base_delay: Backoff delay before the first retry in seconds
+            max_delay: Upper bound on a single backoff delay in seconds
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.retry_budget = retry_budget or RetryBudget()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the delay before a retry using exponential backoff with full jitter.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure)
+            retry_after: Server-provided minimum delay, if any
+
+        Returns:
+            Delay in seconds, never above max_delay
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = min(max(delay, retry_after), self.max_delay)
+        return delay
+
+    def call(self, fn: Callable[[], T], estimated_tokens: float = 0) -> T:
+        """
+        Call fn under the provider's quotas, retrying transient failures.
+
+        Args:
+            fn: Zero-argument callable making one LLM request
+            estimated_tokens: Expected prompt plus completion tokens for the request
+
+        Returns:
+            Whatever fn returns
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.requests:
+                record_wait(self.requests.acquire())
+            if self.tokens and estimated_tokens:
+                record_wait(self.tokens.acquire(estimated_tokens))
+
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_attempts:
+                    raise
+                retry_after = get_retry_after(e)
+                if retry_after is not None and retry_after > self.max_delay:
+                    # Waiting would hold a worker (and its concurrency slot) for too long
+                    print(f"  {self.name} asked to retry after {retry_after:.0f}s, more than the "
+                          f"{self.max_delay:.0f}s limit; giving up")
+                    raise
+                if get_status_code(e) == 429 and self.requests:
+                    self.requests.throttle()
+                if not self.retry_budget.try_spend():
+                    print(f"  Retry budget exhausted; giving up on {self.name}")
+                    raise
+
+                record_retry()
+                delay = self.backoff_delay(attempt, retry_after)
+                print(f"  {self.name} request failed ({e.__class__.__name__}: {str(e)[:80]}); "
+                      f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts})")
+                time.sleep(delay)
+                continue
+
+            if self.requests:
+                self.requests.recover()
+            return result
@@ -0,0 +1,203 @@
+"""
+Response Cache
+
+Persistent, content-addressed cache for LLM responses. Entries are stored in a
+SQLite database and keyed on the model, its parameters, the rendered prompt and
+the content hash of the idea, so an edited idea misses the cache while
+unchanged ideas are answered from disk.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Mapping, Optional
+
+DEFAULT_CACHE_PATH = os.path.join("Team_ideas_rating", ".cache", "responses.sqlite3")
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def llm_cache_params(llm: Any) -> Mapping[str, Any]:
+    """
+    Collect the parameters that identify an LLM's behaviour.
+
+    Args:
+        llm: LLM instance
+
+    Returns:
+        Dictionary of identifying parameters, including the temperature
+    """
+    params = dict(getattr(llm, "_identifying_params", None) or {})
+    params.setdefault("temperature", getattr(llm, "temperature", None))
+    params.setdefault("llm_type", getattr(llm, "_llm_type", type(llm).__name__))
+    return params
+
+
+def make_cache_key(model_name: str, params: Mapping[str, Any], prompt: str, idea_hash: str,
+                   call_kwargs: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Build the cache key for one request.
+
+    Args:
+        model_name: Name of the LLM
+        params: Identifying parameters of the LLM
+        prompt: Fully rendered prompt text
+        idea_hash: Content hash of the idea
+        call_kwargs: Extra arguments passed with the call (e.g. the structured-output
+            response_format or generation_config), which change the response
+
+    Returns:
+        Hex digest identifying the request
+    """
+    request = {"model": model_name, "params": params, "prompt": prompt, "idea": idea_hash}
+    if call_kwargs:
+        # Left out when empty so plain requests keep the keys they were cached under
+        request["call_kwargs"] = dict(call_kwargs)
+    payload = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and size-based LRU eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path: Path to the SQLite database file
+            ttl_seconds: Entries older than this are treated as missing (None disables expiry)
+            max_bytes: Least recently used entries are evicted above this total
+                response size (None disables size-based eviction)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            The cached response text, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, size, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, size, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key: str, model_name: str, response: str) -> None:
+        """
+        Store a response, evicting old entries if the cache is over its size limit.
+
+        Args:
+            key: Cache key from make_cache_key()
+            model_name: Name of the LLM that produced the response
+            response: Response text
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            expired_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses WHERE created_at < ?", (cutoff,)
+            ).fetchone()[0]
+            if expired_bytes:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+                self._total_bytes -= expired_bytes
+
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def clear(self) -> int:
+        """
+        Remove every entry from the cache.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM responses").rowcount
+            self._conn.commit()
+            self._total_bytes = 0
+            return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
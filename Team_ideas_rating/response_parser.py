@@ -0,0 +1,442 @@
+"""
+Response Parser
+
+Turns raw LLM responses into validated rubric evaluations. Every pattern is
+compiled once at import time. JSON is located with a single-pass,
+brace-balanced scan (so prose or code fences around the object do not matter),
+decoded with orjson when it is installed, and checked against the rubric
+schema with scores clamped to the valid range. Responses that are truncated or
+not JSON at all fall back to per-dimension pattern matching.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypedDict
+
+from rubric import RUBRIC_DIMENSIONS, MIN_SCORE, MAX_SCORE, DEFAULT_REMARK
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+class DimensionScore(TypedDict):
+    """Validated score for one rubric dimension."""
+    score: int
+    remark: str
+
+
+# Characters that change the bracket depth or the string and escape state of a JSON scan
+_JSON_SCAN_PATTERN = re.compile(r'[{}\[\]"\\]')
+
+# Scores such as 8, 7.5, "8" or "8/10"
+_SCORE_TEXT_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(?:/\s*10)?\s*$")
+
+# Fields inside a (possibly truncated) dimension object, with double or single quotes
+_SCORE_FIELD_PATTERN = re.compile(r'''["']score["']\s*:\s*["']?(\d+(?:\.\d+)?)''')
+_REMARK_FIELD_PATTERN = re.compile(
+    r'''["']remark["']\s*:\s*(?:"([^"\\]*(?:\\.[^"\\]*)*)"|'([^'\\]*(?:\\.[^'\\]*)*)')''')
+
+
+# A flat object whose strings may contain braces; the closing brace is optional for truncated text
+_OBJECT_BODY = r'''\{[^{}"']*(?:(?:"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')[^{}"']*)*\}?'''
+
+# Dimension objects in JSON-like text, e.g. "novelty": {"score": 8, "remark": "..."}
+_JSON_DIMENSION_PATTERN = re.compile(
+    rf'''["']({"|".join(map(re.escape, RUBRIC_DIMENSIONS))})["']\s*:\s*({_OBJECT_BODY})''', re.IGNORECASE)
+
+# Plain-text scores such as "Novelty: 8/10 - remark" or "**Technical Complexity** - 7", with the
+# rest of the line as the remark
+_TEXT_DIMENSION_PATTERN = re.compile(
+    "(" + "|".join(r"[\s_-]+".join(map(re.escape, dimension.split("_"))) for dimension in RUBRIC_DIMENSIONS) + ")"
+    r"[:\s*-]+(\d+(?:\.\d+)?)(?:\s*/\s*10)?[ \t:*-]*([^\n]*)", re.IGNORECASE)
+
+# Spaces, underscores and dashes between the words of a dimension name
+_DIMENSION_SEPARATOR_PATTERN = re.compile(r"[\s_-]+")
+
+
+def _dimension_key(name: str) -> str:
+    """Map a matched dimension name (e.g. "Technical Complexity") to its rubric key."""
+    return _DIMENSION_SEPARATOR_PATTERN.sub("_", name.lower())
+
+
+def iter_json_candidates(text: str, openers: str = "{") -> Iterator[str]:
+    """
+    Yield every balanced top-level JSON object (or array) in text, in order.
+
+    Args:
+        text: Text that may contain JSON surrounded by prose or code fences
+        openers: Characters that may start a candidate ("{" for objects, "{[" to
+            include arrays)
+
+    Returns:
+        Iterator over candidate substrings; an unbalanced (truncated) value ends the scan
+    """
+    pos = 0
+    while True:
+        starts = [index for index in (text.find(opener, pos) for opener in openers) if index >= 0]
+        if not starts:
+            return
+        start = min(starts)
+        depth = 0
+        in_string = False
+        escaped = -1
+        # One pass over the special characters, so a truncated tail costs linear time
+        for match in _JSON_SCAN_PATTERN.finditer(text, start):
+            index = match.start()
+            char = match.group()
+            if in_string:
+                if index == escaped:
+                    continue
+                if char == "\\":
+                    escaped = index + 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    yield text[start:index + 1]
+                    pos = index + 1
+                    break
+        else:
+            return
+
+
+class JSONObjectDetector:
+    """
+    Detect complete top-level JSON objects in text that arrives in chunks.
+
+    Quotes outside an object are ignored, as in iter_json_candidates(), so prose
+    before the object does not confuse the string tracking.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._depth = 0
+        self._start = -1
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Add a chunk of text.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Objects whose closing brace arrived in this chunk, in order
+        """
+        offset = len(self.text)
+        self.text += chunk
+        completed = []
+        for index, char in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == "{":
+                if self._depth == 0:
+                    self._start = index
+                self._depth += 1
+            elif self._depth == 0:
+                continue
+            elif char == '"':
+                self._in_string = True
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append(self.text[self._start:index + 1])
+        return completed
+
+
+def is_complete_evaluation(text: str) -> bool:
+    """Return True if text is a JSON object scoring every rubric dimension."""
+    try:
+        evaluation = validate_evaluation(loads(text))
+    except ValueError:
+        return False
+    return all(dimension in evaluation for dimension in RUBRIC_DIMENSIONS)
+
+
+def loads(text: str) -> Any:
+    """Decode JSON with orjson when available, raising ValueError on invalid input."""
+    return _loads(text)
+
+
+def coerce_score(value: Any) -> Optional[int]:
+    """
+    Convert a raw score to an integer clamped to the rubric range.
+
+    Args:
+        value: Score as a number or numeric string (e.g. 8, 7.5, "8", "8/10")
+
+    Returns:
+        Score between MIN_SCORE and MAX_SCORE, or None if value is not a score
+    """
+    if type(value) is int and MIN_SCORE <= value <= MAX_SCORE:
+        return value
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        if value.isdigit():
+            return min(MAX_SCORE, max(MIN_SCORE, int(value)))
+        match = _SCORE_TEXT_PATTERN.match(value)
+        if not match:
+            return None
+        value = float(match.group(1))
+    if not isinstance(value, (int, float)) or value != value:
+        return None
+    return min(MAX_SCORE, max(MIN_SCORE, int(round(value))))
+
+
+def validate_dimension(entry: Any) -> Optional[DimensionScore]:
+    """
+    Validate the entry for one dimension.
+
+    Args:
+        entry: A {"score": ..., "remark": ...} object, or a bare score
+
+    Returns:
+        DimensionScore, or None if the entry has no usable score
+    """
+    if isinstance(entry, dict):
+        score = coerce_score(entry.get("score"))
+        remark = entry.get("remark")
+        if type(remark) is str and remark and score is not None:
+            return {"score": score, "remark": remark}
+    else:
+        score = coerce_score(entry)
+        remark = None
+    if score is None:
+        return None
+    if remark is None or remark == "":
+        remark = DEFAULT_REMARK
+    return {"score": score, "remark": remark if isinstance(remark, str) else str(remark)}
+
+
+def validate_evaluation(data: Any) -> Dict[str, Any]:
+    """
+    Keep only the valid rubric dimensions of a decoded evaluation.
+
+    Args:
+        data: Decoded JSON value
+
+    Returns:
+        Dictionary of DimensionScore keyed by dimension, plus "overall_impression"
+        when present; empty if data is not an object
+    """
+    if not isinstance(data, dict):
+        return {}
+    evaluation: Dict[str, Any] = {}
+    for dimension in RUBRIC_DIMENSIONS:
+        if dimension in data:
+            validated = validate_dimension(data[dimension])
+            if validated is not None:
+                evaluation[dimension] = validated
+    if isinstance(data.get("overall_impression"), str):
+        evaluation["overall_impression"] = data["overall_impression"]
+    return evaluation
+
+
+def has_scores(evaluation: Dict[str, Any]) -> bool:
+    """Return True if an evaluation scores at least one rubric dimension."""
+    return any(dimension in evaluation for dimension in RUBRIC_DIMENSIONS)
+
+
+def _unescape(text: str) -> str:
+    """Decode JSON string escapes in a regex-captured remark."""
+    if "\\" not in text:
+        return text
+    try:
+        return json.loads(f'"{text}"')
+    except ValueError:
+        return text
+
+
+def extract_json_dimensions(response: str, dimensions: Iterable[str] = RUBRIC_DIMENSIONS) -> Dict[str, DimensionScore]:
+    """
+    Recover dimensions from JSON-like text that does not decode, e.g. a truncated response.
+
+    Args:
+        response: Raw response text
+        dimensions: Dimensions to look for
+
+    Returns:
+        Dictionary of DimensionScore keyed by dimension (first occurrence wins)
+    """
+    wanted = set(dimensions)
+    found: Dict[str, DimensionScore] = {}
+    for match in _JSON_DIMENSION_PATTERN.finditer(response):
+        dimension = match.group(1).lower()
+        if dimension not in wanted or dimension in found:
+            continue
+        body = match.group(2)
+        score_match = _SCORE_FIELD_PATTERN.search(body)
+        if not score_match:
+            continue
+        remark_match = _REMARK_FIELD_PATTERN.search(body)
+        remark = None
+        if remark_match:
+            remark = _unescape(remark_match.group(1)) if remark_match.group(1) is not None else remark_match.group(2)
+        validated = validate_dimension({"score": score_match.group(1), "remark": remark})
+        if validated is not None:
+            found[dimension] = validated
+    return found
+
+
+def extract_text_dimensions(response: str, dimensions: Iterable[str] = RUBRIC_DIMENSIONS) -> Dict[str, DimensionScore]:
+    """
+    Recover dimensions from plain text such as "Novelty: 8/10 - Fresh take".
+
+    Args:
+        response: Raw response text
+        dimensions: Dimensions to look for
+
+    Returns:
+        Dictionary of DimensionScore keyed by dimension (first occurrence wins)
+    """
+    wanted = set(dimensions)
+    found: Dict[str, DimensionScore] = {}
+    for match in _TEXT_DIMENSION_PATTERN.finditer(response):
+        dimension = _dimension_key(match.group(1))
+        if dimension in wanted and dimension not in found:
+            validated = validate_dimension({"score": match.group(2), "remark": match.group(3).strip() or None})
+            if validated is not None:
+                found[dimension] = validated
+    return found
+
+
+def decode_evaluation(response: str) -> Dict[str, Any]:
+    """
+    Find and validate the JSON evaluation object in a response.
+
+    The span from the first "{" to the last "}" is tried first, which is the
+    whole object for well-behaved responses; otherwise each balanced object is
+    tried in turn.
+
+    Args:
+        response: Raw response text
+
+    Returns:
+        Validated evaluation, or an empty dictionary if no object scores any dimension
+    """
+    start = response.find("{")
+    if start < 0:
+        return {}
+    try:
+        evaluation = validate_evaluation(loads(response[start:response.rfind("}") + 1]))
+    except ValueError:
+        evaluation = {}
+    if has_scores(evaluation):
+        return evaluation
+
+    for candidate in iter_json_candidates(response):
+        try:
+            evaluation = validate_evaluation(loads(candidate))
+        except ValueError:
+            continue
+        if has_scores(evaluation):
+            return evaluation
+    return {}
+
+
+def parse_evaluation_response(response: str, llm_name: str) -> Dict[str, Any]:
+    """
+    Parse an LLM response into an evaluation dictionary.
+
+    Args:
+        response: Raw response text
+        llm_name: Name of the LLM (used in log messages)
+
+    Returns:
+        Evaluation dictionary, or a dictionary with an "error" key if nothing could be parsed
+    """
+    print(f"  Parsing JSON response from {llm_name}...")
+
+    evaluation = decode_evaluation(response)
+    if evaluation:
+        missing_dimensions = [dim for dim in RUBRIC_DIMENSIONS if dim not in evaluation]
+        if missing_dimensions:
+            print(f"  Warning: Missing dimensions in {llm_name} evaluation: {missing_dimensions}")
+    else:
+        print(f"  Error: {llm_name} did not return valid JSON.")
+        print(f"  Response preview: {response[:100]}...")
+        print(f"  Attempting to extract structured data from non-JSON response...")
+        missing_dimensions = RUBRIC_DIMENSIONS
+
+    # Recover missing dimensions from JSON-like text (e.g. a truncated object), and
+    # from plain text only when the response has no JSON-like dimensions at all
+    extracted = extract_json_dimensions(response, missing_dimensions) if missing_dimensions else {}
+    if not evaluation and not extracted:
+        extracted = extract_text_dimensions(response)
+    for dim in missing_dimensions:
+        if dim in extracted:
+            evaluation[dim] = extracted[dim]
+            print(f"  Extracted {dim} from response text: score={extracted[dim]['score']}")
+
+    if not has_scores(evaluation):
+        print(f"  Failed to extract structured data from {llm_name} response")
+        return {
+            "error": "Failed to parse JSON response",
+            "raw_response": response
+        }
+
+    print(f"  {llm_name} evaluation complete - SUCCESS")
+    print(f"  Dimensions found: {list(evaluation.keys())}")
+    return evaluation
+
+
+def parse_batch_response(response: str, llm_name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a batched response into evaluations keyed by idea ID.
+
+    Accepts the requested JSON array of objects carrying an "idea_id", the same
+    array wrapped as {"evaluations": [...]} (see rubric.BATCH_RUBRIC_SCHEMA), and a
+    JSON object keyed by idea ID. Entries without any valid dimension are
+    dropped so those ideas fall back to single-idea requests.
+
+    Args:
+        response: Raw response text
+        llm_name: Name of the LLM (used in log messages)
+
+    Returns:
+        Dictionary of evaluations keyed by idea ID
+    """
+    parsed = None
+    for candidate in iter_json_candidates(response, "[{"):
+        try:
+            parsed = loads(candidate)
+        except ValueError:
+            continue
+        break
+
+    if isinstance(parsed, dict) and isinstance(parsed.get("evaluations"), list):
+        # Structured-output responses wrap the array in an object
+        items = [item for item in parsed["evaluations"] if isinstance(item, dict)]
+    elif isinstance(parsed, dict) and "idea_id" in parsed:
+        items = [parsed]
+    elif isinstance(parsed, dict):
+        items = [dict(value, idea_id=key) for key, value in parsed.items() if isinstance(value, dict)]
+    elif isinstance(parsed, list):
+        items = [item for item in parsed if isinstance(item, dict)]
+    else:
+        print(f"  Error: {llm_name} did not return valid JSON for the batch")
+        return {}
+
+    evaluations = {}
+    for item in items:
+        idea_id = str(item.get("idea_id", "")).strip()
+        evaluation = validate_evaluation(item)
+        if idea_id and has_scores(evaluation):
+            evaluations[idea_id] = evaluation
+    return evaluations
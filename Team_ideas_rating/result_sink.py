@@ -0,0 +1,183 @@
+"""
+Result Sink
+
+Streaming writer for evaluation results. Detailed rows are appended to disk as
+each (idea, LLM) result arrives, and the summary table is kept as running sums
+and counts per idea and dimension, so memory use does not grow with the number
+of rows and partial results can be inspected while a run is in progress.
+"""
+
+import csv
+import importlib.util
+import json
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+DETAILED_COLUMNS = ["Idea ID", "Idea Title", "LLM", "Dimension", "Score", "Remark"]
+
+# Formats that can be appended to while a run is in progress
+STREAMING_FORMATS = ["jsonl", "csv", "parquet"]
+
+# Rows buffered before a Parquet row group is written
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+
+class _JsonlWriter:
+    """Append rows to a JSON Lines file, flushing after every result."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: List[List[Any]]) -> None:
+        for row in rows:
+            self._file.write(json.dumps(dict(zip(DETAILED_COLUMNS, row)), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _CsvWriter:
+    """Append rows to a UTF-8 CSV file, flushing after every result."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(DETAILED_COLUMNS)
+
+    def write(self, rows: List[List[Any]]) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Buffer rows and write them to a Parquet file one row group at a time."""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError("Parquet export requires pyarrow. Install it with: pip install pyarrow")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from exporters import PARQUET_COMPRESSION
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("Idea ID", pa.dictionary(pa.int32(), pa.string())),
+            ("Idea Title", pa.dictionary(pa.int32(), pa.string())),
+            ("LLM", pa.dictionary(pa.int32(), pa.string())),
+            ("Dimension", pa.dictionary(pa.int32(), pa.string())),
+            ("Score", pa.int64()),
+            ("Remark", pa.string())
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema, compression=PARQUET_COMPRESSION)
+        self._row_group_size = row_group_size
+        self._buffer: List[List[Any]] = []
+
+    def write(self, rows: List[List[Any]]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        columns = list(zip(*self._buffer))
+        arrays = [self._pa.array(column).dictionary_encode() for column in columns[:4]]
+        arrays.append(self._pa.array(columns[4], type=self._pa.int64()))
+        arrays.append(self._pa.array(columns[5], type=self._pa.string()))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+WRITERS = {
+    "jsonl": _JsonlWriter,
+    "csv": _CsvWriter,
+    "parquet": _ParquetWriter
+}
+
+
+class StreamingResultSink:
+    """Write detailed rows as results arrive and keep running summary totals."""
+
+    def __init__(self, ideas: List[Any], dimensions: List[str], labels: List[str],
+                 paths: Dict[str, str], row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """
+        Args:
+            ideas: Ideas being evaluated; their order fixes the rows of the totals
+            dimensions: Rubric dimension keys, in column order
+            labels: Display names for the dimensions, written in the Dimension column
+            paths: Output path for the detailed rows keyed by format (see STREAMING_FORMATS)
+            row_group_size: Rows per Parquet row group
+        """
+        unknown = [fmt for fmt in paths if fmt not in WRITERS]
+        if unknown:
+            raise ValueError(f"Cannot stream results as {', '.join(unknown)}")
+
+        self.dimensions = dimensions
+        self.labels = labels
+        self.positions = {idea.id: position for position, idea in enumerate(ideas)}
+        self.sums = np.zeros((len(ideas), len(dimensions)))
+        self.counts = np.zeros((len(ideas), len(dimensions)))
+        self.models: List[List[str]] = [[] for _ in ideas]
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        self._writers = []
+        try:
+            for fmt, path in paths.items():
+                if fmt == "parquet":
+                    self._writers.append(_ParquetWriter(path, row_group_size))
+                else:
+                    self._writers.append(WRITERS[fmt](path))
+        except Exception:
+            self.close()
+            raise
+
+    def add(self, idea: Any, llm_name: str, evaluation: Dict[str, Any]) -> None:
+        """
+        Write the rows for one (idea, LLM) result and add its scores to the totals.
+
+        Failed evaluations (containing "error") are skipped, as in generate_tables().
+
+        Args:
+            idea: Idea object
+            llm_name: Name of the LLM
+            evaluation: Evaluation dictionary
+        """
+        if "error" in evaluation:
+            return
+
+        position = self.positions[idea.id]
+        rows = []
+        scores: List[Tuple[int, float]] = []
+        for column, dimension in enumerate(self.dimensions):
+            if dimension in evaluation:
+                entry = evaluation[dimension]
+                rows.append([idea.id, idea.title, llm_name, self.labels[column], entry["score"], entry["remark"]])
+                scores.append((column, float(entry["score"])))
+
+        with self._lock:
+            for column, score in scores:
+                self.sums[position, column] += score
+                self.counts[position, column] += 1
+            if scores and llm_name not in self.models[position]:
+                self.models[position].append(llm_name)
+            for writer in self._writers:
+                writer.write(rows)
+            self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Flush buffered rows and close every output file."""
+        with self._lock:
+            for writer in self._writers:
+                writer.close()
+            self._writers = []
@@ -0,0 +1,84 @@
+"""
+Rubric
+
+The dimensions every idea is scored on, the valid score range and the JSON
+schema that structured-output requests ask providers to follow.
+"""
+
+from enum import Enum
+
+
+class Dimension(str, Enum):
+    """
+    Rubric dimension every evaluation is scored on.
+
+    Members compare equal to their string keys, so they can index evaluation
+    dictionaries directly; the definition order is the column order of the
+    output tables and of the dimension axis of a ScoreMatrix.
+    """
+
+    NOVELTY = "novelty"
+    TECHNICAL_COMPLEXITY = "technical_complexity"
+    IMPACT_POTENTIAL = "impact_potential"
+    MARKET_VIABILITY = "market_viability"
+    FEASIBILITY = "feasibility"
+    USER_DESIRABILITY = "user_desirability"
+    TREND_ALIGNMENT = "trend_alignment"
+
+    @property
+    def label(self) -> str:
+        """Column label in the output tables (e.g. "Technical Complexity")."""
+        return self.value.replace("_", " ").title()
+
+
+# Rubric dimension keys, in column order
+RUBRIC_DIMENSIONS = [dimension.value for dimension in Dimension]
+
+# Column labels for the rubric dimensions in the output tables (e.g. "Technical Complexity")
+DIMENSION_LABELS = [dimension.label for dimension in Dimension]
+
+MIN_SCORE = 1
+MAX_SCORE = 10
+
+DEFAULT_REMARK = "No remark provided"
+
+# JSON schema for one evaluation, shared by every provider's structured-output mode.
+# The score range is stated in the description because strict schema modes do not
+# all support numeric bounds; scores are clamped when responses are validated.
+RUBRIC_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{
+            dimension: {
+                "type": "object",
+                "properties": {
+                    "score": {"type": "integer", "description": f"Rating from {MIN_SCORE} to {MAX_SCORE}"},
+                    "remark": {"type": "string", "description": "1-3 line explanation of the rating"}
+                },
+                "required": ["score", "remark"],
+                "additionalProperties": False
+            }
+            for dimension in RUBRIC_DIMENSIONS
+        },
+        "overall_impression": {"type": "string"}
+    },
+    "required": RUBRIC_DIMENSIONS + ["overall_impression"],
+    "additionalProperties": False
+}
+
+# JSON schema for a batched response: one evaluation per idea, tagged with its idea ID
+BATCH_RUBRIC_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "evaluations": {
+            "type": "array",
+            "items": {
+                **RUBRIC_SCHEMA,
+                "properties": {"idea_id": {"type": "string"}, **RUBRIC_SCHEMA["properties"]},
+                "required": ["idea_id"] + RUBRIC_SCHEMA["required"]
+            }
+        }
+    },
+    "required": ["evaluations"],
+    "additionalProperties": False
+}
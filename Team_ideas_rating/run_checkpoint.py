@@ -0,0 +1,208 @@
+"""
+Run Checkpoint
+
+Append-only checkpoint and run manifest for evaluation runs. Every completed
+(idea, LLM) result is written to a JSON Lines file as soon as it arrives, so an
+interrupted run can be resumed without repeating calls that already succeeded.
+Only a small index entry per pair is kept in memory; evaluations are read back
+from the file when they are needed.
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Tuple
+
+DEFAULT_CHECKPOINT_DIR = os.path.join("Team_ideas_rating", ".cache", "run")
+CHECKPOINT_FILENAME = "checkpoint.jsonl"
+MANIFEST_FILENAME = "manifest.json"
+
+
+class RunCheckpoint:
+    """Append-only log of evaluation results plus a manifest describing the run."""
+
+    def __init__(self, directory: str = DEFAULT_CHECKPOINT_DIR, fresh: bool = False, read_only: bool = False):
+        """
+        Args:
+            directory: Directory holding the checkpoint and manifest files
+            fresh: Discard any existing checkpoint instead of resuming from it
+            read_only: Only read the stored results; nothing is created, repaired
+                or written, and record() and start_run() raise io.UnsupportedOperation
+        """
+        if fresh and read_only:
+            raise ValueError("A read-only checkpoint cannot be opened fresh")
+        self.directory = directory
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_FILENAME)
+        self.manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        self._lock = threading.Lock()
+        # (idea ID, LLM) -> (status, idea hash, byte offset of the latest record in the file)
+        self._records: Dict[Tuple[str, str], Tuple[str, str, int]] = {}
+        self._reader: Optional[BinaryIO] = None
+        self.manifest: Dict[str, Any] = {}
+        self._file: Optional[BinaryIO] = None
+
+        if read_only:
+            self._load()
+            return
+
+        os.makedirs(directory, exist_ok=True)
+        if fresh:
+            for path in (self.checkpoint_path, self.manifest_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            self._load()
+
+        needs_newline = False
+        if os.path.exists(self.checkpoint_path) and os.path.getsize(self.checkpoint_path) > 0:
+            with open(self.checkpoint_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+
+        self._file = open(self.checkpoint_path, "ab")
+        if needs_newline:
+            # Terminate a partially written last line before appending
+            self._file.write(b"\n")
+            self._file.flush()
+        self._size = os.path.getsize(self.checkpoint_path)
+
+    def _load(self) -> None:
+        """Replay the checkpoint file, indexing the latest record for each pair."""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+        if not os.path.exists(self.checkpoint_path):
+            return
+
+        offset = 0
+        with open(self.checkpoint_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # A crash can leave a partially written last line
+                    record = None
+                if record is not None:
+                    self._index(record, offset)
+                offset += len(line)
+
+    def _index(self, record: Dict[str, Any], offset: int) -> None:
+        """Remember where the latest record for a pair is, without its evaluation."""
+        # Every LLM's record of an idea shares one copy of the hash
+        self._records[(record["idea_id"], record["llm"])] = (record["status"], sys.intern(record["idea_hash"]),
+                                                             offset)
+
+    def completed(self, idea: Any, llm_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored evaluation for a pair if it succeeded for the current idea content.
+
+        Args:
+            idea: Idea object
+            llm_name: Name of the LLM
+
+        Returns:
+            The evaluation dictionary, or None if the pair must be (re-)evaluated
+        """
+        entry = self._records.get((idea.id, llm_name))
+        if entry is None or entry[0] != "ok" or entry[1] != idea.content_hash():
+            return None
+        with self._lock:
+            if self._reader is None:
+                self._reader = open(self.checkpoint_path, "rb")
+            self._reader.seek(entry[2])
+            line = self._reader.readline()
+        return json.loads(line)["evaluation"]
+
+    def record(self, idea: Any, llm_name: str, evaluation: Dict[str, Any]) -> None:
+        """
+        Append the result for one pair and flush it to disk.
+
+        Args:
+            idea: Idea object
+            llm_name: Name of the LLM
+            evaluation: Evaluation dictionary (containing "error" on failure)
+        """
+        record = {
+            "idea_id": idea.id,
+            "idea_hash": idea.content_hash(),
+            "llm": llm_name,
+            "status": "error" if "error" in evaluation else "ok",
+            "evaluation": evaluation,
+            "timestamp": time.time()
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        self._check_writable()
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._index(record, self._size)
+            self._size += len(line)
+
+    def start_run(self, ideas: Iterable[Any], llm_names: Iterable[str], **details: Any) -> None:
+        """
+        Write the manifest for a new or resumed run.
+
+        Args:
+            ideas: Ideas being evaluated
+            llm_names: Names of the LLMs being used
+            **details: Extra fields to store in the manifest (e.g. the document path)
+        """
+        now = time.time()
+        self.manifest = {
+            "run_id": self.manifest.get("run_id") or uuid.uuid4().hex,
+            "created_at": self.manifest.get("created_at", now),
+            "started_at": now,
+            "status": "running",
+            "llms": list(llm_names),
+            "ideas": {idea.id: idea.content_hash() for idea in ideas},
+            **details
+        }
+        self._write_manifest()
+
+    def finish_run(self, status: str = "complete") -> None:
+        """
+        Record the final state of the run in the manifest.
+
+        Args:
+            status: "complete", "interrupted" or "failed"
+        """
+        counts = {"ok": 0, "error": 0}
+        for (idea_id, llm_name), (record_status, idea_hash, _) in self._records.items():
+            if self.manifest.get("ideas", {}).get(idea_id) == idea_hash and \
+                    llm_name in self.manifest.get("llms", []):
+                counts[record_status] += 1
+
+        self.manifest.update({
+            "status": status,
+            "finished_at": time.time(),
+            "completed_pairs": counts["ok"],
+            "failed_pairs": counts["error"]
+        })
+        self._write_manifest()
+
+    def _check_writable(self) -> None:
+        """Raise io.UnsupportedOperation if the checkpoint was opened read-only."""
+        if self._file is None:
+            raise io.UnsupportedOperation(f"checkpoint in {self.directory} was opened read-only")
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest file."""
+        self._check_writable()
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def close(self) -> None:
+        """Close the checkpoint file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
@@ -0,0 +1,187 @@
+"""
+Score Matrix
+
+Compact in-memory store for evaluation results. Scores live in one int8
+array indexed by idea, LLM and rubric dimension, with MISSING_SCORE where no
+score was given. Remarks are interned in a shared pool and referenced by
+index, and failed evaluations keep only their error message, not the raw
+response. Memory therefore grows by a fixed number of bytes per (idea, LLM)
+pair plus the distinct remark text, and the summary table is computed
+directly on the array instead of from nested dictionaries.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from document_parser import Idea
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS, Dimension
+
+# Score stored for dimensions an LLM did not score (valid scores are 1-10)
+MISSING_SCORE = -1
+
+# Remark index stored where there is no score
+NO_REMARK = -1
+
+
+class ScoreMatrix:
+    """
+    Scores and remarks of every (idea, LLM, dimension) triple in flat arrays.
+
+    A ScoreMatrix can be passed to EvaluationEngine as its sink, in which case
+    add() is called with every evaluation as it arrives, and to
+    tables.generate_tables() in place of the nested results dictionary.
+    """
+
+    __slots__ = ("ideas", "llm_names", "positions", "llm_positions", "scores", "remark_ids", "remarks",
+                 "errors", "duplicate_of", "_remark_lookup", "_lock")
+
+    def __init__(self, ideas: List[Idea], llm_names: List[str]):
+        """
+        Args:
+            ideas: Ideas being evaluated; their order fixes the first axis
+            llm_names: LLM names; their order fixes the second axis
+        """
+        self.ideas = ideas
+        self.llm_names = list(llm_names)
+        self.positions = {idea.id: position for position, idea in enumerate(ideas)}
+        self.llm_positions = {llm_name: column for column, llm_name in enumerate(self.llm_names)}
+        shape = (len(ideas), len(self.llm_names), len(Dimension))
+        self.scores = np.full(shape, MISSING_SCORE, dtype=np.int8)
+        self.remark_ids = np.full(shape, NO_REMARK, dtype=np.int32)
+        self.remarks: List[str] = []
+        # Sparse per-(idea, LLM) details, keyed by (idea position, LLM position)
+        self.errors: Dict[Tuple[int, int], str] = {}
+        self.duplicate_of: Dict[Tuple[int, int], str] = {}
+        self._remark_lookup: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, idea: Idea, llm_name: str, evaluation: Dict[str, Any]) -> None:
+        """
+        Store one (idea, LLM) evaluation, replacing any earlier one for the pair.
+
+        Args:
+            idea: Idea object
+            llm_name: Name of the LLM
+            evaluation: Evaluation dictionary as returned by evaluate_idea_with_llm()
+        """
+        pair = (self.positions[idea.id], self.llm_positions[llm_name])
+        scores = [MISSING_SCORE] * len(RUBRIC_DIMENSIONS)
+        remark_ids = [NO_REMARK] * len(RUBRIC_DIMENSIONS)
+        with self._lock:
+            if "error" not in evaluation:
+                for code, dimension in enumerate(RUBRIC_DIMENSIONS):
+                    entry = evaluation.get(dimension)
+                    if entry is not None:
+                        scores[code] = entry["score"]
+                        remark_ids[code] = self._intern(entry["remark"])
+            # One assignment per array rather than one per dimension
+            self.scores[pair] = scores
+            self.remark_ids[pair] = remark_ids
+            self.errors.pop(pair, None)
+            self.duplicate_of.pop(pair, None)
+            if "error" in evaluation:
+                self.errors[pair] = str(evaluation["error"])
+            if "duplicate_of" in evaluation:
+                self.duplicate_of[pair] = evaluation["duplicate_of"]
+
+    def _intern(self, remark: str) -> int:
+        """Return the pool index of a remark, adding it on first use."""
+        remark_id = self._remark_lookup.get(remark)
+        if remark_id is None:
+            remark_id = self._remark_lookup[remark] = len(self.remarks)
+            self.remarks.append(remark)
+        return remark_id
+
+    def evaluation(self, idea_id: str, llm_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the evaluation dictionary of one (idea, LLM) pair.
+
+        Args:
+            idea_id: ID of the idea
+            llm_name: Name of the LLM
+
+        Returns:
+            Evaluation dictionary with the scored dimensions (or "error"), or None
+            if nothing was stored for the pair
+        """
+        pair = (self.positions[idea_id], self.llm_positions[llm_name])
+        if pair in self.errors:
+            evaluation: Dict[str, Any] = {"error": self.errors[pair]}
+        else:
+            evaluation = {
+                dimension: {"score": int(self.scores[pair + (code,)]),
+                            "remark": self.remarks[self.remark_ids[pair + (code,)]]}
+                for code, dimension in enumerate(RUBRIC_DIMENSIONS) if self.scores[pair + (code,)] != MISSING_SCORE
+            }
+            if not evaluation:
+                return None
+        if pair in self.duplicate_of:
+            evaluation["duplicate_of"] = self.duplicate_of[pair]
+        return evaluation
+
+    def _rows(self, ideas: Optional[List[Idea]]) -> np.ndarray:
+        """Positions of the given ideas (all ideas, in order, if None)."""
+        if ideas is None:
+            return np.arange(len(self.ideas))
+        return np.fromiter((self.positions[idea.id] for idea in ideas), dtype=np.int64, count=len(ideas))
+
+    def to_frame(self, ideas: Optional[List[Idea]] = None) -> pd.DataFrame:
+        """
+        Return the scores in the long format of tables.normalize_evaluations().
+
+        Args:
+            ideas: Ideas to include, in output order (defaults to all)
+
+        Returns:
+            Dataframe with columns idea (position in ideas), llm and dimension
+            (categoricals), score and remark, ordered by idea, LLM and dimension
+        """
+        rows = self._rows(ideas)
+        scores = self.scores[rows]
+        idea_index, llm_index, dimension_index = np.nonzero(scores != MISSING_SCORE)
+        remarks = np.empty(len(self.remarks), dtype=object)
+        remarks[:] = self.remarks
+        return pd.DataFrame({
+            "idea": idea_index.astype(np.int64),
+            "llm": pd.Categorical.from_codes(llm_index.astype(np.int32), categories=self.llm_names),
+            "dimension": pd.Categorical.from_codes(dimension_index.astype(np.int8), categories=DIMENSION_LABELS),
+            "score": scores[idea_index, llm_index, dimension_index].astype(np.int64),
+            "remark": remarks[self.remark_ids[rows[idea_index], llm_index, dimension_index]]
+        })
+
+    def sums_and_counts(self, ideas: Optional[List[Idea]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Total the scores per idea and dimension across LLMs.
+
+        Args:
+            ideas: Ideas to include, in output order (defaults to all)
+
+        Returns:
+            Tuple of (sums, counts), each of shape (ideas, dimensions), as expected
+            by tables.build_summary_table()
+        """
+        scores = self.scores[self._rows(ideas)]
+        present = scores != MISSING_SCORE
+        sums = np.where(present, scores, 0).sum(axis=1, dtype=np.float64)
+        return sums, present.sum(axis=1, dtype=np.float64)
+
+    def values(self, ideas: Optional[List[Idea]] = None) -> np.ndarray:
+        """
+        Return the scores as floats with NaN for missing scores.
+
+        Args:
+            ideas: Ideas to include, in output order (defaults to all)
+
+        Returns:
+            Array of shape (ideas, LLMs, dimensions)
+        """
+        scores = self.scores[self._rows(ideas)]
+        return np.where(scores != MISSING_SCORE, scores, np.nan)
+
+    def models(self, ideas: Optional[List[Idea]] = None) -> List[List[str]]:
+        """Return the LLMs that scored at least one dimension of each idea, in LLM order."""
+        scored = (self.scores[self._rows(ideas)] != MISSING_SCORE).any(axis=2)
+        return [[self.llm_names[column] for column in np.flatnonzero(row)] for row in scored]
@@ -0,0 +1,545 @@
+"""
+Evaluation Server
+
+Long-running local service for the idea evaluator. The LLM clients, rate
+limiters and response cache are set up once and kept warm, ideas are
+submitted as jobs over a small JSON HTTP API, and a bounded queue feeds the
+jobs to a worker thread one at a time. When the queue is full new
+submissions are rejected with 429 so clients back off instead of piling up
+work in memory. Jobs still queued when the server shuts down are cancelled.
+
+Endpoints:
+    GET    /health             LLMs, queue depth and job counts
+    POST   /jobs               Submit ideas: {"ideas": [{"id", "title", "description"}, ...]}
+                               or {"text": "Idea ID: ... Project Title: ..."}
+    GET    /jobs/<id>          Status and progress of one job
+    GET    /jobs/<id>/results  Evaluations and summary table of a finished job
+    DELETE /jobs/<id>          Cancel a job that has not started yet
+
+Usage:
+    python Team_ideas_rating/server.py [--port 8765] [--max-queued-jobs 16] ...
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional
+
+from document_parser import Idea, iter_ideas_from_lines
+from idea_evaluator import (DEFAULT_MAX_CONCURRENCY, DEFAULT_PROVIDER_CONCURRENCY, DEFAULT_REPAIR_ATTEMPTS,
+                            EvaluationEngine, create_evaluation_prompt, load_environment, parse_provider_limits,
+                            parse_rate_limits, setup_llms, setup_rate_limiters)
+from rate_limiter import DEFAULT_RETRY_BUDGET, ProviderRateLimiter, RetryBudget
+from response_cache import DEFAULT_CACHE_PATH, DEFAULT_TTL_SECONDS, ResponseCache
+from tables import generate_tables
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Jobs waiting to run; submissions beyond this are rejected until the queue drains
+DEFAULT_MAX_QUEUED_JOBS = 16
+
+# Largest number of ideas accepted in one job
+DEFAULT_MAX_JOB_IDEAS = 1000
+
+# Finished jobs kept for their results; the oldest are dropped first
+DEFAULT_MAX_FINISHED_JOBS = 100
+
+# Seconds a rejected client is asked to wait before submitting again
+RETRY_AFTER_SECONDS = 5
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 10 * 1024 * 1024
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobRejected(Exception):
+    """Raised when a submission cannot be accepted; carries the HTTP status to answer with."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Job:
+    """
+    One submission of ideas and the evaluations it has received so far.
+
+    The job is passed to EvaluationEngine as its sink, so add() is called with
+    every evaluation as it arrives and progress can be read while the job runs.
+    """
+
+    def __init__(self, ideas: List[Idea], llm_names: List[str]):
+        self.id = uuid.uuid4().hex[:12]
+        self.ideas = ideas
+        self.llm_names = llm_names
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.completed = 0
+        self.evaluations: Dict[str, Dict[str, Any]] = {}
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, idea: Idea, llm_name: str, evaluation: Dict[str, Any]) -> None:
+        """Count one finished (idea, LLM) evaluation."""
+        with self._lock:
+            self.completed += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job's status and progress."""
+        with self._lock:
+            completed = self.completed
+        return {
+            "id": self.id,
+            "status": self.status,
+            "ideas": len(self.ideas),
+            "llms": self.llm_names,
+            "completed": completed,
+            "total": len(self.ideas) * len(self.llm_names),
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+def parse_submission(payload: Any, max_ideas: int = DEFAULT_MAX_JOB_IDEAS) -> List[Idea]:
+    """
+    Read the ideas from a submitted JSON body.
+
+    Args:
+        payload: Decoded JSON body with an "ideas" list or a "text" string in the
+            document's "Idea ID:" / "Project Title:" layout
+        max_ideas: Largest number of ideas accepted
+
+    Returns:
+        List of Idea objects in submission order
+
+    Raises:
+        JobRejected: If the body is malformed, empty, too large or repeats an idea ID
+    """
+    if not isinstance(payload, dict) or ("ideas" in payload) == ("text" in payload):
+        raise JobRejected(HTTPStatus.BAD_REQUEST, 'Expected a JSON object with either "ideas" or "text"')
+
+    if "text" in payload:
+        if not isinstance(payload["text"], str):
+            raise JobRejected(HTTPStatus.BAD_REQUEST, '"text" must be a string')
+        ideas = list(iter_ideas_from_lines(payload["text"].splitlines()))
+    else:
+        if not isinstance(payload["ideas"], list):
+            raise JobRejected(HTTPStatus.BAD_REQUEST, '"ideas" must be a list')
+        ideas = []
+        for position, item in enumerate(payload["ideas"]):
+            if not isinstance(item, dict) or not isinstance(item.get("id"), str) or not item["id"].strip():
+                raise JobRejected(HTTPStatus.BAD_REQUEST, f"Idea {position} needs a non-empty string \"id\"")
+            title, description = item.get("title", "Untitled"), item.get("description", "")
+            if not isinstance(title, str) or not isinstance(description, str):
+                raise JobRejected(HTTPStatus.BAD_REQUEST, f"Idea {position} has a non-string title or description")
+            ideas.append(Idea(item["id"].strip(), title.strip() or "Untitled", description.strip()))
+
+    if not ideas:
+        raise JobRejected(HTTPStatus.BAD_REQUEST, "No ideas found in the submission")
+    if len(ideas) > max_ideas:
+        raise JobRejected(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                          f"{len(ideas)} ideas submitted; at most {max_ideas} are accepted per job")
+    seen = set()
+    for idea in ideas:
+        if idea.id in seen:
+            raise JobRejected(HTTPStatus.BAD_REQUEST, f"Idea ID {idea.id} appears more than once")
+        seen.add(idea.id)
+    return ideas
+
+
+class EvaluationService:
+    """
+    Job queue in front of a warm EvaluationEngine setup.
+
+    Jobs are run one at a time by a worker thread; each job evaluates its ideas
+    with every LLM concurrently, within max_concurrency, like a command-line run.
+    """
+
+    def __init__(self, llms: Dict[str, Any], cache: Optional[ResponseCache] = None,
+                 rate_limiters: Optional[Dict[str, ProviderRateLimiter]] = None,
+                 max_queued_jobs: int = DEFAULT_MAX_QUEUED_JOBS,
+                 max_job_ideas: int = DEFAULT_MAX_JOB_IDEAS,
+                 max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+                 retry_budget: int = DEFAULT_RETRY_BUDGET,
+                 **engine_options: Any):
+        """
+        Args:
+            llms: Dictionary of LLM instances, shared by every job
+            cache: Optional response cache, kept open for the life of the service
+            rate_limiters: Optional rate limiters keyed by LLM name, shared by every job
+            max_queued_jobs: Jobs that can wait to run before submissions are rejected
+            max_job_ideas: Largest number of ideas accepted in one job
+            max_finished_jobs: Finished jobs kept in memory for their results
+            retry_budget: Retries allowed across all LLMs in each job; every job
+                starts with a fresh budget on the shared rate limiters
+            **engine_options: Further EvaluationEngine settings (max_concurrency,
+                provider_concurrency, structured_output, repair_attempts, ...)
+        """
+        if max_queued_jobs < 1:
+            raise ValueError("max_queued_jobs must be at least 1")
+
+        self.llms = llms
+        self.cache = cache
+        self.rate_limiters = rate_limiters or {}
+        self.max_queued_jobs = max_queued_jobs
+        self.max_job_ideas = max_job_ideas
+        self.max_finished_jobs = max_finished_jobs
+        self.retry_budget = retry_budget
+        self.engine_options = engine_options
+        self.prompt_template = create_evaluation_prompt()
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        # Jobs waiting to run, in submission order; cancelled jobs are removed at once
+        self._queue: Deque[Job] = deque()
+        self._lock = threading.Lock()
+        self._job_queued = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread that runs queued jobs."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run_jobs, name="evaluation-jobs", daemon=True)
+            self._worker.start()
+
+    def close(self) -> None:
+        """Stop taking jobs, cancel the queued ones, wait for the running job to finish and close the cache."""
+        with self._job_queued:
+            self._stopping.set()
+            dropped = list(self._queue)
+            self._queue.clear()
+            for job in dropped:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+            self._job_queued.notify_all()
+        if dropped:
+            print(f"Cancelled {len(dropped)} queued jobs")
+        if self._worker is not None:
+            self._worker.join()
+        if self.cache is not None:
+            self.cache.close()
+
+    def submit(self, ideas: List[Idea]) -> Job:
+        """
+        Queue a job for the given ideas.
+
+        Args:
+            ideas: Ideas to evaluate
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobRejected: If the queue is full or the service is shutting down
+        """
+        job = Job(ideas, list(self.llms))
+        with self._job_queued:
+            if self._stopping.is_set():
+                raise JobRejected(HTTPStatus.SERVICE_UNAVAILABLE, "The server is shutting down")
+            if len(self._queue) >= self.max_queued_jobs:
+                raise JobRejected(HTTPStatus.TOO_MANY_REQUESTS,
+                                  f"{self.max_queued_jobs} jobs are already waiting; retry later")
+            self._queue.append(job)
+            self.jobs[job.id] = job
+            waiting = len(self._queue)
+            self._job_queued.notify()
+        print(f"Queued job {job.id} with {len(ideas)} ideas ({waiting} waiting)")
+        return job
+
+    def job(self, job_id: str) -> Job:
+        """
+        Look up a job.
+
+        Raises:
+            KeyError: If there is no such job
+        """
+        with self._lock:
+            return self.jobs[job_id]
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a job that has not started yet.
+
+        Raises:
+            KeyError: If there is no such job
+            JobRejected: If the job has already started
+        """
+        with self._lock:
+            job = self.jobs[job_id]
+            if job.status != QUEUED:
+                raise JobRejected(HTTPStatus.CONFLICT, f"Job {job_id} is {job.status} and cannot be cancelled")
+            # Free the job's place in the queue so the client can submit again
+            self._queue.remove(job)
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return job
+
+    def results(self, job_id: str) -> Dict[str, Any]:
+        """
+        Return the evaluations and summary table of a finished job.
+
+        Raises:
+            KeyError: If there is no such job
+            JobRejected: If the job has not finished successfully
+        """
+        job = self.job(job_id)
+        if job.status != DONE:
+            raise JobRejected(HTTPStatus.CONFLICT, f"Job {job_id} is {job.status}; results are not available")
+        _, summary_df = generate_tables(job.evaluations, job.ideas)
+        return {
+            "job": job.to_dict(),
+            "evaluations": job.evaluations,
+            "summary": summary_df.to_dict(orient="records")
+        }
+
+    def health(self) -> Dict[str, Any]:
+        """Return the LLMs, queue depth and number of jobs in each state."""
+        with self._lock:
+            states: Dict[str, int] = {}
+            for job in self.jobs.values():
+                states[job.status] = states.get(job.status, 0) + 1
+            queued = len(self._queue)
+        return {
+            "llms": list(self.llms),
+            "queued": queued,
+            "max_queued_jobs": self.max_queued_jobs,
+            "jobs": states,
+            "cache": {"hits": self.cache.hits, "misses": self.cache.misses} if self.cache is not None else None
+        }
+
+    def _run_jobs(self) -> None:
+        """Worker loop: run queued jobs in submission order until the service stops."""
+        while True:
+            with self._job_queued:
+                while not self._queue and not self._stopping.is_set():
+                    self._job_queued.wait()
+                if self._stopping.is_set():
+                    return
+                job = self._queue.popleft()
+                job.status = RUNNING
+                job.started_at = time.time()
+            self._run(job)
+            self._forget_old_jobs()
+
+    def _run(self, job: Job) -> None:
+        """Evaluate one job's ideas with the shared LLMs, cache and rate limiters."""
+        print(f"Starting job {job.id}")
+        # Jobs run one at a time, so the limiters' budget can be replaced between jobs;
+        # a single budget for the life of the server would stop all retries once spent
+        retry_budget = RetryBudget(self.retry_budget)
+        for rate_limiter in self.rate_limiters.values():
+            rate_limiter.retry_budget = retry_budget
+        engine = EvaluationEngine(self.llms, self.prompt_template, cache=self.cache,
+                                  rate_limiters=self.rate_limiters, sink=job, **self.engine_options)
+        try:
+            evaluations = engine.evaluate(job.ideas)
+        except Exception as e:
+            with self._lock:
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = FAILED
+                job.finished_at = time.time()
+        else:
+            with self._lock:
+                job.evaluations = evaluations
+                job.status = DONE
+                job.finished_at = time.time()
+        print(f"Job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    def _forget_old_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond max_finished_jobs."""
+        with self._lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job.status in (DONE, FAILED, CANCELLED)]
+            for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+                del self.jobs[job_id]
+
+
+class EvaluationRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over an EvaluationService, available as self.server.service."""
+
+    def do_GET(self) -> None:
+        parts = self._path_parts()
+        if parts == ["health"]:
+            self._respond(HTTPStatus.OK, self.server.service.health())
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._with_job(parts[1], lambda: (HTTPStatus.OK, self.server.service.job(parts[1]).to_dict()))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "results":
+            self._with_job(parts[1], lambda: (HTTPStatus.OK, self.server.service.results(parts[1])))
+        else:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self._path_parts() != ["jobs"]:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_REQUEST_BYTES:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            if length < 0:
+                self._respond(HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"})
+            else:
+                self._respond(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                              {"error": f"Request body is larger than {MAX_REQUEST_BYTES} bytes"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except (ValueError, UnicodeDecodeError):
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": "Request body is not valid JSON"})
+            return
+        try:
+            ideas = parse_submission(payload, self.server.service.max_job_ideas)
+            job = self.server.service.submit(ideas)
+        except JobRejected as e:
+            self._reject(e)
+            return
+        self._respond(HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def do_DELETE(self) -> None:
+        parts = self._path_parts()
+        if len(parts) == 2 and parts[0] == "jobs":
+            self._with_job(parts[1], lambda: (HTTPStatus.OK, self.server.service.cancel(parts[1]).to_dict()))
+        else:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": f"No such endpoint: {self.path}"})
+
+    def _path_parts(self) -> List[str]:
+        return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+    def _with_job(self, job_id: str, action) -> None:
+        """Answer with the (status, body) returned by action, mapping unknown jobs to 404."""
+        try:
+            status, body = action()
+        except KeyError:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": f"No such job: {job_id}"})
+        except JobRejected as e:
+            self._reject(e)
+        else:
+            self._respond(status, body)
+
+    def _reject(self, error: JobRejected) -> None:
+        headers = {"Retry-After": str(RETRY_AFTER_SECONDS)} if error.status == HTTPStatus.TOO_MANY_REQUESTS else {}
+        self._respond(error.status, {"error": str(error)}, headers)
+
+    def _respond(self, status: HTTPStatus, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_server(service: EvaluationService, host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """
+    Create the HTTP server for a service.
+
+    Args:
+        service: Service that runs the submitted jobs
+        host: Interface to listen on (local only by default)
+        port: Port to listen on (0 picks a free port)
+
+    Returns:
+        Server ready for serve_forever(); the bound address is in server_address
+    """
+    server = ThreadingHTTPServer((host, port), EvaluationRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Run the idea evaluator as a local HTTP service with a job queue.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--max-queued-jobs", type=int, default=DEFAULT_MAX_QUEUED_JOBS,
+                        help="Jobs that can wait to run before new submissions get 429 "
+                             f"(default: {DEFAULT_MAX_QUEUED_JOBS})")
+    parser.add_argument("--max-job-ideas", type=int, default=DEFAULT_MAX_JOB_IDEAS,
+                        help=f"Largest number of ideas accepted in one job (default: {DEFAULT_MAX_JOB_IDEAS})")
+    parser.add_argument("--max-finished-jobs", type=int, default=DEFAULT_MAX_FINISHED_JOBS,
+                        help=f"Finished jobs kept for their results (default: {DEFAULT_MAX_FINISHED_JOBS})")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"Maximum number of LLM requests in flight (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--provider-concurrency", action="append", default=[], metavar="NAME=N",
+                        help="Concurrency limit for one LLM, e.g. Perplexity-Sonar=2 "
+                             f"(default: {DEFAULT_PROVIDER_CONCURRENCY}; may be repeated)")
+    parser.add_argument("--rate-limit", action="append", default=[], metavar="NAME=RPM[:TPM]",
+                        help="Requests (and optionally tokens) per minute for one LLM; may be repeated")
+    parser.add_argument("--retry-budget", type=int, default=DEFAULT_RETRY_BUDGET,
+                        help=f"Number of retries allowed across all LLMs in each job (default: {DEFAULT_RETRY_BUDGET})")
+    parser.add_argument("--structured-output", action="store_true",
+                        help="Use each provider's native structured-output / JSON mode with the rubric schema")
+    parser.add_argument("--repair-attempts", type=int, default=DEFAULT_REPAIR_ATTEMPTS,
+                        help="Repair re-prompts for a malformed or incomplete response "
+                             f"(default: {DEFAULT_REPAIR_ATTEMPTS}; 0 disables)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the response cache and query every LLM")
+    parser.add_argument("--cache-path", default=DEFAULT_CACHE_PATH,
+                        help=f"Location of the response cache (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--cache-ttl-days", type=float, default=DEFAULT_TTL_SECONDS / 86400,
+                        help="Age after which cached responses expire (default: %(default)g)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Set up the LLMs once and serve evaluation jobs until interrupted."""
+    args = parse_args(argv)
+    load_environment()
+    try:
+        provider_limits = parse_provider_limits(args.provider_concurrency)
+        rate_limits = parse_rate_limits(args.rate_limit)
+    except argparse.ArgumentTypeError as e:
+        raise SystemExit(f"Error: {e}")
+
+    llms = setup_llms()
+    cache = None if args.no_cache else ResponseCache(args.cache_path, ttl_seconds=args.cache_ttl_days * 86400)
+    service = EvaluationService(llms, cache=cache,
+                                rate_limiters=setup_rate_limiters(list(llms), overrides=rate_limits),
+                                max_queued_jobs=args.max_queued_jobs,
+                                max_job_ideas=args.max_job_ideas,
+                                max_finished_jobs=args.max_finished_jobs,
+                                retry_budget=args.retry_budget,
+                                max_concurrency=args.max_concurrency,
+                                provider_concurrency=provider_limits,
+                                structured_output=args.structured_output,
+                                repair_attempts=args.repair_attempts)
+    server = create_server(service, args.host, args.port)
+    service.start()
+
+    host, port = server.server_address[:2]
+    print(f"Serving idea evaluations on http://{host}:{port} (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down; waiting for the running job to finish")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
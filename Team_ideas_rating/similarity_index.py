@@ -0,0 +1,188 @@
+"""
+Similarity Index
+
+Finds near-duplicate ideas so that only one idea of each group is sent to the
+LLMs. Ideas are compared by the Jaccard similarity of the word 3-grams
+("shingles") of their title and description. Runs fully offline.
+
+To avoid comparing every pair of ideas, each idea gets a MinHash signature
+and the signatures are split into bands for locality-sensitive hashing (LSH):
+only ideas that share at least one band are compared, and each candidate is
+confirmed with the exact Jaccard similarity of the shingles. Ideas are added
+in order; an idea that matches an earlier representative joins its group,
+otherwise it becomes a representative itself. Every member is therefore
+similar to its own representative, not just to some other member.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from document_parser import Idea
+
+# Minimum Jaccard similarity of the shingles for two ideas to count as duplicates
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+# Number of MinHash permutations per signature
+DEFAULT_NUM_PERM = 128
+
+# Words per shingle
+DEFAULT_SHINGLE_SIZE = 3
+
+# Probability that a pair exactly at the threshold shares at least one LSH band
+LSH_TARGET_RECALL = 0.99
+
+# Mersenne prime for the MinHash permutations; shingle hashes are 32-bit, so
+# a * hash + b stays below 2**63 and never overflows uint64
+MINHASH_PRIME = (1 << 31) - 1
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """
+    Split text into overlapping word n-grams, ignoring case and punctuation.
+
+    Args:
+        text: Text to split
+        size: Words per shingle
+
+    Returns:
+        Set of shingles (a single shingle for texts shorter than size words)
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """Return the Jaccard similarity of two sets (0.0 if both are empty)."""
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def choose_bands(num_perm: int, threshold: float, recall: float = LSH_TARGET_RECALL) -> Tuple[int, int]:
+    """
+    Choose how to split signatures into LSH bands.
+
+    Uses the most rows per band (fewest false candidates) for which a pair
+    exactly at the threshold still shares a band with the target probability.
+
+    Args:
+        num_perm: Signature length
+        threshold: Similarity threshold
+        recall: Required probability that a pair at the threshold becomes a candidate
+
+    Returns:
+        Tuple of (bands, rows per band)
+    """
+    for rows in range(num_perm, 0, -1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class SimilarityIndex:
+    """MinHash/LSH index of representative ideas."""
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        """
+        Args:
+            threshold: Minimum Jaccard similarity for two ideas to be duplicates
+            num_perm: Number of MinHash permutations per signature
+            shingle_size: Words per shingle
+            seed: Seed for the MinHash permutations
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MINHASH_PRIME, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, MINHASH_PRIME, size=num_perm, dtype=np.uint64)[:, None]
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._shingles: List[Set[str]] = []
+        self.ids: List[str] = []
+        self.comparisons = 0
+
+    def signature(self, idea_shingles: Set[str]) -> np.ndarray:
+        """Return the MinHash signature of a non-empty shingle set."""
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in idea_shingles),
+                             dtype=np.uint64, count=len(idea_shingles))
+        return ((self._a * hashes + self._b) % MINHASH_PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, idea: Idea) -> Optional[str]:
+        """
+        Match an idea against the index, adding it as a representative if it is new.
+
+        Args:
+            idea: Idea to add
+
+        Returns:
+            ID of the most similar representative at or above the threshold, or
+            None if the idea was added as a new representative
+        """
+        idea_shingles = shingles(f"{idea.title}\n{idea.description}", self.shingle_size)
+        if not idea_shingles:
+            # Nothing to compare; never treat an empty idea as a duplicate
+            self.ids.append(idea.id)
+            self._shingles.append(idea_shingles)
+            return None
+
+        keys = self._band_keys(self.signature(idea_shingles))
+        candidates = sorted({position for band, key in enumerate(keys)
+                             for position in self._buckets[band].get(key, [])})
+        best, best_similarity = None, 0.0
+        for position in candidates:
+            self.comparisons += 1
+            similarity = jaccard(idea_shingles, self._shingles[position])
+            if similarity >= self.threshold and similarity > best_similarity:
+                best, best_similarity = position, similarity
+        if best is not None:
+            return self.ids[best]
+
+        position = len(self.ids)
+        self.ids.append(idea.id)
+        self._shingles.append(idea_shingles)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(position)
+        return None
+
+
+def find_duplicates(ideas: List[Idea], threshold: float = DEFAULT_SIMILARITY_THRESHOLD) -> Dict[str, List[Idea]]:
+    """
+    Group near-duplicate ideas under a representative.
+
+    The representative of each group is its earliest idea in the list.
+
+    Args:
+        ideas: List of Idea objects
+        threshold: Minimum Jaccard similarity for two ideas to be duplicates
+
+    Returns:
+        Dictionary mapping each representative's ID to its duplicate ideas
+        (representatives without duplicates are left out)
+    """
+    index = SimilarityIndex(threshold)
+    duplicates: Dict[str, List[Idea]] = {}
+    for idea in ideas:
+        representative = index.add(idea)
+        if representative is not None:
+            duplicates.setdefault(representative, []).append(idea)
+
+    members = sum(len(group) for group in duplicates.values())
+    print(f"Found {members} near-duplicate ideas in {len(duplicates)} groups "
+          f"(similarity >= {threshold:g}); {len(ideas) - members} ideas will be evaluated")
+    return duplicates
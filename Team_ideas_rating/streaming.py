@@ -0,0 +1,142 @@
+"""
+Streaming
+
+Token-by-token consumption of LLM completions. The response is scanned for a
+JSON object as it arrives, and the request is cancelled as soon as a complete
+rubric object has been received. Each stream records its time to first token
+and throughput, and StreamMetrics summarises them per model. Token usage sent
+on the stream's chunks is reported to the instrumentation module.
+"""
+
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from instrumentation import record_usage
+from response_parser import JSONObjectDetector, is_complete_evaluation
+
+
+class StreamStats:
+    """Timings for one streamed completion."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chunks = 0
+        self.characters = 0
+        self.cancelled = False
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from sending the request to receiving the first token."""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """
+        Generation speed after the first token.
+
+        Streamed chunks are counted as tokens, which is exact for OpenAI-compatible
+        APIs that send one token per chunk and approximate for other providers.
+        """
+        if self.first_token_at is None or self.finished_at is None or self.chunks < 2:
+            return None
+        elapsed = self.finished_at - self.first_token_at
+        return (self.chunks - 1) / elapsed if elapsed > 0 else None
+
+
+def stream_completion(llm: Any, prompt: str, stop_when: Callable[[str], bool] = is_complete_evaluation,
+                      **kwargs: Any) -> Tuple[str, StreamStats]:
+    """
+    Stream a completion, stopping once a complete JSON object has arrived.
+
+    Chat models attach token usage to their chunks (OpenAI only when asked with
+    stream_options, on a final chunk without content; Gemini as running totals on
+    every chunk), so the last usage seen is reported with record_usage().
+
+    Args:
+        llm: LLM or chat model instance
+        prompt: Rendered prompt
+        stop_when: Called with each complete top-level JSON object in the response;
+            returning True cancels the rest of the stream
+        **kwargs: Extra arguments for the LLM call
+
+    Returns:
+        Tuple of (response text received so far, stream timings)
+    """
+    stats = StreamStats()
+    detector = JSONObjectDetector()
+    usage = None
+    stream = llm.stream(prompt, **kwargs)
+    try:
+        for chunk in stream:
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            text = chunk if isinstance(chunk, str) else chunk.content
+            if not text:
+                continue
+            if stats.first_token_at is None:
+                stats.first_token_at = time.perf_counter()
+            stats.chunks += 1
+            stats.characters += len(text)
+            if any(stop_when(candidate) for candidate in detector.feed(text)):
+                stats.cancelled = True
+                break
+    finally:
+        # Closing the generator closes the HTTP response, cancelling the request
+        stream.close()
+        stats.finished_at = time.perf_counter()
+        if usage:
+            record_usage(usage.get("input_tokens"), usage.get("output_tokens"))
+    return detector.text, stats
+
+
+class StreamMetrics:
+    """Thread-safe collection of stream timings, grouped by model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[StreamStats]] = {}
+
+    def record(self, llm_name: str, stats: StreamStats) -> None:
+        """Add the timings of one stream."""
+        with self._lock:
+            self._stats.setdefault(llm_name, []).append(stats)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarise the recorded streams.
+
+        Returns:
+            Per-model dictionary with the number of streams, how many were cancelled
+            early, median time to first token (seconds) and median tokens per second
+        """
+        with self._lock:
+            recorded = {llm_name: list(stats) for llm_name, stats in self._stats.items()}
+
+        summary = {}
+        for llm_name, stats in recorded.items():
+            ttfts = [s.time_to_first_token for s in stats if s.time_to_first_token is not None]
+            rates = [s.tokens_per_second for s in stats if s.tokens_per_second is not None]
+            summary[llm_name] = {
+                "streams": len(stats),
+                "cancelled_early": sum(s.cancelled for s in stats),
+                "median_ttft": statistics.median(ttfts) if ttfts else None,
+                "median_tokens_per_second": statistics.median(rates) if rates else None
+            }
+        return summary
+
+    def print_summary(self) -> None:
+        """Print a per-model table of stream timings."""
+        summary = self.summary()
+        if not summary:
+            return
+        print("\nStreaming performance by model:")
+        print(f"  {'Model':<20} {'Streams':>8} {'Cut short':>10} {'TTFT (s)':>9} {'Tokens/s':>9}")
+        for llm_name, row in summary.items():
+            ttft = f"{row['median_ttft']:.2f}" if row["median_ttft"] is not None else "-"
+            rate = f"{row['median_tokens_per_second']:.1f}" if row["median_tokens_per_second"] is not None else "-"
+            print(f"  {llm_name:<20} {row['streams']:>8} {row['cancelled_early']:>10} {ttft:>9} {rate:>9}")
@@ -0,0 +1,256 @@
+"""
+Tables
+
+Turns evaluation results into the detailed (one row per score) and summary
+(one row per idea) rating tables, and exports them in the selected formats.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from document_parser import Idea
+from exporters import EXPORTERS
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS
+from score_matrix import ScoreMatrix
+
+# Output paths; each export format replaces the extension with its own
+OUTPUT_DETAILED_PATH = os.path.join("Team_ideas_rating", "detailed_ratings.xlsx")
+OUTPUT_SUMMARY_PATH = os.path.join("Team_ideas_rating", "summary_ratings.xlsx")
+
+# Output formats written by default (see exporters.EXPORTERS for all formats)
+DEFAULT_EXPORT_FORMATS = ["xlsx"]
+
+
+def round_half_even(values: np.ndarray, decimals: int = 1) -> np.ndarray:
+    """
+    Round an array exactly like Python's round().
+
+    np.round() scales by 10**decimals before rounding, which can push values
+    sitting just below a tie (e.g. 0.15) onto it. Those near-ties are re-rounded
+    with Python's round() so results match the scalar implementation bit for bit.
+
+    Args:
+        values: Array of floats
+        decimals: Number of decimal places
+
+    Returns:
+        Array of rounded floats
+    """
+    rounded = np.round(values, decimals)
+    scaled = values * 10 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-9
+    if near_tie.any():
+        rounded[near_tie] = [round(value, decimals) for value in values[near_tie].tolist()]
+    return rounded
+
+
+def normalize_evaluations(all_evaluations: Dict[str, Dict[str, Any]], ideas: List[Idea]) -> pd.DataFrame:
+    """
+    Flatten evaluation results into a long-format dataframe with one row per score.
+
+    Args:
+        all_evaluations: Dictionary of evaluation results for all ideas
+        ideas: List of Idea objects
+
+    Returns:
+        Dataframe with columns idea (position in ideas), llm and dimension
+        (categoricals), score and remark, ordered by idea, LLM and dimension
+    """
+    # One entry per successful (idea, LLM) pair, expanded to one row per scored dimension below
+    pair_positions, pair_llm_codes, pair_sizes = [], [], []
+    llm_codes: Dict[str, int] = {}
+    dimension_codes, entries = [], []
+
+    for position, idea in enumerate(ideas):
+        for llm_name, evaluation in all_evaluations.get(idea.id, {}).items():
+            if "error" in evaluation:
+                continue
+            present = [code for code, dimension in enumerate(RUBRIC_DIMENSIONS) if dimension in evaluation]
+            dimension_codes.extend(present)
+            entries.extend([evaluation[RUBRIC_DIMENSIONS[code]] for code in present])
+            pair_positions.append(position)
+            pair_llm_codes.append(llm_codes.setdefault(llm_name, len(llm_codes)))
+            pair_sizes.append(len(present))
+
+    return pd.DataFrame({
+        "idea": np.repeat(np.asarray(pair_positions, dtype=np.int64), pair_sizes),
+        "llm": pd.Categorical.from_codes(np.repeat(np.asarray(pair_llm_codes, dtype=np.int32), pair_sizes),
+                                         categories=list(llm_codes)),
+        "dimension": pd.Categorical.from_codes(np.asarray(dimension_codes, dtype=np.int8),
+                                               categories=DIMENSION_LABELS),
+        "score": [entry["score"] for entry in entries],
+        "remark": np.fromiter((entry["remark"] for entry in entries), dtype=object, count=len(entries))
+    })
+
+
+def generate_tables(all_evaluations: Union[Dict[str, Dict[str, Any]], ScoreMatrix], ideas: List[Idea],
+                    include_models: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generate detailed and summary tables from evaluation results.
+
+    Args:
+        all_evaluations: Dictionary of evaluation results for all ideas, or a
+            ScoreMatrix holding them; the summary is then computed on its arrays
+        ideas: List of Idea objects
+        include_models: Add a Models column to the summary listing the LLMs whose
+            scores make up each idea's averages (used with adaptive sampling, where
+            ideas are scored by different numbers of LLMs)
+
+    Returns:
+        Tuple of (detailed_df, summary_df)
+    """
+    print("Generating tables...")
+
+    if isinstance(all_evaluations, ScoreMatrix):
+        scores_df = all_evaluations.to_frame(ideas)
+        sums, counts = all_evaluations.sums_and_counts(ideas)
+        models = all_evaluations.models(ideas) if include_models else None
+    else:
+        scores_df = normalize_evaluations(all_evaluations, ideas)
+        sums, counts = sum_scores(scores_df, len(ideas))
+        models = None
+        if include_models:
+            models = [[] for _ in ideas]
+            pairs = scores_df[["idea", "llm"]].drop_duplicates()
+            for position, llm_name in zip(pairs["idea"].tolist(), pairs["llm"].tolist()):
+                models[position].append(llm_name)
+
+    detailed_df = build_detailed_table(ideas, scores_df)
+    summary_df = build_summary_table(ideas, sums, counts, models)
+
+    print("Tables generated")
+    return detailed_df, summary_df
+
+
+def sum_scores(scores_df: pd.DataFrame, num_ideas: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Total the scores per idea and dimension.
+
+    Args:
+        scores_df: Long-format scores as returned by normalize_evaluations()
+        num_ideas: Number of ideas (rows of the result)
+
+    Returns:
+        Tuple of (sums, counts), each of shape (ideas, dimensions)
+    """
+    grouped = scores_df.assign(score=scores_df["score"].astype(np.float64)).groupby(
+        ["idea", "dimension"], observed=True, sort=False)["score"].agg(["sum", "count"])
+    shape = (num_ideas, len(RUBRIC_DIMENSIONS))
+    sums = np.zeros(shape)
+    counts = np.zeros(shape)
+    rows = grouped.index.get_level_values("idea").to_numpy()
+    cols = grouped.index.get_level_values("dimension").codes
+    sums[rows, cols] = grouped["sum"].to_numpy()
+    counts[rows, cols] = grouped["count"].to_numpy()
+    return sums, counts
+
+
+def build_detailed_table(ideas: List[Idea], scores_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build the detailed table with one row per score.
+
+    Args:
+        ideas: List of Idea objects
+        scores_df: Long-format scores as returned by normalize_evaluations()
+
+    Returns:
+        Detailed dataframe in idea, LLM and dimension order
+    """
+    if not len(scores_df):
+        return pd.DataFrame([])
+    positions = scores_df["idea"].to_numpy()
+    return pd.DataFrame({
+        "Idea ID": np.asarray([idea.id for idea in ideas], dtype=object)[positions],
+        "Idea Title": np.asarray([idea.title for idea in ideas], dtype=object)[positions],
+        "LLM": np.asarray(scores_df["llm"].cat.categories, dtype=object)[scores_df["llm"].cat.codes],
+        "Dimension": np.asarray(DIMENSION_LABELS, dtype=object)[scores_df["dimension"].cat.codes],
+        "Score": scores_df["score"].to_numpy(),
+        "Remark": scores_df["remark"].to_numpy()
+    })
+
+
+def build_summary_table(ideas: List[Idea], sums: np.ndarray, counts: np.ndarray,
+                        models: Optional[List[List[str]]] = None) -> pd.DataFrame:
+    """
+    Build the summary table from score totals.
+
+    Args:
+        ideas: List of Idea objects
+        sums: Sum of scores per idea (row, in ideas order) and dimension (column)
+        counts: Number of scores per idea and dimension
+        models: Optional LLM names that scored each idea, written to a Models column
+
+    Returns:
+        Summary dataframe sorted by average rating
+    """
+    idea_ids = [idea.id for idea in ideas]
+    idea_titles = [idea.title for idea in ideas]
+    shape = (len(ideas), len(RUBRIC_DIMENSIONS))
+
+    # Calculate average scores and round to 1 decimal place (0.0 where nothing was scored)
+    avg_scores = round_half_even(np.divide(sums, counts, out=np.zeros(shape), where=counts > 0))
+
+    # Calculate overall average and round to 1 decimal place
+    total = np.zeros(len(ideas))
+    for column in range(len(RUBRIC_DIMENSIONS)):
+        total += avg_scores[:, column]
+    overall_avg = round_half_even(total / len(RUBRIC_DIMENSIONS))
+
+    summary_df = pd.DataFrame({
+        "Idea ID": idea_ids,
+        "Idea Title": idea_titles,
+        **{label: avg_scores[:, column] for column, label in enumerate(DIMENSION_LABELS)},
+        "Average Rating": overall_avg
+    })
+    if models is not None:
+        summary_df["Models"] = [", ".join(names) for names in models]
+    return summary_df.sort_values(by="Average Rating", ascending=False)
+
+
+def output_path(path: str, fmt: str) -> str:
+    """Return an output path with its extension replaced by the format name."""
+    return os.path.splitext(path)[0] + "." + fmt
+
+
+def export_tables(detailed_df: Optional[pd.DataFrame], summary_df: pd.DataFrame,
+                  formats: Optional[List[str]] = None, excel_max_rows: Optional[int] = None) -> None:
+    """
+    Export tables in one or more formats.
+
+    Each format is written next to OUTPUT_DETAILED_PATH and OUTPUT_SUMMARY_PATH,
+    with the format name as the file extension.
+
+    Args:
+        detailed_df: Detailed ratings dataframe (None when the detailed rows were streamed)
+        summary_df: Summary ratings dataframe
+        formats: Output formats from exporters.EXPORTERS (defaults to DEFAULT_EXPORT_FORMATS)
+        excel_max_rows: Maximum number of rows written to each Excel file (None for no limit)
+    """
+    formats = formats or DEFAULT_EXPORT_FORMATS
+    unknown = [fmt for fmt in formats if fmt not in EXPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(unknown)}")
+
+    # Round all numeric columns in summary_df to 1 decimal place for display
+    numeric_columns = DIMENSION_LABELS + ['Average Rating']
+
+    for col in numeric_columns:
+        if col in summary_df.columns:
+            summary_df[col] = summary_df[col].round(1)
+
+    for fmt in formats:
+        options = {"max_rows": excel_max_rows} if fmt == "xlsx" else {}
+        summary_path = output_path(OUTPUT_SUMMARY_PATH, fmt)
+
+        if detailed_df is not None:
+            detailed_path = output_path(OUTPUT_DETAILED_PATH, fmt)
+            print(f"Exporting detailed ratings to {detailed_path}")
+            EXPORTERS[fmt](detailed_df, detailed_path, **options)
+
+        print(f"Exporting summary ratings to {summary_path}")
+        EXPORTERS[fmt](summary_df, summary_path, **options)
+
+    print("Export complete")
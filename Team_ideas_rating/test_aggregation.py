@@ -0,0 +1,210 @@
+"""
+Test script for the statistical aggregation engine.
+
+This script checks the mean, median and trimmed-mean estimators against a
+plain Python reference, that calibration removes a constant offset between
+LLMs, that dimension weights apply and missing dimensions are not counted as
+0, that the bootstrap confidence interval behaves, and that `cli.py report`
+builds the summary with the engine when an aggregation option is given.
+"""
+
+import contextlib
+import io
+import math
+import os
+import random
+import statistics
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cli
+import tables
+from aggregation import (aggregate_summary, bootstrap_interval, calibrate, combine_models,
+                         parse_dimension_weights, row_percentile)
+from document_parser import Idea, extract_ideas_from_doc
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS
+from run_checkpoint import RunCheckpoint
+from score_matrix import ScoreMatrix
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DOCUMENT = os.path.join(HERE, "team_ideas.docx")
+
+IDEAS = [Idea(f"G{i}", f"Aggregated idea {i}", f"Description {i}") for i in range(30)]
+LLM_NAMES = ["A", "B", "C", "D", "E"]
+
+
+def evaluation(scores):
+    """Build an evaluation dictionary from {dimension: score}."""
+    return {dimension: {"score": score, "remark": "Remark"} for dimension, score in scores.items()}
+
+
+def random_matrix(seed=0):
+    """ScoreMatrix with random scores, some missing dimensions and some ideas left unscored by an LLM."""
+    rng = random.Random(seed)
+    matrix = ScoreMatrix(IDEAS, LLM_NAMES)
+    for idea in IDEAS[:-1]:
+        for llm_name in LLM_NAMES:
+            if rng.random() < 0.2:
+                continue
+            matrix.add(idea, llm_name, evaluation({dimension: rng.randint(1, 10) for dimension in RUBRIC_DIMENSIONS
+                                                   if rng.random() > 0.2}))
+    return matrix
+
+
+def reference(scores, estimator, trim=0.25):
+    """Combine a list of scores the slow way."""
+    if not scores:
+        return math.nan
+    if estimator == "mean":
+        return statistics.fmean(scores)
+    if estimator == "median":
+        return statistics.median(scores)
+    cut = math.floor(len(scores) * trim)
+    return statistics.fmean(sorted(scores)[cut:len(scores) - cut])
+
+
+@pytest.mark.parametrize("estimator", ["mean", "median", "trimmed-mean"])
+def test_estimators_match_reference(estimator):
+    values = random_matrix().values()
+    combined = combine_models(values, estimator)
+    for i in range(len(IDEAS)):
+        for d in range(len(RUBRIC_DIMENSIONS)):
+            expected = reference([v for v in values[i, :, d] if not math.isnan(v)], estimator)
+            assert combined[i, d] == pytest.approx(expected, nan_ok=True)
+
+    # Counting an LLM twice is the same as listing its scores twice
+    repeats = np.ones((len(IDEAS), 1, len(LLM_NAMES)), dtype=np.int64)
+    repeats[:, 0, 0] = 2
+    doubled = np.concatenate([values, values[:, :1]], axis=1)
+    np.testing.assert_allclose(combine_models(values, estimator, repeats=repeats)[:, 0],
+                               combine_models(doubled, estimator))
+
+    with pytest.raises(ValueError):
+        combine_models(values, estimator, trim=0.5)
+
+
+def test_calibration_removes_model_offset():
+    rng = random.Random(1)
+    matrix = ScoreMatrix(IDEAS, ["Fair", "Harsh"])
+    for idea in IDEAS:
+        scores = {dimension: rng.randint(4, 8) for dimension in RUBRIC_DIMENSIONS}
+        matrix.add(idea, "Fair", evaluation(scores))
+        matrix.add(idea, "Harsh", evaluation({dimension: score - 3 for dimension, score in scores.items()}))
+
+    calibrated = calibrate(matrix.values())
+    np.testing.assert_allclose(calibrated[:, 0], calibrated[:, 1])
+    assert np.nanmean(calibrated) == pytest.approx(np.nanmean(matrix.values()))
+
+    # An LLM that gives every idea the same score carries no ranking information
+    constant = np.full((3, 2, 1), 5.0)
+    constant[:, 1, 0] = [2.0, 4.0, np.nan]
+    assert np.isnan(calibrate(constant)[2, 1, 0])
+    assert np.allclose(calibrate(constant)[:, 0, 0], np.nanmean(constant))
+
+
+def test_weights_and_missing_dimensions():
+    ideas = IDEAS[:2]
+    matrix = ScoreMatrix(ideas, ["A"])
+    matrix.add(ideas[0], "A", evaluation({"novelty": 9, "feasibility": 3}))
+    matrix.add(ideas[1], "A", evaluation({"novelty": 6}))
+
+    summary = aggregate_summary(matrix).set_index("Idea ID")
+    # Missing dimensions are left out rather than counted as 0
+    assert summary.loc["G0", "Average Rating"] == 6.0
+    assert summary.loc["G1", "Average Rating"] == 6.0
+    assert math.isnan(summary.loc["G1", "Feasibility"])
+    assert summary["Evaluations"].tolist() == [1, 1]
+
+    weights = parse_dimension_weights(["Feasibility=2", "market-viability=0.5"])
+    assert weights[RUBRIC_DIMENSIONS.index("feasibility")] == 2
+    assert weights[RUBRIC_DIMENSIONS.index("market_viability")] == 0.5
+    summary = aggregate_summary(matrix, weights=weights)
+    assert summary["Idea ID"].tolist() == ["G1", "G0"]
+    assert summary.set_index("Idea ID").loc["G0", "Average Rating"] == 5.0
+
+    for values in (["novelty"], ["unknown=1"], ["novelty=-1"], ["novelty=x"],
+                   [f"{dimension}=0" for dimension in RUBRIC_DIMENSIONS]):
+        with pytest.raises(ValueError):
+            parse_dimension_weights(values)
+
+
+def test_bootstrap_interval():
+    matrix = random_matrix()
+    values = matrix.values()
+    weights = np.ones(len(RUBRIC_DIMENSIONS))
+    for estimator in ("mean", "median", "trimmed-mean"):
+        low, high = bootstrap_interval(values, weights, estimator, samples=200)
+        summary = aggregate_summary(matrix, estimator=estimator, bootstrap_samples=200).sort_index()
+        ratings = summary["Average Rating"].to_numpy()
+        scored = ~np.isnan(ratings)
+        assert np.all(low[scored] <= high[scored])
+        assert np.all((summary["CI Low"] <= ratings + 0.05)[scored] & (summary["CI High"] >= ratings - 0.05)[scored])
+        assert np.isnan(low[-1]) and np.isnan(high[-1])
+        # The same seed gives the same interval
+        np.testing.assert_array_equal(bootstrap_interval(values, weights, estimator, samples=200)[0], low)
+
+    # LLMs that agree leave no uncertainty
+    agreeing = np.repeat(values[:, :1], len(LLM_NAMES), axis=1)
+    low, high = bootstrap_interval(agreeing, weights, samples=50)
+    np.testing.assert_allclose(low, high)
+
+    rows = np.array([[1.0, np.nan, 3.0, 7.0], [np.nan] * 4, [2.0, 2.0, 5.0, 11.0]])
+    for percent in (2.5, 50, 97.5):
+        with np.errstate(all="ignore"), pytest.warns(RuntimeWarning):
+            expected = np.nanpercentile(rows, percent, axis=1)
+        np.testing.assert_allclose(row_percentile(rows, percent), expected)
+
+
+def test_report_with_aggregation_options():
+    ideas = extract_ideas_from_doc(DOCUMENT)
+    llm_names = ["A", "B", "C"]
+    matrix = ScoreMatrix(ideas, llm_names)
+    original_paths = (tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        checkpoint.start_run(ideas, llm_names)
+        rng = random.Random(2)
+        for idea in ideas:
+            for llm_name in llm_names:
+                result = evaluation({dimension: rng.randint(1, 10) for dimension in RUBRIC_DIMENSIONS})
+                checkpoint.record(idea, llm_name, result)
+                matrix.add(idea, llm_name, result)
+        checkpoint.close()
+
+        tables.OUTPUT_DETAILED_PATH = os.path.join(tmp, "detailed_ratings.xlsx")
+        tables.OUTPUT_SUMMARY_PATH = os.path.join(tmp, "summary_ratings.xlsx")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.main(["report", "--input", DOCUMENT, "--checkpoint-dir", tmp, "--format", "csv",
+                          "--estimator", "median", "--calibrate", "--weight", "novelty=3", "--bootstrap", "100"])
+            with pytest.raises(SystemExit, match="Invalid dimension weight"):
+                cli.main(["report", "--input", DOCUMENT, "--checkpoint-dir", tmp, "--weight", "bogus=1"])
+        finally:
+            tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH = original_paths
+        summary = pd.read_csv(os.path.join(tmp, "summary_ratings.csv"))
+
+    expected = aggregate_summary(matrix, estimator="median", calibrated=True,
+                                 weights=parse_dimension_weights(["novelty=3"]), bootstrap_samples=100)
+    assert list(summary.columns) == (["Idea ID", "Idea Title"] + DIMENSION_LABELS
+                                     + ["Average Rating", "CI Low", "CI High", "Evaluations"])
+    assert summary["Idea ID"].astype(str).tolist() == expected["Idea ID"].tolist()
+    np.testing.assert_allclose(summary["CI High"], expected["CI High"])
+    assert (summary["Evaluations"] == len(llm_names)).all()
+
+
+def main():
+    """Run the aggregation tests."""
+    print("Testing aggregation engine...")
+    for estimator in ("mean", "median", "trimmed-mean"):
+        test_estimators_match_reference(estimator)
+    test_calibration_removes_model_offset()
+    test_weights_and_missing_dimensions()
+    test_bootstrap_interval()
+    test_report_with_aggregation_options()
+    print("\nAll aggregation tests passed!")
+
+if __name__ == "__main__":
+    main()
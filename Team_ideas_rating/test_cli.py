@@ -0,0 +1,155 @@
+"""
+Test script for the command-line entry point.
+
+This script checks that importing the lightweight modules does not load the
+provider SDKs, that `cli.py parse` lists the ideas in the document, and that
+`cli.py report` rebuilds the rating tables from a checkpoint without any LLM
+or writing to the checkpoint.
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+import aggregation
+import cli
+import exporters
+import idea_evaluator
+import tables
+from document_parser import extract_ideas_from_doc
+from ingestion import ingest_ideas
+from mock_provider import MockRubricLLM
+from rubric import RUBRIC_DIMENSIONS
+from run_checkpoint import RunCheckpoint
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DOCUMENT = os.path.join(HERE, "team_ideas.docx")
+
+PROVIDER_MODULES = ["openai", "langchain_openai", "langchain_groq", "langchain_google_genai", "docx"]
+
+
+def loaded_modules(module, candidates):
+    """Import module in a fresh interpreter and return which candidates it loaded."""
+    code = (f"import sys; import {module}; "
+            f"print(','.join(name for name in {candidates!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    return [name for name in output.stdout.strip().split(",") if name]
+
+
+def test_imports_do_not_load_provider_sdks():
+    assert loaded_modules("idea_evaluator", PROVIDER_MODULES + ["pandas", "numpy"]) == []
+    assert loaded_modules("cli", PROVIDER_MODULES + ["langchain", "pandas"]) == []
+    assert loaded_modules("document_parser", PROVIDER_MODULES + ["langchain", "pandas"]) == []
+
+
+def test_parse_lists_ideas():
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        cli.main(["parse", "--input", DOCUMENT])
+    ideas = extract_ideas_from_doc(DOCUMENT)
+    assert f"Extracted {len(ideas)} ideas from 1 file" in output.getvalue()
+    assert all(f"{idea.id}: {idea.title}" in output.getvalue() for idea in ideas)
+
+
+def test_evaluate_options_are_forwarded():
+    args = cli.parse_args(["evaluate", "--batch-size", "3", "--format", "csv"])
+    assert args.handler is cli.run_evaluate
+    assert args.options == ["--batch-size", "3", "--format", "csv"]
+    args = cli.parse_args(["serve", "--port", "9000"])
+    assert args.handler is cli.run_serve
+    assert args.options == ["--port", "9000"]
+
+
+def test_choices_match_lazily_loaded_modules():
+    # cli.py and idea_evaluator.py list these themselves so that parsing arguments does not import pandas
+    assert cli.REPORT_FORMATS == list(exporters.EXPORTERS)
+    assert idea_evaluator.EXPORT_FORMATS == list(exporters.EXPORTERS)
+    assert cli.AGGREGATION_ESTIMATORS == aggregation.ESTIMATORS
+
+
+def test_report_rebuilds_tables_from_checkpoint():
+    ideas = extract_ideas_from_doc(DOCUMENT)
+    llms = {"Mock-A": MockRubricLLM(seed=1), "Mock-B": MockRubricLLM(seed=2)}
+    expected_evaluations = {idea.id: {name: llm.rubric(idea.id) for name, llm in llms.items()} for idea in ideas}
+    _, expected_summary = tables.generate_tables(expected_evaluations, ideas)
+
+    original_paths = (tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        checkpoint.start_run(ideas, llms)
+        for idea in ideas:
+            for name in llms:
+                checkpoint.record(idea, name, expected_evaluations[idea.id][name])
+        checkpoint.close()
+
+        tables.OUTPUT_DETAILED_PATH = os.path.join(tmp, "detailed_ratings.xlsx")
+        tables.OUTPUT_SUMMARY_PATH = os.path.join(tmp, "summary_ratings.xlsx")
+        checkpoint_files = {name: os.path.getmtime(os.path.join(tmp, name)) for name in os.listdir(tmp)}
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli.main(["report", "--input", DOCUMENT, "--checkpoint-dir", tmp, "--format", "csv"])
+        finally:
+            tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH = original_paths
+        # The checkpoint is only read
+        assert {name: os.path.getmtime(os.path.join(tmp, name)) for name in checkpoint_files} == checkpoint_files
+
+        summary = pd.read_csv(os.path.join(tmp, "summary_ratings.csv"))
+        detailed = pd.read_csv(os.path.join(tmp, "detailed_ratings.csv"))
+    assert summary["Average Rating"].tolist() == expected_summary["Average Rating"].tolist()
+    assert len(detailed) == len(ideas) * len(llms) * len(RUBRIC_DIMENSIONS)
+
+
+def test_report_reads_the_run_inputs_by_default():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ideas.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Idea ID: T1\nProject Title: Custom idea\nOnly in this file\n")
+        ideas = ingest_ideas([path], workers=1)
+        llm = MockRubricLLM(seed=1)
+        checkpoint = RunCheckpoint(tmp)
+        checkpoint.start_run(ideas, ["Mock-A"], inputs=[path])
+        checkpoint.record(ideas[0], "Mock-A", llm.rubric("T1"))
+        checkpoint.close()
+
+        original_paths = (tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH)
+        tables.OUTPUT_DETAILED_PATH = os.path.join(tmp, "detailed_ratings.xlsx")
+        tables.OUTPUT_SUMMARY_PATH = os.path.join(tmp, "summary_ratings.xlsx")
+        try:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                cli.main(["report", "--checkpoint-dir", tmp, "--format", "csv"])
+        finally:
+            tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH = original_paths
+        summary = pd.read_csv(os.path.join(tmp, "summary_ratings.csv"))
+    assert "Loaded 1 of 1 evaluations" in output.getvalue()
+    assert summary["Idea ID"].tolist() == ["T1"]
+
+
+def test_report_without_checkpoint_fails():
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            cli.main(["report", "--input", DOCUMENT, "--checkpoint-dir", tmp])
+            raise AssertionError("expected SystemExit")
+        except SystemExit as e:
+            assert "no checkpoint" in str(e)
+
+
+def main():
+    """Run the CLI tests."""
+    print("Testing command-line entry point...")
+    test_imports_do_not_load_provider_sdks()
+    test_parse_lists_ideas()
+    test_evaluate_options_are_forwarded()
+    test_choices_match_lazily_loaded_modules()
+    test_report_rebuilds_tables_from_checkpoint()
+    test_report_reads_the_run_inputs_by_default()
+    test_report_without_checkpoint_fails()
+    print("\nAll CLI tests passed!")
+
+if __name__ == "__main__":
+    main()
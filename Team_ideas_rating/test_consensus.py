@@ -0,0 +1,119 @@
+"""
+Test script for adaptive model sampling.
+
+This script checks the consensus rule, the cost-based model order, and that
+the evaluation engine in adaptive mode stops querying LLMs once they agree,
+escalates contested or failed ideas, and records which LLMs scored each idea.
+"""
+
+import tempfile
+
+from consensus import has_consensus, next_models, order_models_by_cost
+from document_parser import Idea
+from idea_evaluator import EvaluationEngine, create_evaluation_prompt, generate_tables
+from mock_provider import MockRubricLLM, setup_mock_llms
+from result_sink import StreamingResultSink
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS
+from run_checkpoint import RunCheckpoint
+
+IDEAS = [Idea(f"A{i}", f"Adaptive idea {i}", "Description") for i in range(30)]
+
+
+def rubric(score, skip=()):
+    return {dim: {"score": score, "remark": dim} for dim in RUBRIC_DIMENSIONS if dim not in skip}
+
+
+def test_model_order_prefers_cheaper_models():
+    assert order_models_by_cost(["GPT-4", "Local", "Gemini-1.5-Flash", "LLaMA-3-70B"]) == \
+        ["Gemini-1.5-Flash", "LLaMA-3-70B", "GPT-4", "Local"]
+    assert order_models_by_cost(["B", "A"], prices={}) == ["B", "A"]
+
+
+def test_consensus_rule():
+    order = ["M1", "M2", "M3", "M4"]
+    assert next_models(order, {}) == ["M1", "M2"]
+    assert not has_consensus({"M1": rubric(5)})
+    assert has_consensus({"M1": rubric(5), "M2": rubric(6)})
+    assert next_models(order, {"M1": rubric(5), "M2": rubric(6)}) == []
+    assert next_models(order, {"M1": rubric(5), "M2": rubric(7)}) == ["M3"]
+    # Failed evaluations and missing dimensions do not count towards consensus
+    assert next_models(order, {"M1": rubric(5), "M2": {"error": "timeout"}}) == ["M3"]
+    assert next_models(order, {"M1": rubric(5), "M2": rubric(5, skip=["novelty"])}) == ["M3"]
+    assert next_models(order, {name: rubric(i * 3) for i, name in enumerate(order)}) == []
+    assert next_models(order, {}, min_models=3) == ["M1", "M2", "M3"]
+
+
+def test_adaptive_engine_stops_on_consensus():
+    llms = setup_mock_llms(4, agreement_rate=0.6)
+    full = EvaluationEngine(llms, create_evaluation_prompt()).evaluate(IDEAS)
+    engine = EvaluationEngine(llms, create_evaluation_prompt(), adaptive=True)
+    results = engine.evaluate(IDEAS)
+
+    assert engine.queried_pairs == sum(len(idea_results) for idea_results in results.values())
+    assert engine.queried_pairs < len(IDEAS) * len(llms)
+    assert 0 < len(engine.escalated_ideas) < len(IDEAS)
+    for idea in IDEAS:
+        idea_results = results[idea.id]
+        # Cheapest (here: configured) order, stopping at consensus or when every LLM was asked
+        assert list(idea_results) == list(llms)[:len(idea_results)]
+        assert has_consensus(idea_results) or len(idea_results) == len(llms)
+        assert (len(idea_results) > 2) == (idea.id in engine.escalated_ideas)
+        assert all(idea_results[name] == full[idea.id][name] for name in idea_results)
+
+
+def test_adaptive_resume_from_checkpoint():
+    llms = setup_mock_llms(4, agreement_rate=0.6)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        first = EvaluationEngine(llms, create_evaluation_prompt(), checkpoint=checkpoint, adaptive=True)
+        results = first.evaluate(IDEAS)
+        checkpoint.close()
+
+        checkpoint = RunCheckpoint(tmp)
+        resumed = EvaluationEngine(llms, create_evaluation_prompt(), checkpoint=checkpoint, adaptive=True)
+        assert resumed.evaluate(IDEAS) == results
+        assert resumed.queried_pairs == 0
+        checkpoint.close()
+
+
+def test_failed_models_are_replaced():
+    llms = {"Broken": MockRubricLLM(timeout_rate=1.0), **setup_mock_llms(2, agreement_rate=1.0)}
+    results = EvaluationEngine(llms, create_evaluation_prompt(), adaptive=True).evaluate(IDEAS[:5])
+    for idea_results in results.values():
+        assert "error" in idea_results["Broken"]
+        assert set(idea_results) == {"Broken", "Mock-LLM-1", "Mock-LLM-2"}
+
+
+def test_tables_record_contributing_models():
+    llms = setup_mock_llms(4, agreement_rate=0.6)
+    results = EvaluationEngine(llms, create_evaluation_prompt(), adaptive=True).evaluate(IDEAS)
+    _, summary = generate_tables(results, IDEAS, include_models=True)
+    models = summary.set_index("Idea ID")["Models"]
+    for idea in IDEAS:
+        assert models[idea.id] == ", ".join(results[idea.id])
+
+    _, plain = generate_tables(results, IDEAS)
+    assert "Models" not in plain.columns
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = StreamingResultSink(IDEAS, RUBRIC_DIMENSIONS, DIMENSION_LABELS, {"jsonl": f"{tmp}/detailed.jsonl"})
+        for idea in IDEAS:
+            for llm_name, evaluation in results[idea.id].items():
+                sink.add(idea, llm_name, evaluation)
+        sink.close()
+    assert [", ".join(names) for names in sink.models] == [", ".join(results[idea.id]) for idea in IDEAS]
+
+
+def main():
+    """Run the adaptive sampling tests."""
+    print("Testing adaptive sampling...")
+    test_model_order_prefers_cheaper_models()
+    test_consensus_rule()
+    test_adaptive_engine_stops_on_consensus()
+    test_adaptive_resume_from_checkpoint()
+    test_failed_models_are_replaced()
+    test_tables_record_contributing_models()
+    print("\nAll adaptive sampling tests passed!")
+
+if __name__ == "__main__":
+    main()
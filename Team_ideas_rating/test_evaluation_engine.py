@@ -0,0 +1,173 @@
+"""
+Test script for the concurrent evaluation engine.
+
+This script checks that EvaluationEngine respects its concurrency limits and
+produces the same results as evaluating ideas one at a time, without requiring
+API keys for LLMs.
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from langchain.llms.base import LLM
+
+from idea_evaluator import EvaluationEngine, Idea, create_evaluation_prompt, evaluate_idea, generate_tables
+
+DIMENSIONS = ["novelty", "technical_complexity", "impact_potential", "market_viability",
+              "feasibility", "user_desirability", "trend_alignment"]
+
+
+class ConcurrencyTracker:
+    """Track how many fake LLM calls are in flight at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.total_active = 0
+        self.total_peak = 0
+
+    def enter(self, name: str) -> None:
+        with self.lock:
+            self.active[name] = self.active.get(name, 0) + 1
+            self.peak[name] = max(self.peak.get(name, 0), self.active[name])
+            self.total_active += 1
+            self.total_peak = max(self.total_peak, self.total_active)
+
+    def leave(self, name: str) -> None:
+        with self.lock:
+            self.active[name] -= 1
+            self.total_active -= 1
+
+
+class SlowFakeLLM(LLM):
+    """Fake LLM that sleeps briefly and returns a deterministic rubric."""
+
+    name: str
+    offset: int = 0
+    delay: float = 0.02
+    tracker: Any = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        if self.tracker:
+            self.tracker.enter(self.name)
+        try:
+            time.sleep(self.delay)
+        finally:
+            if self.tracker:
+                self.tracker.leave(self.name)
+
+        idea_number = int(prompt.split("IDEA ID: I")[1].split()[0])
+        return json.dumps({
+            dim: {"score": (idea_number + self.offset + i) % 10 + 1, "remark": f"{self.name} on {dim}"}
+            for i, dim in enumerate(DIMENSIONS)
+        })
+
+
+class BatchFakeLLM(LLM):
+    """Fake LLM that answers batch prompts with a JSON array, skipping some ideas."""
+
+    skip: List[str] = []
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "batch-fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        self.prompts.append(prompt)
+        idea_ids = re.findall(r"IDEA ID: (\S+)", prompt)
+        rubric = {dim: {"score": 5, "remark": "ok"} for dim in DIMENSIONS}
+        if len(idea_ids) == 1 and "JSON array" not in prompt:
+            return json.dumps(rubric)
+        return json.dumps([dict(rubric, idea_id=idea_id) for idea_id in idea_ids if idea_id not in self.skip])
+
+
+def make_ideas(count: int) -> List[Idea]:
+    return [Idea(f"I{i}", f"Idea {i}", f"Description of idea {i}") for i in range(count)]
+
+
+def make_llms(tracker: Optional[ConcurrencyTracker] = None, delay: float = 0.02):
+    return {
+        name: SlowFakeLLM(name=name, offset=offset, delay=delay, tracker=tracker)
+        for offset, name in enumerate(["Fake-A", "Fake-B", "Fake-C"])
+    }
+
+
+def test_engine_matches_serial_evaluation():
+    ideas = make_ideas(6)
+    llms = make_llms(delay=0)
+    prompt_template = create_evaluation_prompt()
+
+    serial = {idea.id: evaluate_idea(idea, llms, prompt_template) for idea in ideas}
+    concurrent = EvaluationEngine(llms, prompt_template, max_concurrency=4).evaluate(ideas)
+
+    assert concurrent == serial
+    assert list(concurrent) == list(serial)
+    for idea_id in serial:
+        assert list(concurrent[idea_id]) == list(serial[idea_id])
+
+    serial_detailed, serial_summary = generate_tables(serial, ideas)
+    detailed, summary = generate_tables(concurrent, ideas)
+    assert detailed.equals(serial_detailed)
+    assert summary.equals(serial_summary)
+
+
+def test_engine_respects_concurrency_limits():
+    tracker = ConcurrencyTracker()
+    ideas = make_ideas(12)
+    llms = make_llms(tracker)
+
+    engine = EvaluationEngine(llms, create_evaluation_prompt(), max_concurrency=4,
+                              provider_concurrency={"Fake-A": 1, "Fake-B": 2})
+    results = engine.evaluate(ideas)
+
+    assert len(results) == len(ideas)
+    assert tracker.peak["Fake-A"] == 1
+    assert tracker.peak["Fake-B"] <= 2
+    assert tracker.total_peak <= 4
+    # Requests to different providers should overlap
+    assert tracker.total_peak > 1
+
+
+def test_batch_mode_packs_ideas_and_falls_back():
+    ideas = make_ideas(7)
+    llm = BatchFakeLLM(skip=["I2"], prompts=[])
+    engine = EvaluationEngine({"Fake": llm}, create_evaluation_prompt(), batch_size=3)
+    results = engine.evaluate(ideas)
+
+    # Three batches of at most three ideas, plus one single-idea fallback for I2
+    batch_prompts = [prompt for prompt in llm.prompts if "JSON array" in prompt]
+    assert len(batch_prompts) == 3
+    assert len(llm.prompts) == 4
+    assert list(results) == [idea.id for idea in ideas]
+    assert all(results[idea.id]["Fake"]["novelty"]["score"] == 5 for idea in ideas)
+
+
+def test_engine_rejects_invalid_limits():
+    for kwargs in ({"max_concurrency": 0}, {"provider_concurrency": {"Fake-A": 0}}, {"batch_size": 0}):
+        try:
+            EvaluationEngine(make_llms(), create_evaluation_prompt(), **kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"Expected ValueError for {kwargs}")
+
+
+def main():
+    """Run the evaluation engine tests."""
+    print("Testing concurrent evaluation engine...")
+    test_engine_matches_serial_evaluation()
+    test_engine_respects_concurrency_limits()
+    test_batch_mode_packs_ideas_and_falls_back()
+    test_engine_rejects_invalid_limits()
+    print("\nAll evaluation engine tests passed!")
+
+if __name__ == "__main__":
+    main()
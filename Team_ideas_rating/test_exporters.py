@@ -0,0 +1,99 @@
+"""
+Test script for the table exporters.
+
+This script checks that the rating tables round-trip through every export
+format and that the Excel row cap applies only to Excel output.
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+import tables
+from exporters import export_csv, export_excel, export_jsonl, export_parquet
+from document_parser import Idea
+from tables import export_tables, generate_tables
+
+# Parquet support is optional
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def make_tables():
+    ideas = [Idea(f"I{i}", f"Idea {i}", f"Description of idea {i}") for i in range(3)]
+    evaluations = {
+        idea.id: {
+            llm: {"novelty": {"score": i + 2, "remark": f"Ünïcode remark from {llm}"},
+                  "feasibility": {"score": 7, "remark": "Doable"}}
+            for llm in ("Fake-A", "Fake-B")
+        }
+        for i, idea in enumerate(ideas)
+    }
+    return generate_tables(evaluations, ideas)
+
+
+def test_columnar_formats_round_trip():
+    detailed, _ = make_tables()
+    with tempfile.TemporaryDirectory() as tmp:
+        if HAS_PYARROW:
+            import pyarrow.parquet as pq
+            parquet_path = os.path.join(tmp, "detailed.parquet")
+            export_parquet(detailed, parquet_path)
+            schema = pq.read_schema(parquet_path)
+            assert str(schema.field("LLM").type).startswith("dictionary")
+            assert str(schema.field("Dimension").type).startswith("dictionary")
+            restored = pd.read_parquet(parquet_path)
+            restored = restored.astype({col: object for col in ("Idea ID", "Idea Title", "LLM", "Dimension")})
+            pd.testing.assert_frame_equal(restored, detailed, check_dtype=False)
+
+        csv_path = os.path.join(tmp, "detailed.csv")
+        export_csv(detailed, csv_path)
+        assert pd.read_csv(csv_path, encoding="utf-8")["Remark"].tolist() == detailed["Remark"].tolist()
+
+        jsonl_path = os.path.join(tmp, "detailed.jsonl")
+        export_jsonl(detailed, jsonl_path)
+        with open(jsonl_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == len(detailed)
+        assert records[0]["Remark"] == detailed["Remark"].iloc[0]
+
+
+def test_excel_row_cap():
+    detailed, _ = make_tables()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "detailed.xlsx")
+        export_excel(detailed, path, max_rows=4)
+        assert len(pd.read_excel(path)) == 4
+
+
+def test_export_tables_writes_each_format():
+    detailed, summary = make_tables()
+    with tempfile.TemporaryDirectory() as tmp:
+        old_paths = tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH
+        tables.OUTPUT_DETAILED_PATH = os.path.join(tmp, "detailed_ratings.xlsx")
+        tables.OUTPUT_SUMMARY_PATH = os.path.join(tmp, "summary_ratings.xlsx")
+        try:
+            export_tables(detailed, summary, ["xlsx", "csv"] + (["parquet"] if HAS_PYARROW else []),
+                          excel_max_rows=2)
+        finally:
+            tables.OUTPUT_DETAILED_PATH, tables.OUTPUT_SUMMARY_PATH = old_paths
+
+        assert len(pd.read_excel(os.path.join(tmp, "detailed_ratings.xlsx"))) == 2
+        assert len(pd.read_csv(os.path.join(tmp, "detailed_ratings.csv"))) == len(detailed)
+        assert len(pd.read_csv(os.path.join(tmp, "summary_ratings.csv"))) == len(summary)
+        if HAS_PYARROW:
+            assert len(pd.read_parquet(os.path.join(tmp, "detailed_ratings.parquet"))) == len(detailed)
+
+
+def main():
+    """Run the exporter tests."""
+    print("Testing table exporters...")
+    test_columnar_formats_round_trip()
+    test_excel_row_cap()
+    test_export_tables_writes_each_format()
+    print("\nAll exporter tests passed!")
+
+if __name__ == "__main__":
+    main()
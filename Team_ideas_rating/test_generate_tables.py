@@ -0,0 +1,66 @@
+"""
+Test script for table generation.
+
+This script checks the detailed and summary tables produced by
+generate_tables(), including failed evaluations, missing dimensions and
+rounding, without requiring API keys for LLMs.
+"""
+
+from idea_evaluator import RUBRIC_DIMENSIONS, Idea, generate_tables
+
+
+def rubric(score, skip=()):
+    return {dim: {"score": score, "remark": f"{dim} remark"} for dim in RUBRIC_DIMENSIONS if dim not in skip}
+
+
+def test_tables_skip_errors_and_missing_dimensions():
+    ideas = [Idea("A", "Alpha", "First"), Idea("B", "Beta", "Second"), Idea("C", "Gamma", "No results")]
+    all_evaluations = {
+        "A": {"GPT": rubric(8), "Gemini": rubric(6, skip=["novelty"]), "Groq": {"error": "429"}},
+        "B": {"GPT": rubric(9), "Gemini": rubric(9)},
+    }
+    detailed, summary = generate_tables(all_evaluations, ideas)
+
+    assert list(detailed.columns) == ["Idea ID", "Idea Title", "LLM", "Dimension", "Score", "Remark"]
+    assert len(detailed) == 7 + 6 + 7 + 7
+    assert detailed.iloc[7].to_dict() == {
+        "Idea ID": "A", "Idea Title": "Alpha", "LLM": "Gemini", "Dimension": "Technical Complexity",
+        "Score": 6, "Remark": "technical_complexity remark"
+    }
+    assert "Groq" not in set(detailed["LLM"])
+
+    assert list(summary["Idea ID"]) == ["B", "A", "C"]
+    row = summary.set_index("Idea ID").loc["A"]
+    assert row["Novelty"] == 8.0
+    assert row["Feasibility"] == 7.0
+    assert row["Average Rating"] == 7.1
+    assert summary.set_index("Idea ID").loc["C", "Average Rating"] == 0.0
+
+
+def test_rounding_matches_python_round():
+    # 3 / 20 = 0.15 is stored just below 0.15, so Python rounds it down to 0.1
+    ideas = [Idea("A", "Alpha", "First")]
+    all_evaluations = {"A": {f"M{i}": rubric(1 if i < 3 else 0) for i in range(20)}}
+    _, summary = generate_tables(all_evaluations, ideas)
+
+    assert summary.iloc[0]["Novelty"] == round(3 / 20, 1) == 0.1
+    assert summary.iloc[0]["Average Rating"] == round(0.1 * 7 / 7, 1)
+
+
+def test_empty_results():
+    detailed, summary = generate_tables({}, [])
+    assert detailed.empty
+    assert summary.empty
+    assert "Average Rating" in summary.columns
+
+
+def main():
+    """Run the table generation tests."""
+    print("Testing table generation...")
+    test_tables_skip_errors_and_missing_dimensions()
+    test_rounding_matches_python_round()
+    test_empty_results()
+    print("\nAll table generation tests passed!")
+
+if __name__ == "__main__":
+    main()
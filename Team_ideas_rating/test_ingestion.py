@@ -0,0 +1,115 @@
+"""
+Test script for multi-document ingestion.
+
+This script checks that ideas are read from Word, Markdown, plain-text and
+CSV files, that directories and glob patterns are expanded, that duplicate
+ideas are merged, and that parallel parsing gives the same result as serial
+parsing.
+"""
+
+import os
+import shutil
+import tempfile
+
+from document_parser import Idea, extract_ideas_from_doc
+from ingestion import expand_inputs, ingest_ideas, merge_ideas, read_csv, read_markdown, read_text
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DOCUMENT = os.path.join(HERE, "team_ideas.docx")
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def test_text_and_markdown_readers():
+    with tempfile.TemporaryDirectory() as tmp:
+        text = write(os.path.join(tmp, "ideas.txt"),
+                     "Idea ID: T1\nProject Title: Plain idea\nFirst line\nSecond line\n"
+                     "Idea ID: T2\nProject Title: Another\nMore text\n")
+        markdown = write(os.path.join(tmp, "ideas.md"),
+                         "# Quarterly ideas\n\n## Idea ID: M1\n**Project Title:** Markdown idea\n\n"
+                         "Uses **bold** text.\n")
+        ideas = read_text(text)
+        assert [(idea.id, idea.title) for idea in ideas] == [("T1", "Plain idea"), ("T2", "Another")]
+        assert ideas[0].description == "First line\nSecond line"
+
+        ideas = read_markdown(markdown)
+        assert [(idea.id, idea.title) for idea in ideas] == [("M1", "Markdown idea")]
+        assert ideas[0].description == "Uses bold text."
+
+
+def test_csv_reader():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write(os.path.join(tmp, "ideas.csv"),
+                     "Idea ID,Project Title,Description\nC1,CSV idea,\"Multi-line\ndescription\"\n,,skipped\n"
+                     "C2,,No title\n")
+        ideas = read_csv(path)
+        assert [(idea.id, idea.title) for idea in ideas] == [("C1", "CSV idea"), ("C2", "Untitled")]
+        assert ideas[0].description == "Multi-line\ndescription"
+
+        bad = write(os.path.join(tmp, "bad.csv"), "name,text\nfoo,bar\n")
+        try:
+            read_csv(bad)
+            raise AssertionError("expected ValueError")
+        except ValueError as e:
+            assert "ID column" in str(e)
+
+
+def test_expand_inputs():
+    with tempfile.TemporaryDirectory() as tmp:
+        write(os.path.join(tmp, "q1", "b.md"), "")
+        write(os.path.join(tmp, "q1", "a.txt"), "")
+        write(os.path.join(tmp, "q1", "notes.pdf"), "")
+        write(os.path.join(tmp, "q1", "~$lock.docx"), "")
+        write(os.path.join(tmp, "q2", "c.csv"), "")
+
+        paths = expand_inputs([os.path.join(tmp, "q1"), os.path.join(tmp, "**", "*.csv"),
+                               os.path.join(tmp, "q1", "a.txt")])
+        assert [os.path.relpath(path, tmp) for path in paths] == [os.path.join("q1", "a.txt"),
+                                                                   os.path.join("q1", "b.md"),
+                                                                   os.path.join("q2", "c.csv")]
+        try:
+            expand_inputs([os.path.join(tmp, "missing.docx")])
+            raise AssertionError("expected FileNotFoundError")
+        except FileNotFoundError:
+            pass
+
+
+def test_merge_ideas():
+    first = [Idea("A1", "Idea", "Text"), Idea("A2", "Other", "Text")]
+    second = [Idea("A1", "Idea", "Text"), Idea("A2", "Different", "Text"), Idea("A2", "Third", "Text")]
+    merged = merge_ideas([("first.md", first), ("second.md", second)])
+    assert [(idea.id, idea.title) for idea in merged] == [("A1", "Idea"), ("A2", "Other"),
+                                                          ("A2-2", "Different"), ("A2-3", "Third")]
+
+
+def test_parallel_ingestion_matches_serial():
+    with tempfile.TemporaryDirectory() as tmp:
+        for quarter in range(3):
+            shutil.copy(DOCUMENT, os.path.join(tmp, f"team_{quarter}.docx"))
+            write(os.path.join(tmp, f"extra_{quarter}.txt"),
+                  f"Idea ID: X{quarter}\nProject Title: Extra idea {quarter}\nDescription\n")
+
+        serial = ingest_ideas([tmp], workers=1)
+        parallel = ingest_ideas([tmp], workers=3)
+    assert [idea.content_hash() for idea in serial] == [idea.content_hash() for idea in parallel]
+    # The three copies of the Word document collapse into one set of ideas
+    assert len(serial) == len(extract_ideas_from_doc(DOCUMENT)) + 3
+
+
+def main():
+    """Run the ingestion tests."""
+    print("Testing ingestion...")
+    test_text_and_markdown_readers()
+    test_csv_reader()
+    test_expand_inputs()
+    test_merge_ideas()
+    test_parallel_ingestion_matches_serial()
+    print("\nAll ingestion tests passed!")
+
+if __name__ == "__main__":
+    main()
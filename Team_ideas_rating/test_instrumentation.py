@@ -0,0 +1,186 @@
+"""
+Test script for LLM call instrumentation.
+
+This script checks that latency, queue wait, token usage, retries, errors and
+cost are recorded for each LLM request and written to the run report, using a
+local mock of the chat completions API and fake LLMs instead of API keys.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain.chat_models.base import BaseChatModel
+from langchain.llms.base import LLM
+from langchain.schema import AIMessage, ChatGeneration, ChatResult, LLMResult
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from idea_evaluator import RUBRIC_DIMENSIONS, EvaluationEngine, Idea, create_evaluation_prompt, evaluate_idea_with_llm
+from instrumentation import MODEL_PRICES, CallRecord, RunMetrics, UsageCallback, percentiles, track_call
+from rate_limiter import ProviderRateLimiter
+from streaming import StreamMetrics, stream_completion
+from test_perplexity_llm import make_llm, start_server
+from test_rate_limiter import FakeAPIError
+
+RUBRIC = json.dumps({dim: {"score": 5, "remark": "Fine"} for dim in RUBRIC_DIMENSIONS})
+
+
+class SlowLLM(LLM):
+    """Fake LLM that answers with a rubric after a delay, failing the first few calls."""
+
+    delay: float = 0.02
+    failures: List[Any] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "slow-fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        time.sleep(self.delay)
+        if self.failures:
+            raise self.failures.pop(0)
+        return RUBRIC
+
+
+class RunningTotalChatModel(BaseChatModel):
+    """Fake chat model that streams words with running usage totals on every chunk, as Gemini does."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "running-total-fake"
+
+    def _generate(self, messages: Any, stop: Optional[List[str]] = None, run_manager: Any = None,
+                  **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="four words of text"))])
+
+    def _stream(self, messages: Any, stop: Optional[List[str]] = None, run_manager: Any = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for count, word in enumerate(["four ", "words ", "of ", "text"], 1):
+            usage = {"input_tokens": 11, "output_tokens": count, "total_tokens": 11 + count}
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word, usage_metadata=usage))
+
+
+def test_perplexity_usage_and_cost():
+    metrics = RunMetrics()
+    server = start_server()
+    try:
+        evaluate_idea_with_llm(Idea("A", "Idea A", "First"), "Perplexity-Sonar", make_llm(server),
+                               create_evaluation_prompt(), run_metrics=metrics)
+    finally:
+        server.shutdown()
+
+    [call] = metrics.calls
+    assert (call.kind, call.input_tokens, call.output_tokens, call.error) == ("evaluate", 5, 3, None)
+    assert call.wall_time > 0
+    input_price, output_price = MODEL_PRICES["Perplexity-Sonar"]
+    assert call.cost == (5 * input_price + 3 * output_price) / 1_000_000
+
+
+def test_streamed_usage_is_recorded():
+    metrics = RunMetrics()
+    server = start_server()
+    try:
+        evaluate_idea_with_llm(Idea("A", "Idea A", "First"), "Perplexity-Sonar", make_llm(server),
+                               create_evaluation_prompt(), stream_metrics=StreamMetrics(), run_metrics=metrics)
+        # OpenAI-compatible APIs only report usage for a stream when asked to
+        assert server.RequestHandlerClass.requests[-1]["stream_options"] == {"include_usage": True}
+    finally:
+        server.shutdown()
+    [call] = metrics.calls
+    assert (call.input_tokens, call.output_tokens) == (5, 3)
+
+    # Running totals are counted once, from the last chunk
+    with track_call(None, "Gemini-1.5-Flash", "evaluate") as call:
+        text, _ = stream_completion(RunningTotalChatModel(), "prompt")
+    assert text == "four words of text"
+    assert (call.input_tokens, call.output_tokens) == (11, 4)
+
+
+def test_retries_and_errors_are_recorded():
+    metrics = RunMetrics()
+    limiter = ProviderRateLimiter("Slow", base_delay=0.01, max_attempts=3)
+    llm = SlowLLM(failures=[FakeAPIError(503)])
+    evaluate_idea_with_llm(Idea("A", "Idea A", "First"), "Slow", llm, create_evaluation_prompt(),
+                           rate_limiter=limiter, run_metrics=metrics)
+    llm.failures = [FakeAPIError(400)]
+    evaluation = evaluate_idea_with_llm(Idea("B", "Idea B", "Second"), "Slow", llm, create_evaluation_prompt(),
+                                        rate_limiter=limiter, run_metrics=metrics)
+    assert "error" in evaluation
+
+    row = metrics.summary()["Slow"]
+    assert row["calls"] == 2
+    assert row["retries"] == 1
+    assert row["errors"] == {"FakeAPIError": 1}
+    # No usage is reported by this LLM, so tokens are estimated and there is no price
+    assert row["tokens_estimated"] and row["input_tokens"] > 0 and row["output_tokens"] > 0
+    assert row["cost_usd"] is None
+
+
+def test_usage_callback_reads_chat_model_usage():
+    call = CallRecord("GPT-4", "evaluate")
+    UsageCallback(call).on_llm_end(LLMResult(generations=[[ChatGeneration(message=AIMessage(content="x"))]],
+                                             llm_output={"token_usage": {"prompt_tokens": 120,
+                                                                         "completion_tokens": 80}}))
+    message = AIMessage(content="x", usage_metadata={"input_tokens": 7, "output_tokens": 2, "total_tokens": 9})
+    UsageCallback(call).on_llm_end(LLMResult(generations=[[ChatGeneration(message=message)]]))
+    assert (call.input_tokens, call.output_tokens) == (127, 82)
+    assert not call.tokens_estimated
+
+
+def test_track_call_records_exceptions():
+    metrics = RunMetrics()
+    try:
+        with track_call(metrics, "Slow", "evaluate"):
+            raise TimeoutError("too slow")
+    except TimeoutError:
+        pass
+    assert metrics.calls[0].error == "TimeoutError"
+    assert percentiles([]) == {"p50": None, "p95": None, "p99": None}
+    assert percentiles([1.0, 2.0, 3.0, 4.0])["p50"] == 2.5
+
+
+def test_engine_writes_run_report():
+    ideas = [Idea(f"I{i}", f"Idea {i}", "Description") for i in range(4)]
+    metrics = RunMetrics()
+    EvaluationEngine({"Slow": SlowLLM(failures=[])}, create_evaluation_prompt(), max_concurrency=1,
+                     run_metrics=metrics).evaluate(ideas)
+
+    row = metrics.summary()["Slow"]
+    assert row["calls"] == 4
+    # With one request in flight at a time, later requests queue behind earlier ones
+    assert row["queue_wait_s"]["p99"] >= 0.02
+    assert row["latency_s"]["p50"] >= 0.02
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run_report.json")
+        metrics.write_report(path)
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        assert report["totals"]["calls"] == 4
+        assert report["providers"]["Slow"]["latency_s"]["p95"] >= 0.02
+        with open(os.path.join(tmp, "run_report.txt"), encoding="utf-8") as f:
+            table = f.read()
+        assert table.startswith("Model") and "Slow" in table
+
+        # A report path without an extension, in a directory whose name contains a dot
+        os.makedirs(os.path.join(tmp, "out.v2"))
+        metrics.write_report(os.path.join(tmp, "out.v2", "report"))
+        assert sorted(os.listdir(os.path.join(tmp, "out.v2"))) == ["report", "report.txt"]
+
+
+def main():
+    """Run the instrumentation tests."""
+    print("Testing LLM call instrumentation...")
+    test_perplexity_usage_and_cost()
+    test_streamed_usage_is_recorded()
+    test_retries_and_errors_are_recorded()
+    test_usage_callback_reads_chat_model_usage()
+    test_track_call_records_exceptions()
+    test_engine_writes_run_report()
+    print("\nAll instrumentation tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Test script for the offline mock provider.
+
+This script checks that the mock LLMs answer evaluation, batch and repair
+prompts with rubric JSON, and that malformed responses, rate-limit errors and
+timeouts are injected at the configured rates and handled by the evaluator.
+"""
+
+import time
+
+from idea_evaluator import (RUBRIC_DIMENSIONS, EvaluationEngine, Idea, create_batch_evaluation_prompt,
+                            create_evaluation_prompt, evaluate_idea_with_llm, format_batch_ideas,
+                            generate_tables)
+from mock_provider import MockRateLimitError, MockRubricLLM, MockTimeoutError, setup_mock_llms
+from rate_limiter import ProviderRateLimiter, get_retry_after, is_retryable
+from response_parser import parse_batch_response, parse_evaluation_response
+
+IDEAS = [Idea(f"M{i}", f"Mock idea {i}", "Description") for i in range(20)]
+
+
+def render(idea):
+    return create_evaluation_prompt().format(idea_id=idea.id, idea_title=idea.title,
+                                             idea_description=idea.description)
+
+
+def test_valid_responses_are_deterministic():
+    llm = MockRubricLLM(seed=3)
+    evaluation = parse_evaluation_response(llm.invoke(render(IDEAS[0])), "Mock")
+    assert all(dim in evaluation for dim in RUBRIC_DIMENSIONS)
+    assert evaluation == parse_evaluation_response(MockRubricLLM(seed=3).invoke(render(IDEAS[0])), "Mock")
+    assert evaluation != parse_evaluation_response(MockRubricLLM(seed=4).invoke(render(IDEAS[0])), "Mock")
+
+
+def test_batch_prompts_get_one_rubric_per_idea():
+    prompt = create_batch_evaluation_prompt().format(ideas=format_batch_ideas(IDEAS[:3]))
+    evaluations = parse_batch_response(MockRubricLLM().invoke(prompt), "Mock")
+    assert sorted(evaluations) == ["M0", "M1", "M2"]
+
+
+def test_malformed_responses_are_repaired():
+    llm = MockRubricLLM(malformed_rate=1.0)
+    broken = [parse_evaluation_response(llm.invoke(render(idea)), "Mock") for idea in IDEAS]
+    assert any("error" in evaluation or len(evaluation) < len(RUBRIC_DIMENSIONS) for evaluation in broken)
+
+    for idea in IDEAS:
+        evaluation = evaluate_idea_with_llm(idea, "Mock", llm, create_evaluation_prompt(), repair_attempts=1)
+        assert all(dim in evaluation for dim in RUBRIC_DIMENSIONS), idea.id
+
+
+def test_faults_are_retryable():
+    llm = MockRubricLLM(rate_limit_rate=1.0, retry_after=2)
+    try:
+        llm.invoke(render(IDEAS[0]))
+        raise AssertionError("expected a rate-limit error")
+    except MockRateLimitError as e:
+        assert is_retryable(e) and get_retry_after(e) == 2.0
+
+    llm = MockRubricLLM(timeout_rate=1.0)
+    try:
+        llm.invoke(render(IDEAS[0]))
+        raise AssertionError("expected a timeout")
+    except MockTimeoutError as e:
+        assert is_retryable(e)
+
+    # Faults are drawn per attempt, so retries of a flaky mock eventually succeed
+    llm = MockRubricLLM(rate_limit_rate=0.3, timeout_rate=0.2)
+    limiter = ProviderRateLimiter("Mock", base_delay=0.001, max_attempts=20)
+    for idea in IDEAS:
+        evaluation = evaluate_idea_with_llm(idea, "Mock", llm, create_evaluation_prompt(), rate_limiter=limiter)
+        assert "error" not in evaluation
+    assert limiter.retry_budget.spent > 0
+
+
+def test_latency_is_injected():
+    llm = MockRubricLLM(latency=0.05, latency_jitter=0.0)
+    start = time.perf_counter()
+    llm.invoke(render(IDEAS[0]))
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_engine_with_mock_llms_produces_full_tables():
+    llms = setup_mock_llms(3, malformed_rate=0.2)
+    results = EvaluationEngine(llms, create_evaluation_prompt(), repair_attempts=1).evaluate(IDEAS)
+    detailed_df, summary_df = generate_tables(results, IDEAS)
+    assert len(detailed_df) == len(IDEAS) * len(llms) * len(RUBRIC_DIMENSIONS)
+    assert summary_df["Average Rating"].between(1, 10).all()
+
+
+def main():
+    """Run the mock provider tests."""
+    print("Testing mock provider...")
+    test_valid_responses_are_deterministic()
+    test_batch_prompts_get_one_rubric_per_idea()
+    test_malformed_responses_are_repaired()
+    test_faults_are_retryable()
+    test_latency_is_injected()
+    test_engine_with_mock_llms_produces_full_tables()
+    print("\nAll mock provider tests passed!")
+
+if __name__ == "__main__":
+    main()
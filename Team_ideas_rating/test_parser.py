@@ -1,13 +1,13 @@
 """
 Test script for the idea parser functionality.
 
-This script tests the document parsing functionality of the idea_evaluator.py script
+This script tests the document parsing functionality of the document_parser.py module
 without requiring API keys for LLMs.
 """
 
 import os
 import sys
-from idea_evaluator import extract_ideas_from_doc, Idea
+from document_parser import extract_ideas_from_doc, iter_ideas_from_lines, Idea
 
 def main():
     """Test the idea parser functionality."""
@@ -45,6 +45,31 @@ def main():
         print(f"Error extracting ideas: {str(e)}")
         import traceback
         traceback.print_exc()
+    
+    test_parses_any_idea_id()
+    print("\nArbitrary idea IDs were parsed correctly!")
+
+def test_parses_any_idea_id():
+    """Ideas with IDs outside the sample document are parsed, in order and lazily."""
+    lines = [
+        "Heading before the first idea",
+        "Idea ID: A12",
+        "Project Title: First idea",
+        "Line one",
+        "Line two Idea ID: team-7.3",
+        "Project Title: Second idea",
+        "Idea ID: Z1",
+    ]
+    ideas = iter_ideas_from_lines(lines)
+    
+    first = next(ideas)
+    assert (first.id, first.title, first.description) == ("A12", "First idea", "Line one\nLine two")
+    
+    rest = list(ideas)
+    assert [(idea.id, idea.title, idea.description) for idea in rest] == [
+        ("team-7.3", "Second idea", ""),
+        ("Z1", "Untitled", "Idea ID: Z1"),
+    ]
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
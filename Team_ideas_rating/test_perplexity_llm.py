@@ -0,0 +1,143 @@
+"""
+Test script for the Perplexity LLM wrapper.
+
+This script runs PerplexityLLM against a local mock of the chat completions
+API to check connection reuse, async calls and streaming, without requiring
+a Perplexity API key.
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from perplexity_llm import PerplexityLLM
+
+
+class MockChatCompletionsHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible /chat/completions endpoint with keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    requests = []
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.lock:
+            type(self).connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            type(self).requests.append(body)
+        prompt = body["messages"][-1]["content"]
+        reply = f"echo: {prompt}"
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for word in reply.split(" "):
+                self._write_chunk(self._event({"content": word + " "}))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                usage = {"id": "cmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "sonar",
+                         "choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}}
+                self._write_chunk(f"data: {json.dumps(usage)}\n\n".encode())
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+            return
+
+        payload = json.dumps({
+            "id": "cmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": reply}}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _event(self, delta):
+        event = {"id": "cmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "sonar",
+                 "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+        return f"data: {json.dumps(event)}\n\n".encode()
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_server():
+    MockChatCompletionsHandler.connections = 0
+    MockChatCompletionsHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockChatCompletionsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_llm(server, **kwargs):
+    return PerplexityLLM(api_key="test-key", base_url=f"http://127.0.0.1:{server.server_port}", **kwargs)
+
+
+def test_sync_calls_reuse_one_connection():
+    server = start_server()
+    try:
+        llm = make_llm(server)
+        for i in range(5):
+            assert llm.invoke(f"prompt {i}") == f"echo: prompt {i}"
+        # A second wrapper with the same settings shares the pooled client
+        assert make_llm(server).invoke("again") == "echo: again"
+        assert MockChatCompletionsHandler.connections == 1
+        assert MockChatCompletionsHandler.requests[0]["max_tokens"] == llm.max_tokens
+    finally:
+        server.shutdown()
+
+
+def test_async_calls_share_the_pool():
+    server = start_server()
+    try:
+        llm = make_llm(server, max_connections=2, max_keepalive_connections=2)
+
+        async def run():
+            return await asyncio.gather(*(llm.ainvoke(f"prompt {i}") for i in range(6)))
+
+        assert asyncio.run(run()) == [f"echo: prompt {i}" for i in range(6)]
+        assert MockChatCompletionsHandler.connections <= 2
+    finally:
+        server.shutdown()
+
+
+def test_streaming():
+    server = start_server()
+    try:
+        llm = make_llm(server)
+        chunks = list(llm.stream("hello world"))
+        assert len(chunks) > 1
+        assert "".join(chunks).strip() == "echo: hello world"
+        assert MockChatCompletionsHandler.requests[-1]["stream"] is True
+
+        async def run():
+            return [chunk async for chunk in llm.astream("async hello")]
+
+        assert "".join(asyncio.run(run())).strip() == "echo: async hello"
+    finally:
+        server.shutdown()
+
+
+def main():
+    """Run the Perplexity LLM tests."""
+    print("Testing Perplexity LLM wrapper...")
+    test_sync_calls_reuse_one_connection()
+    test_async_calls_share_the_pool()
+    test_streaming()
+    print("\nAll Perplexity LLM tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Test script for the provider rate limiter.
+
+This script checks token buckets, retry classification, Retry-After handling
+and the shared retry budget without requiring API keys for LLMs.
+"""
+
+import time
+
+from rate_limiter import ProviderRateLimiter, RetryBudget, TokenBucket, get_retry_after, is_retryable
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeAPIError(Exception):
+    """Mimics the status/response attributes of the provider SDK errors."""
+
+    def __init__(self, status_code: int, headers=None):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = FakeResponse(status_code, headers)
+
+
+def flaky(failures, result="ok"):
+    """Return a callable that raises the given errors in turn, then succeeds."""
+    calls = []
+
+    def fn():
+        calls.append(time.monotonic())
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(per_minute=600, capacity=1)
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # One token is available up front, the other three refill at 10 per second
+    assert 0.25 <= time.monotonic() - start < 1.0
+
+    bucket.throttle()
+    assert bucket.rate == bucket.max_rate / 2
+    for _ in range(10):
+        bucket.recover()
+    assert bucket.rate == bucket.max_rate
+
+
+def test_error_classification():
+    assert is_retryable(FakeAPIError(429))
+    assert is_retryable(FakeAPIError(503))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(FakeAPIError(400))
+    assert not is_retryable(ValueError("bad prompt"))
+
+    assert get_retry_after(FakeAPIError(429, {"retry-after": "3"})) == 3.0
+    assert get_retry_after(FakeAPIError(429, {"retry-after-ms": "250"})) == 0.25
+    assert get_retry_after(FakeAPIError(429, {"retry-after": "soon"})) is None
+    assert get_retry_after(FakeAPIError(429)) is None
+
+
+def test_retries_honour_retry_after():
+    limiter = ProviderRateLimiter("Fake", base_delay=0.001, max_delay=0.5)
+    fn, calls = flaky([FakeAPIError(429, {"retry-after": "0.2"}), FakeAPIError(500)])
+
+    assert limiter.call(fn) == "ok"
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.2
+    assert limiter.retry_budget.spent == 2
+
+    # A hint longer than max_delay fails the call instead of holding the worker
+    fn, calls = flaky([FakeAPIError(429, {"retry-after": "3600"})])
+    try:
+        limiter.call(fn)
+    except FakeAPIError:
+        pass
+    else:
+        raise AssertionError("Expected FakeAPIError")
+    assert len(calls) == 1 and limiter.retry_budget.spent == 2
+    assert limiter.backoff_delay(1, 3600) == 0.5
+
+
+def test_non_retryable_errors_are_raised_immediately():
+    limiter = ProviderRateLimiter("Fake", base_delay=0.001)
+    fn, calls = flaky([FakeAPIError(401)])
+    try:
+        limiter.call(fn)
+    except FakeAPIError:
+        pass
+    else:
+        raise AssertionError("Expected FakeAPIError")
+    assert len(calls) == 1
+
+
+def test_retry_budget_is_shared_and_bounded():
+    budget = RetryBudget(max_retries=3)
+    first = ProviderRateLimiter("A", retry_budget=budget, base_delay=0.001, max_attempts=10)
+    second = ProviderRateLimiter("B", retry_budget=budget, base_delay=0.001, max_attempts=10)
+
+    fn, calls = flaky([FakeAPIError(429)] * 2)
+    assert first.call(fn) == "ok"
+
+    fn, calls = flaky([FakeAPIError(429)] * 5)
+    try:
+        second.call(fn)
+    except FakeAPIError:
+        pass
+    else:
+        raise AssertionError("Expected the retry budget to run out")
+    assert len(calls) == 2
+    assert budget.remaining == 0
+
+
+def main():
+    """Run the rate limiter tests."""
+    print("Testing rate limiter...")
+    test_token_bucket_paces_requests()
+    test_error_classification()
+    test_retries_honour_retry_after()
+    test_non_retryable_errors_are_raised_immediately()
+    test_retry_budget_is_shared_and_bounded()
+    print("\nAll rate limiter tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Test script for the response cache.
+
+This script checks cache keys, expiry, eviction and the cache integration in
+evaluate_idea_with_llm() without requiring API keys for LLMs.
+"""
+
+import os
+import tempfile
+import time
+
+from langchain.llms.fake import FakeListLLM
+
+from idea_evaluator import Idea, create_evaluation_prompt, evaluate_idea_with_llm
+from response_cache import ResponseCache, make_cache_key
+
+VALID_RESPONSE = '{"novelty": {"score": 7, "remark": "Fresh take"}}'
+
+
+def test_cache_key_depends_on_every_input():
+    base = make_cache_key("GPT-4", {"temperature": 0.2}, "prompt", "hash")
+    assert base == make_cache_key("GPT-4", {"temperature": 0.2}, "prompt", "hash")
+    assert base != make_cache_key("Gemini", {"temperature": 0.2}, "prompt", "hash")
+    assert base != make_cache_key("GPT-4", {"temperature": 0.7}, "prompt", "hash")
+    assert base != make_cache_key("GPT-4", {"temperature": 0.2}, "other prompt", "hash")
+    assert base != make_cache_key("GPT-4", {"temperature": 0.2}, "prompt", "other hash")
+    # A structured-output request does not reuse a free-form response, and vice versa
+    structured = make_cache_key("GPT-4", {"temperature": 0.2}, "prompt", "hash",
+                                {"response_format": {"type": "json_object"}})
+    assert structured not in (base, make_cache_key("GPT-4", {"temperature": 0.2}, "prompt", "hash",
+                                                   {"generation_config": {"response_mime_type": "application/json"}}))
+    assert base == make_cache_key("GPT-4", {"temperature": 0.2}, "prompt", "hash", {})
+
+
+def test_ttl_and_size_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"), ttl_seconds=60, max_bytes=10)
+        cache.put("a", "model", "12345")
+        cache.put("b", "model", "67890")
+        assert cache.get("a") == "12345"
+
+        # "b" is now the least recently used entry and is evicted first
+        cache.put("c", "model", "abcde")
+        assert cache.get("b") is None
+        assert cache.get("a") == "12345"
+        assert cache.get("c") == "abcde"
+
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        assert cache.get("a") is None
+        assert cache.clear() == 1
+        assert len(cache) == 0
+        cache.close()
+
+
+def test_evaluation_uses_cache():
+    idea = Idea("E1", "Title", "Description")
+    prompt_template = create_evaluation_prompt()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+
+        llm = FakeListLLM(responses=[VALID_RESPONSE, "not json at all"])
+        first = evaluate_idea_with_llm(idea, "Fake", llm, prompt_template, cache)
+        assert first["novelty"]["score"] == 7
+        assert len(cache) == 1
+
+        # The same request is answered from the cache without calling the LLM
+        assert evaluate_idea_with_llm(idea, "Fake", llm, prompt_template, cache) == first
+        assert llm.i == 1
+        assert cache.hits == 1
+
+        # Editing the idea misses the cache, and unparseable responses are not stored
+        edited = Idea("E1", "Title", "Edited description")
+        result = evaluate_idea_with_llm(edited, "Fake", llm, prompt_template, cache)
+        assert "error" in result
+        assert len(cache) == 1
+        cache.close()
+
+
+def main():
+    """Run the response cache tests."""
+    print("Testing response cache...")
+    test_cache_key_depends_on_every_input()
+    test_ttl_and_size_eviction()
+    test_evaluation_uses_cache()
+    print("\nAll response cache tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Test script for the response parser.
+
+This script runs the parser over a corpus of recorded well-formed and malformed
+LLM responses (fixtures/llm_responses.jsonl) and checks the extracted scores,
+without requiring API keys for LLMs.
+"""
+
+import json
+import os
+import time
+
+from response_parser import (coerce_score, iter_json_candidates, parse_batch_response,
+                             parse_evaluation_response, validate_evaluation)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "llm_responses.jsonl")
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def scores(evaluation):
+    return {dim: entry["score"] for dim, entry in evaluation.items() if dim != "overall_impression"}
+
+
+def test_corpus():
+    for case in load_corpus():
+        evaluation = parse_evaluation_response(case["response"], "Recorded")
+        if case["expected"] is None:
+            assert "error" in evaluation, case["name"]
+            assert evaluation["raw_response"] == case["response"]
+        else:
+            assert "error" not in evaluation, case["name"]
+            assert scores(evaluation) == case["expected"], case["name"]
+            assert all(isinstance(entry["remark"], str) and entry["remark"]
+                       for dim, entry in evaluation.items() if dim != "overall_impression"), case["name"]
+
+
+def test_remarks_survive_escapes_and_truncation():
+    response = '{"novelty": {"score": 8, "remark": "Uses \\"smart\\" {routing}"}, "feasibility": {"score": 9, "rem'
+    evaluation = parse_evaluation_response(response, "Recorded")
+    assert evaluation["novelty"] == {"score": 8, "remark": 'Uses "smart" {routing}'}
+    assert evaluation["feasibility"] == {"score": 9, "remark": "No remark provided"}
+
+
+def test_json_candidates_are_balanced():
+    text = 'prefix {"a": "}"} middle [1, {"b": [2]}] {"truncated": '
+    assert list(iter_json_candidates(text)) == ['{"a": "}"}', '{"b": [2]}']
+    assert list(iter_json_candidates(text, "{[")) == ['{"a": "}"}', '[1, {"b": [2]}]']
+    text = '{"a": "back\\\\"} {"b": "quote \\" }"} {"c": 1}'
+    assert list(iter_json_candidates(text)) == ['{"a": "back\\\\"}', '{"b": "quote \\" }"}', '{"c": 1}']
+
+
+def test_json_candidates_with_long_truncated_tail():
+    # A backtracking scan took seconds on a few kilobytes of unterminated output
+    text = '{"novelty": {"score": 8, "remark": "Done"}} {"feasibility": {"score": 7, "remark": "' + "word " * 40000
+    start = time.perf_counter()
+    assert list(iter_json_candidates(text)) == ['{"novelty": {"score": 8, "remark": "Done"}}']
+    assert list(iter_json_candidates('{"a": ' + '"x", ' * 40000)) == []
+    assert time.perf_counter() - start < 1.0
+
+
+def test_schema_validation():
+    assert [coerce_score(value) for value in (8, 7.4, "9", "6/10", 0, 42, True, None, "high")] == \
+        [8, 7, 9, 6, 1, 10, None, None, None]
+    evaluation = validate_evaluation({"novelty": {"score": "12"}, "feasibility": {"remark": "no score"},
+                                      "extra": 1, "overall_impression": "Good"})
+    assert evaluation == {"novelty": {"score": 10, "remark": "No remark provided"}, "overall_impression": "Good"}
+
+
+def test_batch_response_is_validated():
+    response = 'Results:\n[{"idea_id": "A", "novelty": {"score": 15, "remark": "Wow"}}, ' \
+               '{"idea_id": "B", "novelty": {"score": "n/a"}}, {"novelty": {"score": 5}}]'
+    assert parse_batch_response(response, "Recorded") == {"A": {"novelty": {"score": 10, "remark": "Wow"}}}
+    assert parse_batch_response("no json here", "Recorded") == {}
+
+
+def main():
+    """Run the response parser tests."""
+    print("Testing response parser...")
+    test_corpus()
+    test_remarks_survive_escapes_and_truncation()
+    test_json_candidates_are_balanced()
+    test_json_candidates_with_long_truncated_tail()
+    test_schema_validation()
+    test_batch_response_is_validated()
+    print("\nAll response parser tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Test script for the streaming result sink.
+
+This script checks that streaming results to disk produces the same detailed
+and summary tables as building them in memory at the end of a run, without
+requiring API keys for LLMs.
+"""
+
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from idea_evaluator import (DIMENSION_LABELS, RUBRIC_DIMENSIONS, EvaluationEngine, Idea, build_summary_table,
+                            create_evaluation_prompt, generate_tables)
+from mock_provider import setup_mock_llms
+from result_sink import StreamingResultSink
+from run_checkpoint import RunCheckpoint
+from test_evaluation_engine import make_ideas, make_llms
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+SORT_COLUMNS = ["Idea ID", "LLM", "Dimension"]
+
+
+def sorted_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(SORT_COLUMNS).reset_index(drop=True)
+
+
+def test_streamed_tables_match_in_memory_tables():
+    ideas = make_ideas(8)
+    llms = make_llms(delay=0)
+    expected = EvaluationEngine(llms, create_evaluation_prompt()).evaluate(ideas)
+    expected_detailed, expected_summary = generate_tables(expected, ideas)
+
+    formats = ["jsonl", "csv"] + (["parquet"] if HAS_PYARROW else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: os.path.join(tmp, f"detailed.{fmt}") for fmt in formats}
+        sink = StreamingResultSink(ideas, RUBRIC_DIMENSIONS, DIMENSION_LABELS, paths, row_group_size=5)
+        engine = EvaluationEngine(llms, create_evaluation_prompt(), max_concurrency=4, sink=sink,
+                                  keep_results=False)
+        leftover = engine.evaluate(ideas)
+        sink.close()
+
+        assert leftover == {}
+        assert sink.rows_written == len(expected_detailed)
+        pd.testing.assert_frame_equal(build_summary_table(ideas, sink.sums, sink.counts), expected_summary)
+
+        readers = {"jsonl": lambda path: pd.read_json(path, lines=True, dtype={"Idea ID": str}),
+                   "csv": pd.read_csv,
+                   "parquet": pd.read_parquet}
+        for fmt, path in paths.items():
+            streamed = readers[fmt](path)
+            streamed = streamed.astype({column: object for column in SORT_COLUMNS + ["Idea Title", "Remark"]})
+            pd.testing.assert_frame_equal(sorted_rows(streamed), sorted_rows(expected_detailed),
+                                          check_dtype=False)
+
+
+def test_rows_are_visible_before_close_and_errors_skipped():
+    idea = Idea("A", "Idea A", "First")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "detailed.jsonl")
+        sink = StreamingResultSink([idea], RUBRIC_DIMENSIONS, DIMENSION_LABELS, {"jsonl": path})
+        sink.add(idea, "Good", {"novelty": {"score": 6, "remark": "Solid"},
+                                "feasibility": {"score": 8, "remark": "Easy"}})
+        sink.add(idea, "Broken", {"error": "timeout"})
+
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert [row["Dimension"] for row in rows] == ["Novelty", "Feasibility"]
+        assert sink.counts.sum() == 2
+        sink.close()
+
+
+def test_rejects_non_streaming_format():
+    try:
+        StreamingResultSink([], RUBRIC_DIMENSIONS, DIMENSION_LABELS, {"xlsx": "detailed.xlsx"})
+    except ValueError:
+        return
+    raise AssertionError("Expected ValueError for xlsx")
+
+
+def streamed_run_memory(num_ideas: int) -> int:
+    """Bytes still allocated after a --stream style run (checkpoint plus streaming sink) of num_ideas ideas."""
+    ideas = make_ideas(num_ideas)
+    llms = setup_mock_llms(3, malformed_rate=0.3)
+    prompt_template = create_evaluation_prompt()
+    with tempfile.TemporaryDirectory() as tmp:
+        gc.collect()
+        tracemalloc.start()
+        checkpoint = RunCheckpoint(tmp)
+        sink = StreamingResultSink(ideas, RUBRIC_DIMENSIONS, DIMENSION_LABELS, {"jsonl": os.path.join(tmp, "d.jsonl")})
+        engine = EvaluationEngine(llms, prompt_template, checkpoint=checkpoint, sink=sink, keep_results=False,
+                                  repair_attempts=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert engine.evaluate(ideas) == {}
+        del engine
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        checkpoint.close()
+        sink.close()
+    return retained
+
+
+def test_streamed_run_memory_stays_flat():
+    # Results, including the raw responses of malformed ones, go to disk; only a small
+    # checkpoint index entry and the running totals remain per (idea, LLM) pair
+    small, large = streamed_run_memory(50), streamed_run_memory(250)
+    assert (large - small) / (200 * 3) < 500
+
+
+def main():
+    """Run the result sink tests."""
+    print("Testing streaming result sink...")
+    test_streamed_tables_match_in_memory_tables()
+    test_rows_are_visible_before_close_and_errors_skipped()
+    test_rejects_non_streaming_format()
+    test_streamed_run_memory_stays_flat()
+    print("\nAll result sink tests passed!")
+
+if __name__ == "__main__":
+    main()
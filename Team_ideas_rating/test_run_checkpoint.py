@@ -0,0 +1,163 @@
+"""
+Test script for run checkpoints.
+
+This script checks that an interrupted or partially failed run resumes from its
+checkpoint, re-running only failed pairs and edited ideas, without requiring
+API keys for LLMs.
+"""
+
+import io
+import json
+import os
+import tempfile
+from typing import Any, List, Optional
+
+from langchain.llms.base import LLM
+
+from idea_evaluator import EvaluationEngine, Idea, create_evaluation_prompt
+from run_checkpoint import RunCheckpoint
+
+VALID_RESPONSE = '{"novelty": {"score": 6, "remark": "Solid"}}'
+
+
+class CountingLLM(LLM):
+    """Fake LLM that counts calls and can be told to fail."""
+
+    calls: List[str] = []
+    fail: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting-fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        self.calls.append(prompt.split("IDEA ID: ")[1].split()[0])
+        if self.fail:
+            raise RuntimeError("429 Too Many Requests")
+        return VALID_RESPONSE
+
+
+def run(directory: str, ideas: List[Idea], llms, fresh: bool = False):
+    checkpoint = RunCheckpoint(directory, fresh=fresh)
+    checkpoint.start_run(ideas, llms.keys())
+    results = EvaluationEngine(llms, create_evaluation_prompt(), checkpoint=checkpoint).evaluate(ideas)
+    checkpoint.finish_run()
+    checkpoint.close()
+    return results
+
+
+def test_resume_skips_finished_pairs():
+    ideas = [Idea("A", "Idea A", "First"), Idea("B", "Idea B", "Second")]
+    good = CountingLLM(calls=[])
+    flaky = CountingLLM(calls=[], fail=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = run(tmp, ideas, {"Good": good, "Flaky": flaky})
+        assert "error" in first["A"]["Flaky"]
+        with open(os.path.join(tmp, "manifest.json")) as f:
+            manifest = json.load(f)
+        assert manifest["completed_pairs"] == 2
+        assert manifest["failed_pairs"] == 2
+
+        # Restart after the provider recovers and one idea is edited
+        good.calls.clear()
+        flaky.calls.clear()
+        flaky.fail = False
+        ideas[1] = Idea("B", "Idea B", "Second, revised")
+        second = run(tmp, ideas, {"Good": good, "Flaky": flaky})
+
+        assert good.calls == ["B"]
+        assert sorted(flaky.calls) == ["A", "B"]
+        assert second["A"]["Good"] == first["A"]["Good"]
+        assert all("error" not in evaluation for result in second.values() for evaluation in result.values())
+        assert list(second["A"]) == ["Good", "Flaky"]
+
+        # A fresh run discards the checkpoint
+        good.calls.clear()
+        run(tmp, ideas, {"Good": good}, fresh=True)
+        assert sorted(good.calls) == ["A", "B"]
+
+
+def test_truncated_checkpoint_line_is_ignored():
+    idea = Idea("A", "Idea A", "First")
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        checkpoint.record(idea, "Good", {"novelty": {"score": 6, "remark": "Solid"}})
+        checkpoint.close()
+        with open(os.path.join(tmp, "checkpoint.jsonl"), "a") as f:
+            f.write('{"idea_id": "A", "llm": "Oth')
+
+        checkpoint = RunCheckpoint(tmp)
+        assert checkpoint.completed(idea, "Good") is not None
+        assert checkpoint.completed(idea, "Other") is None
+        checkpoint.record(idea, "Other", {"novelty": {"score": 4, "remark": "Meh"}})
+        checkpoint.close()
+
+        # The record appended after the truncated line is readable
+        checkpoint = RunCheckpoint(tmp)
+        assert checkpoint.completed(idea, "Other")["novelty"]["score"] == 4
+        checkpoint.close()
+
+
+def test_index_keeps_no_evaluations_in_memory():
+    ideas = [Idea(f"I{i}", f"Idea {i}", "Ünïcode description") for i in range(50)]
+    evaluation = {"novelty": {"score": 6, "remark": "Sölid " * 20}}
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        for idea in ideas:
+            checkpoint.record(idea, "Good", evaluation)
+            checkpoint.record(idea, "Flaky", {"error": "Failed to parse JSON response", "raw_response": "x" * 5000})
+        # Only (status, idea hash, file offset) per pair, whatever the size of the results
+        assert all(len(entry) == 3 and isinstance(entry[2], int) for entry in checkpoint._records.values())
+        assert checkpoint.completed(ideas[-1], "Good") == evaluation
+        assert checkpoint.completed(ideas[0], "Flaky") is None
+        checkpoint.record(ideas[0], "Good", {"novelty": {"score": 9, "remark": "Better"}})
+        checkpoint.close()
+
+        checkpoint = RunCheckpoint(tmp)
+        assert checkpoint.completed(ideas[0], "Good")["novelty"]["score"] == 9
+        assert checkpoint.completed(ideas[1], "Good") == evaluation
+        checkpoint.close()
+
+
+def test_read_only_checkpoint():
+    idea = Idea("A", "Idea A", "First")
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        checkpoint.start_run([idea], ["Good"])
+        checkpoint.record(idea, "Good", {"novelty": {"score": 6, "remark": "Solid"}})
+        checkpoint.close()
+        with open(os.path.join(tmp, "checkpoint.jsonl"), "a") as f:
+            f.write('{"idea_id": "A", "llm": "Oth')
+        size = os.path.getsize(os.path.join(tmp, "checkpoint.jsonl"))
+
+        checkpoint = RunCheckpoint(tmp, read_only=True)
+        assert checkpoint.manifest["llms"] == ["Good"]
+        assert checkpoint.completed(idea, "Good")["novelty"]["score"] == 6
+        for write in (lambda: checkpoint.record(idea, "Other", {"error": "timeout"}),
+                      lambda: checkpoint.finish_run()):
+            try:
+                write()
+                raise AssertionError("expected io.UnsupportedOperation")
+            except io.UnsupportedOperation:
+                pass
+        checkpoint.close()
+        # The truncated last line is left alone
+        assert os.path.getsize(os.path.join(tmp, "checkpoint.jsonl")) == size
+
+        missing = os.path.join(tmp, "missing")
+        RunCheckpoint(missing, read_only=True).close()
+        assert not os.path.exists(missing)
+
+
+def main():
+    """Run the checkpoint tests."""
+    print("Testing run checkpoints...")
+    test_resume_skips_finished_pairs()
+    test_truncated_checkpoint_line_is_ignored()
+    test_index_keeps_no_evaluations_in_memory()
+    test_read_only_checkpoint()
+    print("\nAll checkpoint tests passed!")
+
+if __name__ == "__main__":
+    main()
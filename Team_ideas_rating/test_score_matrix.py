@@ -0,0 +1,127 @@
+"""
+Test script for the compact score matrix.
+
+This script checks that evaluations stored in a ScoreMatrix can be rebuilt,
+that remarks are interned, that generate_tables() gives the same tables from
+a ScoreMatrix as from the nested results dictionary, that a run with a
+checkpoint keeps no evaluation dictionaries besides the matrix, and that ideas
+and rubric dimensions use the compact types.
+"""
+
+import tempfile
+
+import pandas as pd
+import pytest
+
+from document_parser import Idea
+from idea_evaluator import EvaluationEngine, create_evaluation_prompt
+from mock_provider import setup_mock_llms
+from rubric import DIMENSION_LABELS, RUBRIC_DIMENSIONS, Dimension
+from run_checkpoint import RunCheckpoint
+from score_matrix import MISSING_SCORE, ScoreMatrix
+from tables import generate_tables
+
+IDEAS = [Idea(f"M{i}", f"Matrix idea {i}", f"Description {i}") for i in range(40)]
+
+
+def test_evaluations_round_trip():
+    ideas = IDEAS[:3]
+    matrix = ScoreMatrix(ideas, ["A", "B"])
+    scored = {"novelty": {"score": 7, "remark": "Fresh"}, "feasibility": {"score": 3, "remark": "Hard"}}
+    matrix.add(ideas[0], "A", scored)
+    matrix.add(ideas[0], "B", {"error": "Failed to parse JSON response", "raw_response": "x" * 1000})
+    matrix.add(ideas[1], "A", {**scored, "duplicate_of": "M0"})
+
+    assert matrix.evaluation("M0", "A") == scored
+    assert matrix.evaluation("M0", "B") == {"error": "Failed to parse JSON response"}
+    assert matrix.evaluation("M1", "A") == {**scored, "duplicate_of": "M0"}
+    assert matrix.evaluation("M2", "A") is None
+    assert matrix.scores.dtype.itemsize == 1 and matrix.scores.shape == (3, 2, len(RUBRIC_DIMENSIONS))
+    assert matrix.scores[2].tolist() == [[MISSING_SCORE] * len(RUBRIC_DIMENSIONS)] * 2
+
+    # Identical remarks are stored once, and a later result replaces the earlier one
+    assert matrix.remarks == ["Fresh", "Hard"]
+    matrix.add(ideas[0], "B", scored)
+    assert matrix.evaluation("M0", "B") == scored and not matrix.errors
+
+    sums, counts = matrix.sums_and_counts()
+    assert sums[0, RUBRIC_DIMENSIONS.index("novelty")] == 14 and counts[0].sum() == 4
+    assert matrix.models() == [["A", "B"], ["A"], []]
+    with pytest.raises(KeyError):
+        matrix.add(Idea("unknown", "", ""), "A", scored)
+
+
+def test_tables_match_nested_results():
+    llms = setup_mock_llms(3, malformed_rate=0.3)
+    results = EvaluationEngine(llms, create_evaluation_prompt(), repair_attempts=0).evaluate(IDEAS)
+    assert any("error" in evaluation for idea_results in results.values() for evaluation in idea_results.values())
+
+    matrix = ScoreMatrix(IDEAS, list(llms))
+    for idea in IDEAS:
+        for llm_name, evaluation in results[idea.id].items():
+            matrix.add(idea, llm_name, evaluation)
+
+    for include_models in (False, True):
+        expected = generate_tables(results, IDEAS, include_models=include_models)
+        for table, expected_table in zip(generate_tables(matrix, IDEAS, include_models=include_models), expected):
+            pd.testing.assert_frame_equal(table, expected_table)
+
+    # A subset of the ideas, in a different order
+    subset = IDEAS[::-3]
+    for table, expected_table in zip(generate_tables(matrix, subset), generate_tables(results, subset)):
+        pd.testing.assert_frame_equal(table, expected_table)
+
+
+def test_engine_fills_matrix():
+    llms = setup_mock_llms(3)
+    results = EvaluationEngine(llms, create_evaluation_prompt()).evaluate(IDEAS)
+    matrix = ScoreMatrix(IDEAS, list(llms))
+    engine = EvaluationEngine(llms, create_evaluation_prompt(), sink=matrix, keep_results=False)
+    assert engine.evaluate(IDEAS) == {}
+    assert all(matrix.evaluation(idea.id, llm_name) == {key: value for key, value in evaluation.items()
+                                                         if key in RUBRIC_DIMENSIONS}
+               for idea in IDEAS for llm_name, evaluation in results[idea.id].items())
+
+
+def test_checkpointed_run_stays_compact():
+    # idea_evaluator.py always checkpoints, so the checkpoint must not hold the evaluations either
+    llms = setup_mock_llms(3, malformed_rate=0.3)
+    matrix = ScoreMatrix(IDEAS, list(llms))
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        engine = EvaluationEngine(llms, create_evaluation_prompt(), checkpoint=checkpoint, sink=matrix,
+                                  keep_results=False, repair_attempts=0)
+        assert engine.evaluate(IDEAS) == {}
+        assert len(checkpoint._records) == len(IDEAS) * len(llms)
+        assert all(isinstance(entry, tuple) and not any(isinstance(field, dict) for field in entry)
+                   for entry in checkpoint._records.values())
+        for idea in IDEAS:
+            for llm_name in llms:
+                stored = checkpoint.completed(idea, llm_name)
+                if stored is not None:
+                    assert matrix.evaluation(idea.id, llm_name) == {key: value for key, value in stored.items()
+                                                                    if key in RUBRIC_DIMENSIONS}
+        checkpoint.close()
+
+
+def test_compact_types():
+    assert not hasattr(IDEAS[0], "__dict__")
+    with pytest.raises(AttributeError):
+        IDEAS[0].score = 5
+    assert [dimension.value for dimension in Dimension] == RUBRIC_DIMENSIONS
+    assert [dimension.label for dimension in Dimension] == DIMENSION_LABELS
+    assert {"technical_complexity": 4}[Dimension.TECHNICAL_COMPLEXITY] == 4
+
+
+def main():
+    """Run the score matrix tests."""
+    print("Testing score matrix...")
+    test_evaluations_round_trip()
+    test_tables_match_nested_results()
+    test_engine_fills_matrix()
+    test_checkpointed_run_stays_compact()
+    test_compact_types()
+    print("\nAll score matrix tests passed!")
+
+if __name__ == "__main__":
+    main()
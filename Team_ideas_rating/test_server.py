@@ -0,0 +1,196 @@
+"""
+Test script for the evaluation server.
+
+This script starts the HTTP service on a free local port with mock LLMs and
+checks that submitted ideas are evaluated as jobs with progress and results,
+that a full queue rejects new jobs with 429, that queued jobs can be
+cancelled and free their place in the queue, that shutting down cancels the
+queued jobs, that every job gets its own retry budget, and that malformed
+submissions and bad Content-Length headers are refused.
+"""
+
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from document_parser import Idea
+from idea_evaluator import EvaluationEngine, create_evaluation_prompt
+from mock_provider import setup_mock_llms
+from rate_limiter import ProviderRateLimiter
+from server import MAX_REQUEST_BYTES, EvaluationService, JobRejected, create_server, parse_submission
+
+IDEAS = [{"id": f"S{i}", "title": f"Server idea {i}", "description": f"Description {i}"} for i in range(6)]
+
+
+def request(base_url, method, path, body=None):
+    """Send a JSON request and return (status, decoded body, headers)."""
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read()), response.headers
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read()), e.headers
+
+
+def start(service):
+    """Serve the service on a free port in a background thread and return (server, base URL)."""
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def wait_for(base_url, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        _, job, _ = request(base_url, "GET", f"/jobs/{job_id}")
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_jobs_are_evaluated():
+    llms = setup_mock_llms(2)
+    service = EvaluationService(llms)
+    service.start()
+    server, base_url = start(service)
+    try:
+        status, job, headers = request(base_url, "POST", "/jobs", {"ideas": IDEAS})
+        assert status == 202 and headers["Location"] == f"/jobs/{job['id']}"
+        assert job["total"] == len(IDEAS) * len(llms)
+
+        job = wait_for(base_url, job["id"])
+        assert job["status"] == "done" and job["completed"] == job["total"]
+
+        status, results, _ = request(base_url, "GET", f"/jobs/{job['id']}/results")
+        ideas = [Idea(item["id"], item["title"], item["description"]) for item in IDEAS]
+        assert status == 200
+        assert results["evaluations"] == EvaluationEngine(llms, create_evaluation_prompt()).evaluate(ideas)
+        assert sorted(row["Idea ID"] for row in results["summary"]) == sorted(item["id"] for item in IDEAS)
+
+        # Ideas in the document layout are accepted too, and the same clients serve every job
+        text = "Idea ID: T1\nProject Title: From text\nA description"
+        status, job, _ = request(base_url, "POST", "/jobs", {"text": text})
+        assert status == 202 and wait_for(base_url, job["id"])["status"] == "done"
+        _, health, _ = request(base_url, "GET", "/health")
+        assert health["llms"] == list(llms) and health["jobs"] == {"done": 2}
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_full_queue_rejects_and_jobs_can_be_cancelled():
+    # The worker is not started, so submitted jobs stay queued
+    service = EvaluationService(setup_mock_llms(2), max_queued_jobs=1)
+    server, base_url = start(service)
+    try:
+        status, first, _ = request(base_url, "POST", "/jobs", {"ideas": IDEAS[:1]})
+        assert status == 202 and first["status"] == "queued"
+        status, body, headers = request(base_url, "POST", "/jobs", {"ideas": IDEAS[:1]})
+        assert status == 429 and int(headers["Retry-After"]) > 0 and "retry later" in body["error"]
+
+        assert request(base_url, "GET", f"/jobs/{first['id']}/results")[0] == 409
+        status, cancelled, _ = request(base_url, "DELETE", f"/jobs/{first['id']}")
+        assert status == 200 and cancelled["status"] == "cancelled"
+        assert request(base_url, "DELETE", f"/jobs/{first['id']}")[0] == 409
+
+        # The cancelled job no longer takes up the queue, even before the worker runs
+        status, second, _ = request(base_url, "POST", "/jobs", {"ideas": IDEAS[:1]})
+        assert status == 202 and request(base_url, "GET", "/health")[1]["queued"] == 1
+        service.start()
+        assert wait_for(base_url, second["id"])["status"] == "done"
+        assert request(base_url, "GET", f"/jobs/{first['id']}")[1]["completed"] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_close_cancels_queued_jobs():
+    # The worker is not started, so both jobs are still queued at shutdown
+    service = EvaluationService(setup_mock_llms(1))
+    ideas = [Idea(item["id"], item["title"], item["description"]) for item in IDEAS[:1]]
+    jobs = [service.submit(ideas), service.submit(ideas)]
+    service.close()
+    assert [job.status for job in jobs] == ["cancelled", "cancelled"]
+    assert all(job.finished_at is not None for job in jobs)
+    assert service.health()["queued"] == 0
+    try:
+        service.submit(ideas)
+    except JobRejected as e:
+        assert e.status == 503
+    else:
+        raise AssertionError("Expected the closed service to reject jobs")
+
+
+def test_each_job_gets_a_fresh_retry_budget():
+    llms = setup_mock_llms(2, rate_limit_rate=0.5)
+    rate_limiters = {name: ProviderRateLimiter(name, base_delay=0.001) for name in llms}
+    service = EvaluationService(llms, rate_limiters=rate_limiters, retry_budget=1)
+    service.start()
+    ideas = [Idea(item["id"], item["title"], item["description"]) for item in IDEAS]
+    try:
+        budgets = []
+        for _ in range(2):
+            job = service.submit(ideas)
+            deadline = time.time() + 30
+            while service.job(job.id).status in ("queued", "running"):
+                assert time.time() < deadline, f"Job {job.id} did not finish"
+                time.sleep(0.05)
+            budgets.append(rate_limiters["Mock-LLM-1"].retry_budget)
+        # The second job could still retry although the first one spent its whole budget
+        assert budgets[0] is not budgets[1]
+        assert [budget.spent for budget in budgets] == [1, 1]
+        assert all(limiter.retry_budget is budgets[1] for limiter in rate_limiters.values())
+    finally:
+        service.close()
+
+
+def test_malformed_submissions_are_rejected():
+    service = EvaluationService(setup_mock_llms(1), max_job_ideas=3)
+    server, base_url = start(service)
+    try:
+        assert request(base_url, "POST", "/jobs", {"ideas": [{"title": "No ID"}]})[0] == 400
+        assert request(base_url, "POST", "/jobs", {"ideas": [IDEAS[0], IDEAS[0]]})[0] == 400
+        assert request(base_url, "POST", "/jobs", {"ideas": IDEAS})[0] == 413
+        assert request(base_url, "POST", "/jobs", {"text": "No idea markers here"})[0] == 400
+        assert request(base_url, "GET", "/jobs/missing")[0] == 404
+        assert request(base_url, "GET", "/unknown")[0] == 404
+
+        # Bodies are not read when the declared length is negative or too large
+        host, port = server.server_address[:2]
+        for length, expected in (("-1", 400), ("abc", 400), (str(MAX_REQUEST_BYTES + 1), 413)):
+            connection = http.client.HTTPConnection(host, port, timeout=5)
+            connection.putrequest("POST", "/jobs")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            assert connection.getresponse().status == expected
+            connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    ideas = parse_submission({"ideas": [{"id": " X1 ", "description": "Only a description"}]})
+    assert (ideas[0].id, ideas[0].title, ideas[0].description) == ("X1", "Untitled", "Only a description")
+
+
+def main():
+    """Run the evaluation server tests."""
+    print("Testing evaluation server...")
+    test_jobs_are_evaluated()
+    test_full_queue_rejects_and_jobs_can_be_cancelled()
+    test_close_cancels_queued_jobs()
+    test_each_job_gets_a_fresh_retry_budget()
+    test_malformed_submissions_are_rejected()
+    print("\nAll evaluation server tests passed!")
+
+if __name__ == "__main__":
+    main()
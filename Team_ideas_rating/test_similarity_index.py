@@ -0,0 +1,125 @@
+"""
+Test script for the near-duplicate similarity index.
+
+This script checks that near-identical ideas are grouped under the earliest
+one, that the MinHash/LSH index finds the same groups as comparing every pair,
+and that the evaluation engine only sends representatives to the LLMs.
+"""
+
+import random
+import tempfile
+
+from document_parser import Idea
+from idea_evaluator import EvaluationEngine, create_evaluation_prompt
+from mock_provider import setup_mock_llms
+from run_checkpoint import RunCheckpoint
+from similarity_index import SimilarityIndex, choose_bands, find_duplicates, jaccard, shingles
+
+WORDS = ("app platform team data report customer model automate workflow dashboard alert search "
+         "chat schedule invoice budget travel health learning hiring review feedback sensor map").split()
+
+
+def make_ideas(count, duplicate_rate, seed=0):
+    """Random ideas, a share of which are copies of earlier ones with one or two words changed."""
+    rng = random.Random(seed)
+    ideas = []
+    for i in range(count):
+        if ideas and rng.random() < duplicate_rate:
+            source = rng.choice(ideas)
+            words = source.description.split()
+            for _ in range(rng.randint(1, 2)):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            ideas.append(Idea(f"I{i}", source.title, " ".join(words)))
+        else:
+            description = " ".join(rng.choice(WORDS) for _ in range(60))
+            ideas.append(Idea(f"I{i}", f"Idea {i}", description))
+    return ideas
+
+
+def brute_force_duplicates(ideas, threshold):
+    """Reference grouping that compares every idea with every earlier representative."""
+    representatives, duplicates = [], {}
+    for idea in ideas:
+        idea_shingles = shingles(f"{idea.title}\n{idea.description}")
+        matches = [(jaccard(idea_shingles, rep_shingles), -position, rep.id)
+                   for position, (rep, rep_shingles) in enumerate(representatives)]
+        best = max(matches, default=(0.0, 0, None))
+        if best[0] >= threshold:
+            duplicates.setdefault(best[2], []).append(idea.id)
+        else:
+            representatives.append((idea, idea_shingles))
+    return duplicates
+
+
+def test_shingles_and_bands():
+    assert shingles("Hello, hello WORLD again!") == {"hello hello world", "hello world again"}
+    assert shingles("Two words") == {"two words"}
+    assert shingles("") == set()
+    bands, rows = choose_bands(128, 0.8)
+    assert bands * rows == 128 and 1 - (1 - 0.8 ** rows) ** bands >= 0.99
+
+
+def test_near_duplicates_are_grouped():
+    base = " ".join(WORDS) + " and a long description of how the platform helps every team"
+    ideas = [
+        Idea("A", "Workflow assistant", base),
+        Idea("B", "Budget tracker", "Track team budgets with alerts and monthly reports for managers"),
+        Idea("C", "Workflow assistant", base.replace("every team", "each team")),
+        Idea("D", "Workflow assistant", base + " today"),
+        Idea("E", "", "")
+    ]
+    duplicates = find_duplicates(ideas, threshold=0.8)
+    assert {rep: [idea.id for idea in members] for rep, members in duplicates.items()} == {"A": ["C", "D"]}
+
+    index = SimilarityIndex(threshold=0.8)
+    assert index.add(Idea("X", "", "")) is None
+    assert index.add(Idea("Y", "", "")) is None
+
+
+def test_matches_brute_force_without_pairwise_pass():
+    ideas = make_ideas(800, duplicate_rate=0.3)
+    index = SimilarityIndex(threshold=0.8)
+    found = {}
+    for idea in ideas:
+        representative = index.add(idea)
+        if representative is not None:
+            found.setdefault(representative, []).append(idea.id)
+    assert found == brute_force_duplicates(ideas, 0.8)
+    # Far fewer comparisons than checking every pair of representatives
+    assert index.comparisons < len(ideas) * len(index.ids) / 50
+
+
+def test_engine_evaluates_only_representatives():
+    ideas = make_ideas(40, duplicate_rate=0.5, seed=3)
+    duplicates = find_duplicates(ideas)
+    members = [member for group in duplicates.values() for member in group]
+    assert members
+
+    llms = setup_mock_llms(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = RunCheckpoint(tmp)
+        engine = EvaluationEngine(llms, create_evaluation_prompt(), checkpoint=checkpoint, duplicates=duplicates)
+        results = engine.evaluate(ideas)
+        assert all(checkpoint.completed(member, llm_name) is None for member in members for llm_name in llms)
+        checkpoint.close()
+
+    assert set(results) == {idea.id for idea in ideas}
+    for representative, group in duplicates.items():
+        for member in group:
+            for llm_name in llms:
+                reused = dict(results[member.id][llm_name])
+                assert reused.pop("duplicate_of") == representative
+                assert reused == results[representative][llm_name]
+
+
+def main():
+    """Run the similarity index tests."""
+    print("Testing similarity index...")
+    test_shingles_and_bands()
+    test_near_duplicates_are_grouped()
+    test_matches_brute_force_without_pairwise_pass()
+    test_engine_evaluates_only_representatives()
+    print("\nAll similarity index tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Test script for streamed completions.
+
+This script checks that streamed completions stop as soon as a complete rubric
+object has arrived and that time to first token and throughput are recorded,
+using a local mock of the chat completions API and fake LLMs instead of API keys.
+"""
+
+import json
+import time
+from typing import Any, Iterator, List, Optional
+
+from langchain.llms.base import LLM
+from langchain.schema.output import GenerationChunk
+
+from idea_evaluator import RUBRIC_DIMENSIONS, EvaluationEngine, Idea, create_evaluation_prompt
+from response_parser import JSONObjectDetector
+from streaming import StreamMetrics, stream_completion
+from test_perplexity_llm import make_llm, start_server
+
+RUBRIC = json.dumps({dim: {"score": 6, "remark": "Fine {really}"} for dim in RUBRIC_DIMENSIONS})
+
+
+class ChattyStreamingLLM(LLM):
+    """Fake LLM that streams a rubric followed by a long chatty tail."""
+
+    delay: float = 0.001
+    chunks_sent: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "chatty-streaming-fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        return "".join(chunk.text for chunk in self._stream(prompt, stop, **kwargs))
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None,
+                **kwargs: Any) -> Iterator[GenerationChunk]:
+        text = "Sure! Here is the evaluation: " + RUBRIC + " I hope this helps." * 50
+        for start in range(0, len(text), 8):
+            time.sleep(self.delay)
+            self.chunks_sent += 1
+            yield GenerationChunk(text=text[start:start + 8])
+
+
+def test_detector_handles_split_chunks():
+    detector = JSONObjectDetector()
+    pieces = ['Note: "quoted" prose. {"a": "x}\\', '"y", "b": {"c"', ': 1}}', ' done {"d": 2}']
+    found = [obj for piece in pieces for obj in detector.feed(piece)]
+    assert found == ['{"a": "x}\\"y", "b": {"c": 1}}', '{"d": 2}']
+    assert detector.text == "".join(pieces)
+
+
+def test_stream_stops_after_complete_rubric():
+    llm = ChattyStreamingLLM()
+    text, stats = stream_completion(llm, "prompt")
+    assert stats.cancelled
+    assert json.loads(text[text.index("{"):text.rindex("}") + 1]) == json.loads(RUBRIC)
+    # Only the chunk that closed the object is read past the rubric
+    assert len(text) < len("Sure! Here is the evaluation: " + RUBRIC) + 8
+    assert llm.chunks_sent == stats.chunks
+    assert stats.time_to_first_token is not None and stats.tokens_per_second > 0
+
+
+def test_incomplete_object_is_not_cut_short():
+    partial = json.dumps({"novelty": {"score": 6, "remark": "Fine"}})
+    server = start_server()
+    try:
+        text, stats = stream_completion(make_llm(server), partial + " and more words after it")
+        assert not stats.cancelled
+        assert text.strip() == "echo: " + partial + " and more words after it"
+    finally:
+        server.shutdown()
+
+
+def test_perplexity_stream_is_cancelled():
+    server = start_server()
+    try:
+        prompt = RUBRIC + " trailing" * 200
+        text, stats = stream_completion(make_llm(server), prompt)
+        assert stats.cancelled
+        assert text.strip() == "echo: " + RUBRIC
+        assert stats.chunks < len(("echo: " + prompt).split(" "))
+    finally:
+        server.shutdown()
+
+
+def test_engine_records_stream_metrics():
+    ideas = [Idea(f"I{i}", f"Idea {i}", "Description") for i in range(3)]
+    metrics = StreamMetrics()
+    results = EvaluationEngine({"Chatty": ChattyStreamingLLM()}, create_evaluation_prompt(),
+                               stream_metrics=metrics).evaluate(ideas)
+    assert all(results[idea.id]["Chatty"]["novelty"]["score"] == 6 for idea in ideas)
+
+    summary = metrics.summary()["Chatty"]
+    assert summary["streams"] == 3
+    assert summary["cancelled_early"] == 3
+    assert summary["median_ttft"] > 0
+    assert summary["median_tokens_per_second"] > 0
+    metrics.print_summary()
+
+
+def main():
+    """Run the streaming tests."""
+    print("Testing streamed completions...")
+    test_detector_handles_split_chunks()
+    test_stream_stops_after_complete_rubric()
+    test_incomplete_object_is_not_cut_short()
+    test_perplexity_stream_is_cancelled()
+    test_engine_records_stream_metrics()
+    print("\nAll streaming tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Test script for structured-output requests and repair re-prompts.
+
+This script checks that structured-output settings reach the provider request,
+and that malformed or incomplete responses are repaired with a follow-up prompt
+instead of being discarded, without requiring API keys for LLMs.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from langchain.llms.base import LLM
+
+from idea_evaluator import (RUBRIC_DIMENSIONS, EvaluationEngine, Idea, create_evaluation_prompt,
+                            evaluate_idea_with_llm, structured_output_kwargs)
+from response_cache import ResponseCache
+from rubric import RUBRIC_SCHEMA
+from test_perplexity_llm import MockChatCompletionsHandler, make_llm, start_server
+
+FULL_RUBRIC = {dim: {"score": 7, "remark": f"Repaired {dim}"} for dim in RUBRIC_DIMENSIONS}
+
+
+class RepairableLLM(LLM):
+    """Fake LLM that answers evaluation prompts badly and repair prompts correctly."""
+
+    first_response: str = "Novelty: 9/10 - Very fresh"
+    calls: List[str] = []
+    call_kwargs: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "repairable-fake"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, **kwargs: Any) -> str:
+        kind = "repair" if "YOUR PREVIOUS RESPONSE" in prompt else "evaluate"
+        self.calls.append(kind)
+        self.call_kwargs.append(kwargs)
+        return json.dumps(FULL_RUBRIC) if kind == "repair" else self.first_response
+
+
+def test_repair_fills_missing_dimensions_and_is_cached():
+    idea = Idea("A", "Idea A", "First")
+    llm = RepairableLLM(calls=[], call_kwargs=[])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, "cache.sqlite3"))
+        evaluation = evaluate_idea_with_llm(idea, "Fake", llm, create_evaluation_prompt(), cache,
+                                            repair_attempts=1)
+        assert llm.calls == ["evaluate", "repair"]
+        # The score parsed from the original response is kept, the rest come from the repair
+        assert evaluation["novelty"] == {"score": 9, "remark": "Very fresh"}
+        assert all(evaluation[dim]["score"] == 7 for dim in RUBRIC_DIMENSIONS[1:])
+
+        # The repaired evaluation is cached, so the next run makes no calls at all
+        llm.calls.clear()
+        again = evaluate_idea_with_llm(idea, "Fake", llm, create_evaluation_prompt(), cache, repair_attempts=1)
+        assert llm.calls == []
+        assert again == evaluation
+        cache.close()
+
+
+def test_no_repair_when_disabled_or_complete():
+    idea = Idea("A", "Idea A", "First")
+    llm = RepairableLLM(calls=[], call_kwargs=[], first_response="not json at all")
+    evaluation = evaluate_idea_with_llm(idea, "Fake", llm, create_evaluation_prompt())
+    assert "error" in evaluation
+    assert llm.calls == ["evaluate"]
+
+    llm = RepairableLLM(calls=[], call_kwargs=[], first_response=json.dumps(FULL_RUBRIC))
+    evaluate_idea_with_llm(idea, "Fake", llm, create_evaluation_prompt(), repair_attempts=1)
+    assert llm.calls == ["evaluate"]
+
+
+def test_engine_repairs_unparseable_responses():
+    ideas = [Idea("A", "Idea A", "First"), Idea("B", "Idea B", "Second")]
+    llm = RepairableLLM(calls=[], call_kwargs=[], first_response="I'd rather not say.")
+    results = EvaluationEngine({"Fake": llm}, create_evaluation_prompt(), repair_attempts=1).evaluate(ideas)
+    assert sorted(llm.calls) == ["evaluate", "evaluate", "repair", "repair"]
+    assert all(results[idea.id]["Fake"]["feasibility"]["score"] == 7 for idea in ideas)
+
+
+def test_structured_output_reaches_the_request():
+    server = start_server()
+    try:
+        llm = make_llm(server)
+        kwargs = structured_output_kwargs(llm)
+        evaluate_idea_with_llm(Idea("A", "Idea A", "First"), "Perplexity", llm, create_evaluation_prompt(),
+                               structured_output=True)
+        request = MockChatCompletionsHandler.requests[0]
+        assert request["response_format"] == kwargs["response_format"]
+        assert request["response_format"]["json_schema"]["schema"] == RUBRIC_SCHEMA
+    finally:
+        server.shutdown()
+
+    # LLMs without a native JSON mode get no extra arguments
+    llm = RepairableLLM(calls=[], call_kwargs=[], first_response=json.dumps(FULL_RUBRIC))
+    assert structured_output_kwargs(llm) == {}
+    evaluate_idea_with_llm(Idea("A", "Idea A", "First"), "Fake", llm, create_evaluation_prompt(),
+                           structured_output=True)
+    assert llm.call_kwargs == [{}]
+
+
+def main():
+    """Run the structured-output tests."""
+    print("Testing structured output and repair...")
+    test_repair_fills_missing_dimensions_and_is_cached()
+    test_no_repair_when_disabled_or_complete()
+    test_engine_repairs_unparseable_responses()
+    test_structured_output_reaches_the_request()
+    print("\nAll structured-output tests passed!")
+
+if __name__ == "__main__":
+    main()